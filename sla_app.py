@@ -1,94 +1,38 @@
 # =========================================
 # app.py — SLA Payment Analyzer + Poster A4
 # =========================================
+# Halaman Streamlit saja; data, agregasi & render report ada di paket sla_core.
+# plotly / reportlab / PIL baru diimpor saat tab yang memakainya dibuka.
 
-import streamlit as st
-import pandas as pd
-import re
-import math
-import os
-import time
 import base64
-import matplotlib.pyplot as plt
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
 import io
-import requests
-import json
-import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-from datetime import datetime
-from io import BytesIO   # << tambahkan ini
-import base64
-import streamlit.components.v1 as components
-
-from datetime import datetime
-
-KPI_FILE = os.path.join("data", "kpi_target.json")
-KPI_GITHUB_PATH = "data/kpi_target.json"
-
-def load_kpi():
-    """Load target KPI dari GitHub (utama) atau lokal (fallback)."""
-    # 1) Coba ambil dari GitHub
-    if GITHUB_TOKEN and GITHUB_REPO:
-        info = github_get_file_info(KPI_GITHUB_PATH)
-        if info and "content" in info:
-            try:
-                decoded = base64.b64decode(info["content"]).decode()
-                return json.loads(decoded).get("target_kpi", None)
-            except Exception as e:
-                st.error(f"Gagal parse KPI dari GitHub: {e}")
-                return None
-
-    # 2) Fallback ke lokal
-    if os.path.exists(KPI_FILE):
-        try:
-            with open(KPI_FILE, "r") as f:
-                return json.load(f).get("target_kpi", None)
-        except Exception as e:
-            st.error(f"Gagal baca KPI lokal: {e}")
-            return None
-    return None
-
-
-def save_kpi(value):
-    """Simpan target KPI ke lokal & GitHub."""
-    data = {"target_kpi": value}
-
-    # 1) Simpan ke lokal
-    with open(KPI_FILE, "w") as f:
-        json.dump(data, f)
-
-    # 2) Simpan ke GitHub
-    if GITHUB_TOKEN and GITHUB_REPO:
-        upload_file_to_github(
-            json.dumps(data).encode(),
-            path=KPI_GITHUB_PATH,
-            message="Update Target KPI (via app)"
-        )
-
-def format_duration(seconds):
-    """Convert detik jadi 'xx hari xx jam xx menit xx detik'"""
-    days = int(seconds // 86400)
-    hours = int((seconds % 86400) // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    return f"{days} hari {hours} jam {minutes} menit {secs} detik"
-
 import os
-import io
-import base64
-import requests
+import threading
+from collections import OrderedDict
+
+import matplotlib.pyplot as plt
 import pandas as pd
 import streamlit as st
-from io import BytesIO
+import streamlit.components.v1 as components
+
+from sla_core.cube import CUBE_ROWS_COL
+from sla_core.dataset import (
+    SLA_COLS, PROSES_COLS, VENDOR_KATEGORI_COL, VENDOR_KATEGORI, DEFAULT_EXCEL_ENGINE, detect_periode_col,
+    read_workbooks
+)
+from sla_core.formatting import seconds_to_sla_format
+from sla_core.github_sync import GitHubStore
+from sla_core.kpi import KPI_FILE, KPI_GITHUB_PATH, read_kpi, write_kpi
+from sla_core.query import DEFAULT_QUERY_BACKEND, open_query
+from sla_core.store import (
+    STORE_DIR, DataStore, fetch_partitions, manifest_periode,
+    migrate_workbook, push_version, sync_legacy_workbook, sync_store
+)
 
 # ============================
 # KONFIGURASI
 # ============================
-DATA_PATH = os.path.join("data", "last_data.xlsx")
-ROCKET_GIF_PATH = "rocket.gif"
-LOGO_PATH = "asdp_logo.png"
+DATA_PATH = os.path.join("data", "last_data.xlsx")  # workbook lama, hanya untuk migrasi ke store
 
 # GitHub config (gunakan secrets di Streamlit)
 try:
@@ -96,96 +40,108 @@ try:
     GITHUB_REPO = st.secrets["GITHUB_REPO"]     # contoh: "firmanaditya90/SLA"
     GITHUB_BRANCH = st.secrets.get("GITHUB_BRANCH", "main")
     GITHUB_PATH = st.secrets.get("GITHUB_PATH", "data/last_data.xlsx")
+    GITHUB_STORE_PATH = st.secrets.get("GITHUB_STORE_PATH", "data/store")
 except Exception:
     GITHUB_TOKEN = GITHUB_REPO = None
+    GITHUB_BRANCH = "main"
+    GITHUB_PATH = "data/last_data.xlsx"
+    GITHUB_STORE_PATH = "data/store"
 
-_headers = {"Authorization": f"token {GITHUB_TOKEN}"} if GITHUB_TOKEN else {}
+# Backend agregasi tab: "pandas" (cube di memori), "sqlite" atau "duckdb" (lihat sla_core.query)
+try:
+    QUERY_BACKEND = st.secrets.get("QUERY_BACKEND", os.environ.get("QUERY_BACKEND", DEFAULT_QUERY_BACKEND))
+except Exception:
+    QUERY_BACKEND = os.environ.get("QUERY_BACKEND", DEFAULT_QUERY_BACKEND)
 
-# ============================
-# HELPER FUNCTIONS
-# ============================
-def github_get_file_info(path: str):
-    if not (GITHUB_TOKEN and GITHUB_REPO):
-        return None
-    url = f"https://api.github.com/repos/{GITHUB_REPO}/contents/{path}?ref={GITHUB_BRANCH}"
-    r = requests.get(url, headers=_headers)
-    return r.json() if r.status_code == 200 else None
+# Reader Excel upload: "auto" (calamine bila terpasang), "calamine" atau "openpyxl"; gagal → openpyxl
+try:
+    EXCEL_ENGINE = st.secrets.get("EXCEL_ENGINE", os.environ.get("EXCEL_ENGINE", DEFAULT_EXCEL_ENGINE))
+except Exception:
+    EXCEL_ENGINE = os.environ.get("EXCEL_ENGINE", DEFAULT_EXCEL_ENGINE)
 
-def download_file_from_github(path: str = None) -> bytes | None:
-    if not (GITHUB_TOKEN and GITHUB_REPO):
-        return None
-    path = path or GITHUB_PATH
-    info = github_get_file_info(path)
-    if not info:
-        return None
-    return base64.b64decode(info["content"].encode())
+github = GitHubStore(GITHUB_TOKEN, GITHUB_REPO, GITHUB_BRANCH, default_path=GITHUB_PATH)
 
-def upload_file_to_github(file_bytes: bytes, path: str = None, message="Update SLA data"):
-    if not (GITHUB_TOKEN and GITHUB_REPO):
-        return None
-    path = path or GITHUB_PATH
-    url = f"https://api.github.com/repos/{GITHUB_REPO}/contents/{path}"
-    info = github_get_file_info(path)
-    sha = info.get("sha") if info else None
-    data = {
-        "message": message,
-        "content": base64.b64encode(file_bytes).decode(),
-        "branch": GITHUB_BRANCH
-    }
-    if sha:
-        data["sha"] = sha
-    r = requests.put(url, headers=_headers, json=data)
-    return r.json() if r.status_code in (200, 201) else None
-
-@st.cache_data
-def read_excel_cached(path, size, mtime):
-    return pd.read_excel(path, header=[0, 1])
-
-def gif_b64(filepath):
-    with open(filepath, "rb") as f:
-        data = f.read()
-    return base64.b64encode(data).decode("utf-8")
-
-def delete_file_from_github(path: str = None, message="Delete SLA data"):
-    if not (GITHUB_TOKEN and GITHUB_REPO):
-        return None
-    path = path or GITHUB_PATH
-    info = github_get_file_info(path)
-    if not info or "sha" not in info:
+# Data: partisi Parquet per periode + manifest berversi (lihat sla_core.store)
+store = DataStore(STORE_DIR)
+
+# Dalam TTL tidak ada request sama sekali, setelah itu cukup conditional request (ETag)
+GITHUB_SYNC_TTL = 60  # detik
+KPI_CACHE_TTL = 300  # detik; save_kpi membersihkan cache secara eksplisit
+
+@st.cache_data(ttl=GITHUB_SYNC_TTL, show_spinner=False)
+def sync_data_from_github(remote_root: str) -> str | None:
+    """sync_store (CURRENT + manifest + partisi yang belum ada), di-cache lintas sesi selama TTL.
+
+    Bila store belum ada di GitHub maupun lokal, workbook lama ikut diambil (untuk migrasi)
+    di dalam cache yang sama, jadi hasil "tidak ada data" juga tidak dicek ulang tiap rerun.
+    """
+    sha = sync_store(github, store, remote_root)
+    if not sha and store.current_version() is None:
+        sync_legacy_workbook(github, GITHUB_PATH, DATA_PATH)
+    return sha
+
+def push_store_version(manifest, message, progress=None) -> bool:
+    """Kirim versi store ke GitHub (hanya partisi baru + manifest + CURRENT)."""
+    result = push_version(github, store, GITHUB_STORE_PATH, manifest, message, progress=progress)
+    sync_data_from_github.clear()
+    return bool(result)
+
+def mark_github_synced(path: str, result: dict | None):
+    """Catat sha hasil upload/hapus supaya sinkronisasi berikutnya tidak download ulang."""
+    github.mark_synced(path, result)
+    sync_data_from_github.clear()
+
+@st.cache_data(ttl=KPI_CACHE_TTL, show_spinner=False)
+def load_kpi():
+    """Load target KPI: GitHub (utama) disinkronkan ke file lokal, lalu dibaca dari lokal."""
+    # 1) Sinkronkan dari GitHub (ETag → 304 bila tidak berubah, tanpa download ulang)
+    if github.enabled:
+        github.sync_file(KPI_GITHUB_PATH, KPI_FILE)
+
+    # 2) Baca salinan lokal (juga fallback bila GitHub tidak bisa dihubungi)
+    try:
+        return read_kpi(KPI_FILE)
+    except Exception as e:
+        st.error(f"Gagal baca KPI lokal: {e}")
         return None
-    url = f"https://api.github.com/repos/{GITHUB_REPO}/contents/{path}"
-    data = {
-        "message": message,
-        "sha": info["sha"],
-        "branch": GITHUB_BRANCH
-    }
-    r = requests.delete(url, headers=_headers, json=data)
-    return r.json() if r.status_code == 200 else None
 
 
+def save_kpi(value):
+    """Simpan target KPI ke lokal & GitHub."""
+    # 1) Simpan ke lokal
+    payload = write_kpi(value, KPI_FILE)
+
+    # 2) Simpan ke GitHub
+    if github.enabled:
+        result = github.upload_file(payload, path=KPI_GITHUB_PATH, message="Update Target KPI (via app)")
+        mark_github_synced(KPI_GITHUB_PATH, result)
+
+    # 3) Invalidasi cache supaya semua sesi langsung memakai target baru
+    load_kpi.clear()
+
 # ============================
 # LOAD DATA
 # ============================
-df_raw = None
+loaded_from_github = False
 
-# coba ambil dari GitHub
-if GITHUB_TOKEN and GITHUB_REPO:
+# coba ambil dari GitHub (hanya CURRENT yang dicek tiap TTL; partisi lama tidak pernah didownload ulang)
+if github.enabled:
     with st.spinner("🔄 Mengambil data dari GitHub..."):
-        content = download_file_from_github()
-        if content:
-            df_raw = pd.read_excel(BytesIO(content), header=[0, 1])
-            st.info("✅ Data dimuat dari GitHub.")
-
-# fallback lokal
-if df_raw is None and os.path.exists(DATA_PATH):
-    with st.spinner("🔄 Membaca data terakhir (lokal)..."):
-        stat = os.stat(DATA_PATH)
-        df_raw = read_excel_cached(DATA_PATH, stat.st_size, stat.st_mtime)
-        st.info("ℹ️ Menampilkan data dari upload terakhir (lokal).")
-
-if df_raw is None:
+        loaded_from_github = bool(sync_data_from_github(GITHUB_STORE_PATH))
+
+# Migrasi sekali: workbook lama (data/last_data.xlsx) → store per periode versi pertama
+if store.current_version() is None and os.path.exists(DATA_PATH):
+    with st.spinner("🔄 Memindahkan data lama ke penyimpanan per periode..."):
+        migrated = migrate_workbook(store, DATA_PATH)
+        if github.enabled:
+            push_store_version(migrated, "Migrate SLA data to per-periode store (via app)")
+
+if loaded_from_github:
+    st.info("✅ Data dimuat dari GitHub.")
+elif store.current_version() is not None:
+    st.info("ℹ️ Menampilkan data dari upload terakhir (lokal).")
+else:
     st.warning("⚠️ Belum ada file yang diunggah.")
-    df_raw = None
 
 # ==============================
 # Konfigurasi Halaman (TIDAK DIUBAH)
@@ -204,31 +160,6 @@ st.set_page_config(page_title="SLA Payment Analyzer", layout="wide", page_icon="
 # font="sans serif"
 # ------------------------------
 
-# ==============================
-# Fungsi untuk baca data dengan animasi ferry  (TIDAK DIUBAH)
-# ==============================
-@st.cache_data
-def load_data(file_path):
-    ferry_html = """
-    <div style="display:flex;justify-content:center;">
-        <lottie-player src="https://assets10.lottiefiles.com/packages/lf20_xpdp3p.json"
-            background="transparent"
-            speed="1"
-            style="width: 300px; height: 300px;"
-            loop
-            autoplay>
-        </lottie-player>
-    </div>
-    """
-    with st.spinner("Memuat data..."):
-        st.components.v1.html(
-            '<script src="https://unpkg.com/@lottiefiles/lottie-player@latest/dist/lottie-player.js"></script>'
-            + ferry_html,
-            height=350,
-        )
-        time.sleep(2)  # simulasi loading
-        return pd.read_excel(file_path)
-
 # ==============================
 # Styling: CSS untuk look modern (TIDAK DIUBAH)
 # ==============================
@@ -390,7 +321,6 @@ with st.sidebar:
 # ==============================
 os.makedirs("data", exist_ok=True)
 os.makedirs("assets", exist_ok=True)  # taruh assets/rocket.gif
-DATA_PATH = os.path.join("data", "last_data.xlsx")
 ROCKET_GIF_PATH = os.path.join("assets", "rocket.gif")
 
 def gif_b64(path: str) -> str | None:
@@ -418,78 +348,120 @@ else:
     st.sidebar.warning("Admin password belum dikonfigurasi (Secrets/ENV). App berjalan dalam mode read-only.")
     is_admin = False
     
-# ==============================
-# Util SLA (TIDAK DIUBAH)
-# ==============================
-def parse_sla(s):
-    if pd.isna(s):
-        return None
-    s = str(s).upper().replace("SLA", "").strip()
-    days = hours = minutes = seconds = 0
-    day_match = re.search(r'(\d+)\s*DAY', s)
-    if day_match:
-        days = int(day_match.group(1))
-    time_match = re.search(r'(\d{1,2}):(\d{2})(?::(\d{2}))?', s)
-    if time_match:
-        hours = int(time_match.group(1))
-        minutes = int(time_match.group(2))
-        if time_match.group(3):
-            seconds = int(time_match.group(3))
-    return days * 86400 + hours * 3600 + minutes * 60 + seconds
-
-def seconds_to_sla_format(total_seconds):
-    if total_seconds is None or (isinstance(total_seconds, float) and math.isnan(total_seconds)):
-        return "-"
-    total_seconds = int(round(total_seconds))
-    days = total_seconds // 86400
-    remainder = total_seconds % 86400
-    hours = remainder // 3600
-    remainder %= 3600
-    minutes = remainder // 60
-    seconds = remainder % 60
-    parts = []
-    if days > 0:
-        parts.append(f"{days} hari")
-    if hours > 0 or days > 0:
-        parts.append(f"{hours} jam")
-    if minutes > 0 or hours > 0 or days > 0:
-        parts.append(f"{minutes} menit")
-    parts.append(f"{seconds} detik")
-    return " ".join(parts)
-
 # ==============================
 # Upload (hanya admin) (TIDAK DIUBAH)
 # ==============================
+UPLOAD_MODES = ["Ganti seluruh data", "Tambah periode (append)"]
+
 with st.sidebar.expander("📤 Upload Data (Admin Only)", expanded=is_admin):
-    uploaded_file = st.file_uploader("Upload file Excel (.xlsx)", type="xlsx") if is_admin else None
+    # Boleh beberapa workbook sekaligus (mis. satu per cabang); semua sheet data ikut dibaca
+    uploaded_files = st.file_uploader(
+        "Upload file Excel (.xlsx)", type="xlsx", accept_multiple_files=True
+    ) if is_admin else []
+    upload_mode = UPLOAD_MODES[0]
+    if is_admin and store.current_version() is not None:
+        upload_mode = st.radio(
+            "Mode upload", UPLOAD_MODES, key="upload_mode",
+            help="Append hanya menyimpan baris baru (duplikat dilewati) dan hanya mengirim periode yang berubah."
+        )
 
 # ==============================
 # Load data terakhir / simpan baru  (TIDAK DIUBAH + FIX: sinkronisasi GitHub)
 # ==============================
-load_status = st.empty()
-if uploaded_file is not None and is_admin:
-    with st.spinner("🚀 Mengunggah & menyiapkan data..."):
+# File di uploader tetap ada saat rerun → proses sekali per kumpulan file & mode
+upload_id = (tuple(f.file_id for f in uploaded_files), upload_mode) if uploaded_files else None
+if upload_id and is_admin and st.session_state.get("processed_upload") != upload_id:
+    st.session_state["processed_upload"] = upload_id
+    append_mode = upload_mode == UPLOAD_MODES[1]
+    with st.spinner("🚀 Menambahkan periode baru..." if append_mode else "🚀 Mengunggah & menyiapkan data..."):
         if rocket_b64:
             st.markdown(
                 f'<div style="text-align:center;"><img src="{rocket_b64}" width="160"/></div>',
                 unsafe_allow_html=True
             )
-        time.sleep(0.2)
 
-        # Simpan ke lokal
-        file_bytes = uploaded_file.getbuffer()
-        with open(DATA_PATH, "wb") as f:
-            f.write(file_bytes)
+        # Setiap upload = versi baru store; periode yang isinya sama tidak ditulis/dikirim ulang
+        manifest = None
+        try:
+            # Satu proses per file (paralel), header 2 baris + normalize_columns per sheet
+            df_upload, file_info = read_workbooks(
+                [(f.name, f.getvalue()) for f in uploaded_files], engine=EXCEL_ENGINE
+            )
+            upload_note = ", ".join(f.name for f in uploaded_files)
+            # Engine reader & waktu parse per file (juga dicatat di manifest versi)
+            st.caption("📑 " + " · ".join(
+                f"{info['file']} ({info['engine']}, {info['seconds']:.2f} s): " + ", ".join(
+                    f"{sh['sheet']} {sh['rows']} baris" if not sh["skipped"] else f"{sh['sheet']} dilewati ({sh['skipped']})"
+                    for sh in info["sheets"]
+                )
+                for info in file_info
+            ))
+            if append_mode:
+                manifest, summary = store.append(df_upload, note=upload_note, source=file_info)
+                if manifest:
+                    st.success(
+                        f"✅ {summary['added']} baris baru ditambahkan ({', '.join(summary['periode'])}); "
+                        f"{summary['duplicates']} baris duplikat dilewati."
+                    )
+                else:
+                    st.info(f"ℹ️ Semua {summary['rows']} baris sudah ada di data, tidak ada yang ditambahkan.")
+            else:
+                manifest = store.replace(df_upload, note=upload_note, source=file_info)
+        except ValueError as e:
+            st.error(f"❌ {e}")
+
+        # Upload juga ke GitHub agar semua user sinkron (satu commit, hanya partisi baru)
+        if manifest and github.enabled:
+            upload_bar = st.progress(0.0, text="📡 Upload ke GitHub...")
+            def _upload_progress(done, total):
+                upload_bar.progress(min(done / max(total, 1), 1.0),
+                                    text=f"📡 Upload ke GitHub... {done / 1e6:.1f} / {total / 1e6:.1f} MB")
+            pushed = push_store_version(manifest, f"SLA data v{manifest['version']}: {manifest['action']} (via app)",
+                                        progress=_upload_progress)
+            upload_bar.empty()
+            if pushed:
+                st.success(f"✅ Data versi {manifest['version']} berhasil disimpan & disinkronkan ke GitHub!")
+            else:
+                st.warning("⚠️ Data tersimpan lokal, tapi gagal update ke GitHub.")
+        elif manifest:
+            st.success(f"✅ Data versi {manifest['version']} berhasil disimpan.")
 
-        # Upload juga ke GitHub agar semua user sinkron
-        result = upload_file_to_github(file_bytes, path=GITHUB_PATH, message="Update SLA data (via app)")
-        if result:
-            st.success("✅ Data baru berhasil diunggah & disinkronkan ke GitHub!")
-        else:
-            st.warning("⚠️ Data tersimpan lokal, tapi gagal update ke GitHub.")
+# Tombol reset & riwayat versi (hanya admin)
+def _version_label(m):
+    return f"v{m['version']} · {m['created'].replace('T', ' ')} · {m['action']} · {m['rows']} baris"
 
-# Jika ada file data, baca & tampilkan
-if os.path.exists(DATA_PATH):
+with st.sidebar.expander("🛠️ Admin Tools", expanded=False):
+    current_manifest = store.read_manifest()
+    if is_admin and current_manifest:
+        if current_manifest["partitions"] and st.button("🗑️ Reset Data (kosongkan data terakhir)"):
+            # Reset = versi kosong baru; data lama tetap ada di riwayat
+            manifest = store.reset(note="via app")
+            if not github.enabled or push_store_version(manifest, f"SLA data v{manifest['version']}: reset (via app)"):
+                st.success("✅ Data dikosongkan. Versi sebelumnya masih bisa di-rollback.")
+            else:
+                st.warning("⚠️ Data lokal dikosongkan, tapi gagal update ke GitHub.")
+            st.rerun()
+
+        history = [store.read_manifest(v) for v in reversed(store.versions())]
+        history = [m for m in history if m and m["version"] != current_manifest["version"]]
+        if history:
+            target = st.selectbox("Riwayat versi", history, format_func=_version_label, key="rollback_version")
+            st.caption(f"Versi aktif: {_version_label(current_manifest)}")
+            if st.button("↩️ Rollback ke versi ini"):
+                if github.enabled:
+                    fetch_partitions(github, store, GITHUB_STORE_PATH, target)
+                if store.missing_partitions(target):
+                    st.error("❌ Partisi versi ini tidak lengkap, rollback dibatalkan.")
+                else:
+                    manifest = store.rollback(target["version"])
+                    if github.enabled and not push_store_version(
+                            manifest, f"SLA data v{manifest['version']}: rollback ke v{target['version']} (via app)"):
+                        st.warning("⚠️ Rollback tersimpan lokal, tapi gagal update ke GitHub.")
+                    st.rerun()
+
+# Jika ada data, baca & tampilkan
+current_manifest = store.read_manifest()
+if current_manifest and manifest_periode(current_manifest):
     # Progress & spinner saat baca file
     with st.spinner("🔄 Membaca data terakhir..."):
         if rocket_b64:
@@ -498,70 +470,27 @@ if os.path.exists(DATA_PATH):
                 unsafe_allow_html=True
             )
 
-        # Cache baca excel agar lebih cepat setelah refresh
-        @st.cache_data(show_spinner=False)
-        def read_excel_cached(path: str, size: int, mtime: float):
-            return pd.read_excel(path, header=[0, 1])
-
-        stat = os.stat(DATA_PATH)
-        df_raw = read_excel_cached(DATA_PATH, stat.st_size, stat.st_mtime)
+        # Versi store tidak pernah berubah setelah ditulis → kunci cache dataset, grafik & PDF
+        data_key = store.key()  # (root, versi)
         st.info("ℹ️ Menampilkan data dari upload terakhir.")
 else:
     st.warning("⚠️ Belum ada file yang diunggah.")
     st.stop()
 
-# Tombol reset (hanya admin) (TIDAK DIUBAH + FIX sinkron GitHub)
-with st.sidebar.expander("🛠️ Admin Tools", expanded=False):
-    if is_admin and os.path.exists(DATA_PATH):
-        if st.button("🗑️ Reset Data (hapus data terakhir)"):
-            # Hapus lokal
-            os.remove(DATA_PATH)
-            
-            # Hapus juga di GitHub
-            result = delete_file_from_github(path=GITHUB_PATH, message="Reset SLA data (via app)")
-            if result:
-                st.success("✅ Data berhasil dihapus dari lokal & GitHub.")
-            else:
-                st.warning("⚠️ Data lokal terhapus, tapi gagal menghapus dari GitHub.")
-
-            st.rerun()
-
 
 # ==============================
 # Preprocessing kolom (TIDAK DIUBAH)
 # ==============================
-# Normalisasi header multiindex
-df_raw.columns = [
-    f"{col0}_{col1}" if "SLA" in str(col0).upper() else col0
-    for col0, col1 in df_raw.columns
-]
-rename_map = {
-    "SLA_FUNGSIONAL": "FUNGSIONAL",
-    "SLA_VENDOR": "VENDOR",
-    "SLA_KEUANGAN": "KEUANGAN",
-    "SLA_PERBENDAHARAAN": "PERBENDAHARAAN",
-    "SLA_TOTAL WAKTU": "TOTAL WAKTU"
-}
-df_raw.rename(columns=rename_map, inplace=True)
-
-# Panel: daftar kolom
-with st.expander("🧾 Kolom yang terdeteksi di file"):
-    st.write(list(df_raw.columns))
+# Normalisasi header multiindex sudah dilakukan saat ingest (lihat normalize_columns)
 
-# Deteksi kolom periode
-periode_col = next((col for col in df_raw.columns if "PERIODE" in str(col).upper()), None)
+# Kolom periode (dideteksi saat upload, dicatat di manifest)
+periode_col = current_manifest["periode_col"]
 if not periode_col:
     st.error("Kolom PERIODE tidak ditemukan.")
     st.stop()
 
-# Parse SLA (tunda heavy parsing sampai setelah filter)
-sla_cols = ["FUNGSIONAL", "VENDOR", "KEUANGAN", "PERBENDAHARAAN", "TOTAL WAKTU"]
-
-# Try parse periode ke datetime (tidak wajib)
-try:
-    df_raw['PERIODE_DATETIME'] = pd.to_datetime(df_raw[periode_col], errors='coerce')
-except Exception:
-    df_raw['PERIODE_DATETIME'] = None
+# Kolom SLA sudah diparse ke detik & PERIODE_DATETIME sudah dihitung per partisi (prepare_partition)
+sla_cols = SLA_COLS
 
 # ==============================
 # Sidebar: filter periode (TIDAK DIUBAH)
@@ -569,10 +498,8 @@ except Exception:
 with st.sidebar:
     st.markdown('<div class="card">', unsafe_allow_html=True)
     st.subheader("📅 Filter Rentang Periode")
-    periode_list = sorted(
-        df_raw[periode_col].dropna().astype(str).unique().tolist(),
-        key=lambda x: pd.to_datetime(x, errors='coerce')
-    )
+    # Urutan kronologis sudah tersimpan di manifest (satu partisi per periode)
+    periode_list = manifest_periode(current_manifest)
     start_periode = st.selectbox("Periode Mulai", periode_list, index=0, key="periode_mulai")
     end_periode = st.selectbox("Periode Akhir", periode_list, index=len(periode_list)-1, key="periode_akhir")
 
@@ -583,26 +510,28 @@ if idx_start > idx_end:
     st.stop()
 
 selected_periode = periode_list[idx_start:idx_end+1]
-df_filtered = df_raw[df_raw[periode_col].astype(str).isin(selected_periode)].copy()
+# Angka agregat tab dihitung backend query (cube pandas / SQL), hanya hasil kecilnya yang dibaca;
+# baris lengkap (query.frame()) baru dimuat untuk detail vendor, poster & PDF
+try:
+    query = open_query(QUERY_BACKEND, *data_key, idx_start, idx_end)
+except ValueError as e:
+    st.warning(f"⚠️ {e} Memakai backend {DEFAULT_QUERY_BACKEND}.")
+    query = open_query(DEFAULT_QUERY_BACKEND, *data_key, idx_start, idx_end)
+data_columns = query.columns()
+jumlah_transaksi = query.rows()
 
-st.markdown(f'<div class="small">Menampilkan data periode dari <b>{start_periode}</b> sampai <b>{end_periode}</b> — total baris: <b>{len(df_filtered)}</b></div>', unsafe_allow_html=True)
+# Panel: daftar kolom
+with st.expander("🧾 Kolom yang terdeteksi di file"):
+    st.write(data_columns)
 
-available_sla_cols = [col for col in sla_cols if col in df_filtered.columns]
-proses_grafik_cols = [c for c in ["FUNGSIONAL", "VENDOR", "KEUANGAN", "PERBENDAHARAAN"] if c in available_sla_cols]
+st.markdown(f'<div class="small">Menampilkan data periode dari <b>{start_periode}</b> sampai <b>{end_periode}</b> — total baris: <b>{jumlah_transaksi}</b></div>', unsafe_allow_html=True)
+
+available_sla_cols = [col for col in sla_cols if col in data_columns]
+proses_grafik_cols = [c for c in PROSES_COLS if c in available_sla_cols]
 
 # Created by (TIDAK DIUBAH)
 st.sidebar.markdown("<p style='text-align:center; font-size:12px; color:gray;'>Created by. Firman Aditya</p>", unsafe_allow_html=True)
 
-# ==============================
-# Parsing SLA setelah filter (TIDAK DIUBAH)
-# ==============================
-with st.status("⏱️ Memproses kolom SLA setelah filter...", expanded=False) as status:
-    for col in available_sla_cols:
-        df_filtered[col] = df_filtered[col].apply(parse_sla)
-    status.update(label="✅ Parsing SLA selesai", state="complete")
-
-import io, base64
-
 def render_sparkline(data, width=180, height=60, color="#00eaff"):
     """Render sparkline sederhana (line chart kecil) sebagai PNG base64"""
     if not data or len(data) == 0:
@@ -617,20 +546,17 @@ def render_sparkline(data, width=180, height=60, color="#00eaff"):
     plt.close(fig)
     return f"data:image/png;base64,{base64.b64encode(buf.read()).decode()}"
 
-import streamlit.components.v1 as components
-
 # ==============================
 # KPI Ringkasan (2x2 Digital Cards + Count-Up FIX)
 # ==============================
 st.markdown("## 📈 Ringkasan")
 
-jumlah_transaksi = len(df_filtered)
-if "TOTAL WAKTU" in available_sla_cols and len(df_filtered) > 0:
-    avg_total_days = float(df_filtered["TOTAL WAKTU"].mean()) / 86400
+if "TOTAL WAKTU" in available_sla_cols and jumlah_transaksi > 0:
+    avg_total_days = float(query.agg(["TOTAL WAKTU"])["TOTAL WAKTU"].iloc[0]) / 86400
 else:
     avg_total_days = 0.0
 fastest_process = "Perbendaharaan"
-valid_ratio = (df_filtered[periode_col].notna().mean() * 100.0) if len(df_filtered) > 0 else 0.0
+valid_ratio = query.valid_ratio(periode_col)
 
 html_code = f"""
 <style>
@@ -716,18 +642,65 @@ animateValue("val4", 0, {valid_ratio:.1f}, 1000, 1, "%");
 components.html(html_code, height=350)
 
 # ==============================
-# Tabs untuk konten (TIDAK DIUBAH)
+# Cache grafik dashboard (bytes PNG, dibagi lintas sesi)
 # ==============================
-tab_overview, tab_proses, tab_transaksi, tab_vendor, tab_tren, tab_jumlah, tab_report = st.tabs(
-    ["🔍 Overview", "🧮 Per Proses", "🧾 Jenis Transaksi", "🏷️ Vendor", "📈 Tren", "📊 Jumlah Transaksi", "📥 Download Report"]
-)
+FIGURE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+FIGURE_DPI = 200  # sama dengan default st.pyplot
+
+class FigureCache:
+    """Cache LRU bytes gambar grafik, dibatasi total ukuran (byte)."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            data = self._items.get(key)
+            if data is not None:
+                self._items.move_to_end(key)
+            return data
+
+    def put(self, key, data):
+        with self._lock:
+            if key in self._items:
+                self._size -= len(self._items.pop(key))
+            self._items[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes and len(self._items) > 1:
+                _, old = self._items.popitem(last=False)
+                self._size -= len(old)
+
+@st.cache_resource(show_spinner=False)
+def figure_cache():
+    return FigureCache(FIGURE_CACHE_MAX_BYTES)
+
+def show_chart(chart_id, draw):
+    """Tampilkan grafik dari cache per (chart, dataset, rentang periode); draw() → fig hanya saat cache miss."""
+    key = (chart_id, data_key, idx_start, idx_end)
+    cache = figure_cache()
+    png = cache.get(key)
+    if png is None:
+        fig = draw()
+        buf = io.BytesIO()
+        fig.savefig(buf, format="png", dpi=FIGURE_DPI, bbox_inches="tight")
+        plt.close(fig)
+        png = buf.getvalue()
+        cache.put(key, png)
+    st.image(png, use_container_width=True)
 
-with tab_overview:
+# ==============================
+# Section konten: tiap section sebuah fungsi render, yang dipanggil hanya
+# section yang sedang dipilih di navigasi (lihat bagian paling bawah)
+# ==============================
+def render_tab_overview():
     st.subheader("📊 KPI Verifikasi Dokumen Penagihan")
 
     # Hitung rata-rata SLA Keuangan
-    if "KEUANGAN" in df_filtered.columns and len(df_filtered) > 0:
-        avg_keu_seconds = df_filtered["KEUANGAN"].mean()
+    if "KEUANGAN" in data_columns and jumlah_transaksi > 0:
+        avg_keu_seconds = query.agg(["KEUANGAN"])["KEUANGAN"].iloc[0]
         avg_keu_days = round(avg_keu_seconds / 86400, 2)  # format desimal hari
         avg_keu_text = seconds_to_sla_format(avg_keu_seconds)  # format hari jam menit detik
     else:
@@ -799,25 +772,22 @@ with tab_overview:
                 </div>
             """, unsafe_allow_html=True)
 
+    # Rata-rata SLA Keuangan per periode (dari backend query, dipakai tabel & grafik)
+    if "KEUANGAN" in data_columns and jumlah_transaksi > 0:
+        trend_keu = query.agg(["KEUANGAN"], by=periode_col)[["KEUANGAN"]].reset_index()
+        trend_keu["Rata-rata SLA (hari)"] = (trend_keu["KEUANGAN"] / 86400).round(2)
+
     # ==============================
     # Tabel Rata-rata SLA Keuangan per Periode (wide format)
     # ==============================
-    if "KEUANGAN" in df_filtered.columns and len(df_filtered) > 0:
+    if "KEUANGAN" in data_columns and jumlah_transaksi > 0:
         st.markdown("<hr class='soft'/>", unsafe_allow_html=True)
         st.subheader("📊 Tabel Rata-rata SLA Keuangan (Hari) per Periode")
 
-        # Hitung rata-rata per periode
-        trend_keu = df_filtered.groupby(df_filtered[periode_col].astype(str))["KEUANGAN"].mean().reset_index()
-        trend_keu["PERIODE_SORTED"] = pd.Categorical(trend_keu[periode_col], categories=selected_periode, ordered=True)
-        trend_keu = trend_keu.sort_values("PERIODE_SORTED")
-
-        # Konversi ke hari desimal
-        trend_keu["Rata-rata SLA (hari)"] = (trend_keu["KEUANGAN"] / 86400).round(2)
-
         # Bentuk tabel wide format
         table_data = pd.DataFrame(
             [trend_keu["Rata-rata SLA (hari)"].tolist()],
-            columns=trend_keu[periode_col].tolist(),
+            columns=trend_keu[periode_col].astype(str).tolist(),
             index=["SLA Verifikasi Dokumen Penagihan"]
         )
 
@@ -827,74 +797,70 @@ with tab_overview:
     # ==============================
     # Grafik SLA Keuangan per Periode (dengan label angka)
     # ==============================
-    if "KEUANGAN" in df_filtered.columns and len(df_filtered) > 0:
+    if "KEUANGAN" in data_columns and jumlah_transaksi > 0:
         st.markdown("<hr class='soft'/>", unsafe_allow_html=True)
         st.subheader("📈 Trend Rata-rata SLA Keuangan per Periode")
 
-        # Hitung rata-rata per periode
-        trend_keu = df_filtered.groupby(df_filtered[periode_col].astype(str))["KEUANGAN"].mean().reset_index()
-        trend_keu["PERIODE_SORTED"] = pd.Categorical(trend_keu[periode_col], categories=selected_periode, ordered=True)
-        trend_keu = trend_keu.sort_values("PERIODE_SORTED")
-
-        # Konversi ke hari desimal
-        trend_keu["Rata-rata SLA (hari)"] = (trend_keu["KEUANGAN"] / 86400).round(2)
-
         # Plot line chart dengan label di dot
-        fig, ax = plt.subplots(figsize=(10, 5))
-        ax.plot(trend_keu[periode_col], trend_keu["Rata-rata SLA (hari)"], marker='o', color='#1f77b4')
+        def draw():
+            fig, ax = plt.subplots(figsize=(10, 5))
+            ax.plot(trend_keu[periode_col].astype(str), trend_keu["Rata-rata SLA (hari)"], marker='o', color='#1f77b4')
 
-        # Label angka
-        for i, val in enumerate(trend_keu["Rata-rata SLA (hari)"]):
-            ax.text(i, val, f"{val}", ha='center', va='bottom', fontsize=9, color="black", weight="bold")
+            # Label angka
+            for i, val in enumerate(trend_keu["Rata-rata SLA (hari)"]):
+                ax.text(i, val, f"{val}", ha='center', va='bottom', fontsize=9, color="black", weight="bold")
 
-        ax.set_title("Trend Rata-rata SLA Keuangan per Periode")
-        ax.set_xlabel("Periode")
-        ax.set_ylabel("Rata-rata SLA (hari)")
-        ax.grid(True, linestyle='--', alpha=0.7)
+            ax.set_title("Trend Rata-rata SLA Keuangan per Periode")
+            ax.set_xlabel("Periode")
+            ax.set_ylabel("Rata-rata SLA (hari)")
+            ax.grid(True, linestyle='--', alpha=0.7)
 
-        for label in ax.get_xticklabels():
-            label.set_rotation(45)
-            label.set_ha('right')
+            for label in ax.get_xticklabels():
+                label.set_rotation(45)
+                label.set_ha('right')
+            return fig
 
-        st.pyplot(fig)
+        show_chart("overview_keuangan", draw)
     else:
         st.info("Tidak ada kolom SLA Keuangan yang bisa ditampilkan.")
 
-with tab_proses:
+def render_tab_proses():
     if available_sla_cols:
         st.subheader("📌 Rata-rata SLA per Proses (format hari jam menit detik)")
-        rata_proses_seconds = df_filtered[available_sla_cols].mean()
+        rata_proses_seconds = query.agg(available_sla_cols)[available_sla_cols].iloc[0]
         rata_proses = rata_proses_seconds.reset_index()
         rata_proses.columns = ["Proses", "Rata-rata (detik)"]
         rata_proses["Rata-rata SLA"] = rata_proses["Rata-rata (detik)"].apply(seconds_to_sla_format)
         st.dataframe(rata_proses[["Proses", "Rata-rata SLA"]], use_container_width=True)
 
         if proses_grafik_cols:
-            fig2, ax2 = plt.subplots(figsize=(8, 4))
-            values_hari = [rata_proses_seconds[col] / 86400 for col in proses_grafik_cols]
-            ax2.bar(proses_grafik_cols, values_hari, color='#75c8ff')
-            ax2.set_title("Rata-rata SLA per Proses (hari)")
-            ax2.set_ylabel("Rata-rata SLA (hari)")
-            ax2.set_xlabel("Proses")
-            ax2.grid(axis='y', linestyle='--', alpha=0.7)
-            st.pyplot(fig2)
-
-with tab_transaksi:
-    if "JENIS TRANSAKSI" in df_filtered.columns and available_sla_cols:
+            def draw():
+                fig2, ax2 = plt.subplots(figsize=(8, 4))
+                values_hari = [rata_proses_seconds[col] / 86400 for col in proses_grafik_cols]
+                ax2.bar(proses_grafik_cols, values_hari, color='#75c8ff')
+                ax2.set_title("Rata-rata SLA per Proses (hari)")
+                ax2.set_ylabel("Rata-rata SLA (hari)")
+                ax2.set_xlabel("Proses")
+                ax2.grid(axis='y', linestyle='--', alpha=0.7)
+                return fig2
+
+            show_chart("proses_rata", draw)
+
+def render_tab_transaksi():
+    if "JENIS TRANSAKSI" in data_columns and available_sla_cols:
         st.subheader("📌 Rata-rata SLA per Jenis Transaksi (dengan jumlah transaksi)")
-        transaksi_group = df_filtered.groupby("JENIS TRANSAKSI")[available_sla_cols].agg(['mean', 'count']).reset_index()
+        transaksi_group = query.agg(available_sla_cols, by="JENIS TRANSAKSI").reset_index()
         transaksi_display = pd.DataFrame()
         transaksi_display["JENIS TRANSAKSI"] = transaksi_group["JENIS TRANSAKSI"]
         for col in available_sla_cols:
-            transaksi_display[f"{col} (Rata-rata)"] = transaksi_group[(col, 'mean')].apply(seconds_to_sla_format)
-            transaksi_display[f"{col} (Jumlah)"] = transaksi_group[(col, 'count')]
+            transaksi_display[f"{col} (Rata-rata)"] = transaksi_group[col].apply(seconds_to_sla_format)
+            transaksi_display[f"{col} (Jumlah)"] = transaksi_group[f"{col}_N"]
         st.dataframe(transaksi_display, use_container_width=True)
     else:
         st.info("Kolom 'JENIS TRANSAKSI' tidak ditemukan atau tidak ada kolom SLA yang tersedia.")
    
-with tab_vendor:
-    import plotly.express as px
-    import streamlit.components.v1 as components
+def render_tab_vendor():
+    import plotly.express as px  # plotly hanya dimuat saat tab Vendor dibuka
 
     # ==============================
     # Helper: format detik -> "x hari x jam x menit x detik"
@@ -914,7 +880,7 @@ with tab_vendor:
         secs = s % 60
         return f"{days} hari {hours} jam {minutes} menit {secs} detik"
 
-    if "NAMA VENDOR" in df_filtered.columns:
+    if "NAMA VENDOR" in data_columns:
         # ==============================
         # 1) FILTER KATEGORI
         # ==============================
@@ -923,46 +889,18 @@ with tab_vendor:
             ["ALL", "ALL CABANG", "ALL PUSAT", "ALL VENDOR"]
         )
 
-        if kategori_filter == "ALL CABANG":
-            df_vendor_filtered = df_filtered[
-                df_filtered["NAMA VENDOR"].astype(str).str.upper().str.contains("GM CABANG", na=False)
-            ].copy()
-            df_vendor_filtered["SLA_USED"] = pd.to_numeric(df_vendor_filtered["FUNGSIONAL"], errors="coerce")
-
-        elif kategori_filter == "ALL PUSAT":
-            nama = df_filtered["NAMA VENDOR"].astype(str)
-            mask_pusat = nama.str[:3].eq("110") & (nama.str.len() >= 12) & nama.str[11].eq("-")
-            df_vendor_filtered = df_filtered[mask_pusat].copy()
-            df_vendor_filtered["SLA_USED"] = pd.to_numeric(df_vendor_filtered["FUNGSIONAL"], errors="coerce")
-
-        elif kategori_filter == "ALL VENDOR":
-            nama = df_filtered["NAMA VENDOR"].astype(str)
-            mask_cabang = nama.str.upper().str.contains("GM CABANG", na=False)
-            mask_pusat = nama.str[:3].eq("110") & (nama.str.len() >= 12) & nama.str[11].eq("-")
-            df_vendor_filtered = df_filtered[~(mask_cabang | mask_pusat)].copy()
-            df_vendor_filtered["SLA_USED"] = pd.to_numeric(df_vendor_filtered["VENDOR"], errors="coerce")
-
+        # Kategori & SLA_USED sudah dihitung sekali per partisi (read_partition);
+        # angka agregat diambil dari backend query, baris hanya untuk tabel detail
+        kategori_map = {"ALL CABANG": "CABANG", "ALL PUSAT": "PUSAT", "ALL VENDOR": "VENDOR"}
+        if kategori_filter in kategori_map:
+            query_vendor = query.filter(VENDOR_KATEGORI_COL, [kategori_map[kategori_filter]])
         else:  # "ALL"
-            df_vendor_filtered = df_filtered.copy()
-
-            def pick_sla(row):
-                nama = str(row["NAMA VENDOR"]).upper()
-                if "GM CABANG" in nama:
-                    return row.get("FUNGSIONAL")
-                elif nama.startswith("110") and len(nama) >= 12 and nama[11] == "-":
-                    return row.get("FUNGSIONAL")
-                else:
-                    return row.get("VENDOR")
-
-            df_vendor_filtered["SLA_USED"] = df_vendor_filtered.apply(pick_sla, axis=1)
-            df_vendor_filtered["SLA_USED"] = pd.to_numeric(df_vendor_filtered["SLA_USED"], errors="coerce")
-
-        df_vendor_filtered["SLA_USED_FMT"] = df_vendor_filtered["SLA_USED"].apply(fmt_duration)
+            query_vendor = query
 
         # ==============================
         # 2) FILTER VENDOR
         # ==============================
-        vendor_list = sorted(df_vendor_filtered["NAMA VENDOR"].dropna().astype(str).unique())
+        vendor_list = sorted(query_vendor.values("NAMA VENDOR"))
         vendor_list_with_all = ["ALL"] + vendor_list
         selected_vendors = st.multiselect("Pilih Vendor", vendor_list_with_all, default=[])
 
@@ -971,14 +909,15 @@ with tab_vendor:
         else:
             if "ALL" in selected_vendors:
                 selected_vendors = vendor_list
-            df_vendor_filtered = df_vendor_filtered[df_vendor_filtered["NAMA VENDOR"].isin(selected_vendors)]
+            query_vendor = query_vendor.filter("NAMA VENDOR", selected_vendors)
 
             # ==============================
             # 3) Kartu Digital Ringkasan
             # ==============================
-            total_vendor = df_vendor_filtered["NAMA VENDOR"].nunique()
-            total_transaksi = len(df_vendor_filtered)
-            rata_sla_global_hari = float(df_vendor_filtered["SLA_USED"].mean() / 86400) if df_vendor_filtered["SLA_USED"].notna().any() else 0.0
+            total_vendor = len(query_vendor.values("NAMA VENDOR"))
+            total_transaksi = query_vendor.rows()
+            vendor_total = query_vendor.agg(["SLA_USED"]).iloc[0]
+            rata_sla_global_hari = float(vendor_total["SLA_USED"] / 86400) if vendor_total["SLA_USED_N"] > 0 else 0.0
 
             card_template = f"""
             <style>
@@ -1019,20 +958,16 @@ with tab_vendor:
             # ==============================
             # 4) Tabel Data Detail
             # ==============================
-            if df_vendor_filtered.shape[0] > 0:
+            if total_transaksi > 0:
                 st.subheader("📋 Data Terfilter")
+                df_vendor_filtered = query_vendor.frame().copy()
+                df_vendor_filtered["SLA_USED_FMT"] = df_vendor_filtered["SLA_USED"].apply(fmt_duration)
                 st.dataframe(df_vendor_filtered, use_container_width=True)
 
                 # ==============================
                 # 5) Agregasi per Vendor
                 # ==============================
-                rata_vendor = (
-                    df_vendor_filtered
-                    .groupby("NAMA VENDOR", dropna=True)["SLA_USED"]
-                    .mean()
-                    .reset_index()
-                )
-                rata_vendor["SLA_USED"] = pd.to_numeric(rata_vendor["SLA_USED"], errors="coerce")
+                rata_vendor = query_vendor.agg(["SLA_USED"], by="NAMA VENDOR")[["SLA_USED"]].reset_index()
                 rata_vendor["SLA (hari)"] = rata_vendor["SLA_USED"] / 86400.0
                 rata_vendor["SLA (format)"] = rata_vendor["SLA_USED"].apply(fmt_duration)
 
@@ -1095,16 +1030,12 @@ with tab_vendor:
                 clicked_vendor = st.selectbox("🔍 Pilih vendor untuk drill-down detail:",
                                               rata_vendor["NAMA VENDOR"].tolist() if not rata_vendor.empty else [])
                 if clicked_vendor:
-                    df_vendor_detail = df_vendor_filtered[df_vendor_filtered["NAMA VENDOR"] == clicked_vendor]
-                    if "JENIS TRANSAKSI" in df_vendor_detail.columns and not df_vendor_detail.empty:
+                    query_detail = query_vendor.filter("NAMA VENDOR", [clicked_vendor])
+                    if "JENIS TRANSAKSI" in df_vendor_filtered.columns and query_detail.rows() > 0:
                         st.markdown(f"### 📊 Detail SLA — {clicked_vendor}")
 
-                        transaksi_group = (
-                            df_vendor_detail
-                            .groupby("JENIS TRANSAKSI")["SLA_USED"]
-                            .mean()
-                            .reset_index()
-                        )
+                        detail_agg = query_detail.agg(["SLA_USED"], by="JENIS TRANSAKSI")
+                        transaksi_group = detail_agg[["SLA_USED"]].reset_index()
                         transaksi_group["SLA (hari)"] = transaksi_group["SLA_USED"] / 86400.0
                         transaksi_group["SLA (format)"] = transaksi_group["SLA_USED"].apply(fmt_duration)
                         st.dataframe(transaksi_group, use_container_width=True)
@@ -1113,12 +1044,7 @@ with tab_vendor:
                                       orientation="h", color="SLA (hari)", color_continuous_scale="Viridis")
                         st.plotly_chart(fig2, use_container_width=True)
 
-                        jumlah_per_transaksi = (
-                            df_vendor_detail
-                            .groupby("JENIS TRANSAKSI")
-                            .size()
-                            .reset_index(name="Jumlah")
-                        )
+                        jumlah_per_transaksi = detail_agg[CUBE_ROWS_COL].reset_index(name="Jumlah")
                         fig_pie = px.pie(jumlah_per_transaksi, values="Jumlah", names="JENIS TRANSAKSI")
                         st.plotly_chart(fig_pie, use_container_width=True)
 
@@ -1128,8 +1054,7 @@ with tab_vendor:
                 if len(selected_vendors) > 1 and "JENIS TRANSAKSI" in df_vendor_filtered.columns:
                     st.subheader(f"📊 Distribusi Transaksi — {len(selected_vendors)} Vendor")
                     jumlah_multi = (
-                        df_vendor_filtered.groupby(["NAMA VENDOR","JENIS TRANSAKSI"])
-                        .size()
+                        query_vendor.agg([], by=["NAMA VENDOR", "JENIS TRANSAKSI"])[CUBE_ROWS_COL]
                         .reset_index(name="Jumlah")
                     )
                     pivot_jumlah = jumlah_multi.pivot(index="NAMA VENDOR", columns="JENIS TRANSAKSI", values="Jumlah").fillna(0)
@@ -1140,14 +1065,13 @@ with tab_vendor:
     else:
         st.info("Kolom 'NAMA VENDOR' tidak ditemukan.")
 
-with tab_tren:
+def render_tab_tren():
     if available_sla_cols:
         st.subheader("📈 Trend Rata-rata SLA per Periode")
         
         # Hitung rata-rata per periode
-        trend = df_filtered.groupby(df_filtered[periode_col].astype(str))[available_sla_cols].mean().reset_index()
-        trend["PERIODE_SORTED"] = pd.Categorical(trend[periode_col], categories=selected_periode, ordered=True)
-        trend = trend.sort_values("PERIODE_SORTED").reset_index(drop=True)
+        trend = query.agg(available_sla_cols, by=periode_col)[available_sla_cols].reset_index()
+        trend[periode_col] = trend[periode_col].astype(str)
 
         # Tambahkan kolom nomor urut
         trend.insert(0, "No", range(1, len(trend) + 1))
@@ -1159,7 +1083,7 @@ with tab_tren:
 
         # Hapus kolom bantu & sembunyikan index Pandas
         st.dataframe(
-            trend_display.drop(columns=["PERIODE_SORTED"]).set_index("No").style.hide(axis="index"),
+            trend_display.set_index("No").style.hide(axis="index"),
             use_container_width=True
         )
 
@@ -1167,67 +1091,71 @@ with tab_tren:
         # Grafik TOTAL WAKTU
         # ==============================
         if "TOTAL WAKTU" in available_sla_cols:
-            fig, ax = plt.subplots(figsize=(10, 5))
-            y_values_days = trend["TOTAL WAKTU"] / 86400
-            x_values = trend[periode_col]
+            def draw():
+                fig, ax = plt.subplots(figsize=(10, 5))
+                y_values_days = trend["TOTAL WAKTU"] / 86400
+                x_values = trend[periode_col]
 
-            ax.plot(x_values, y_values_days, marker='o', label="TOTAL WAKTU", color='#9467bd')
+                ax.plot(x_values, y_values_days, marker='o', label="TOTAL WAKTU", color='#9467bd')
 
-            # Tambahkan angka di setiap dot (2 angka desimal)
-            for x, y in zip(x_values, y_values_days):
-                ax.text(x, y, f"{y:.2f}", ha='center', va='bottom', fontsize=9, color="black", weight="bold")
+                # Tambahkan angka di setiap dot (2 angka desimal)
+                for x, y in zip(x_values, y_values_days):
+                    ax.text(x, y, f"{y:.2f}", ha='center', va='bottom', fontsize=9, color="black", weight="bold")
 
-            ax.set_title("Trend Rata-rata SLA TOTAL WAKTU per Periode")
-            ax.set_xlabel("Periode")
-            ax.set_ylabel("Rata-rata SLA (hari)")
-            ax.grid(True, linestyle='--', alpha=0.7)
-            ax.legend()
+                ax.set_title("Trend Rata-rata SLA TOTAL WAKTU per Periode")
+                ax.set_xlabel("Periode")
+                ax.set_ylabel("Rata-rata SLA (hari)")
+                ax.grid(True, linestyle='--', alpha=0.7)
+                ax.legend()
 
-            for label in ax.get_xticklabels():
-                label.set_rotation(45)
-                label.set_ha('right')
+                for label in ax.get_xticklabels():
+                    label.set_rotation(45)
+                    label.set_ha('right')
+                return fig
 
-            st.pyplot(fig)
+            show_chart("tren_total_waktu", draw)
 
         # ==============================
         # Grafik per proses
         # ==============================
         if proses_grafik_cols:
-            fig3, axs = plt.subplots(2, 2, figsize=(14, 8), constrained_layout=True)
-            fig3.suptitle("Trend Rata-rata SLA per Proses")
-            axs = axs.flatten()
+            def draw():
+                fig3, axs = plt.subplots(2, 2, figsize=(14, 8), constrained_layout=True)
+                fig3.suptitle("Trend Rata-rata SLA per Proses")
+                axs = axs.flatten()
 
-            for i, col in enumerate(proses_grafik_cols):
-                y_days = trend[col] / 86400
-                x_values = trend[periode_col]
+                for i, col in enumerate(proses_grafik_cols):
+                    y_days = trend[col] / 86400
+                    x_values = trend[periode_col]
 
-                axs[i].plot(x_values, y_days, marker='o', color='#75c8ff')
+                    axs[i].plot(x_values, y_days, marker='o', color='#75c8ff')
 
-                # Tambahkan angka di setiap dot (2 angka desimal)
-                for x, y in zip(x_values, y_days):
-                    axs[i].text(x, y, f"{y:.2f}", ha='center', va='bottom', fontsize=8, color="black")
+                    # Tambahkan angka di setiap dot (2 angka desimal)
+                    for x, y in zip(x_values, y_days):
+                        axs[i].text(x, y, f"{y:.2f}", ha='center', va='bottom', fontsize=8, color="black")
 
-                axs[i].set_title(col)
-                axs[i].set_ylabel("Hari")
-                axs[i].grid(True, linestyle='--', alpha=0.7)
+                    axs[i].set_title(col)
+                    axs[i].set_ylabel("Hari")
+                    axs[i].grid(True, linestyle='--', alpha=0.7)
 
-                for label in axs[i].get_xticklabels():
-                    label.set_rotation(45)
-                    label.set_ha('right')
+                    for label in axs[i].get_xticklabels():
+                        label.set_rotation(45)
+                        label.set_ha('right')
+                return fig3
 
-            st.pyplot(fig3)
+            show_chart("tren_proses", draw)
 
     else:
         st.info("Tidak ada kolom SLA yang dapat ditampilkan di tren.")
 
 
-with tab_jumlah:
+def render_tab_jumlah():
     st.subheader("📊 Jumlah Transaksi per Periode")
-    jumlah_transaksi = df_filtered.groupby(df_filtered[periode_col].astype(str)).size().reset_index(name='Jumlah')
-    jumlah_transaksi = jumlah_transaksi.sort_values(
-        by=periode_col,
-        key=lambda x: pd.Categorical(x, categories=selected_periode, ordered=True)
+    jumlah_transaksi = (
+        query.agg([], by=periode_col)[CUBE_ROWS_COL]
+        .reset_index(name='Jumlah')
     )
+    jumlah_transaksi[periode_col] = jumlah_transaksi[periode_col].astype(str)
     total_row = pd.DataFrame({periode_col: ["TOTAL"], 'Jumlah': [jumlah_transaksi['Jumlah'].sum()]})
     jumlah_transaksi = pd.concat([jumlah_transaksi, total_row], ignore_index=True)
 
@@ -1236,766 +1164,101 @@ with tab_jumlah:
 
     st.dataframe(jumlah_transaksi.style.apply(highlight_total, axis=1), use_container_width=True)
 
-    fig_trans, ax_trans = plt.subplots(figsize=(10, 5))
-    ax_trans.bar(
-        jumlah_transaksi[jumlah_transaksi[periode_col] != "TOTAL"][periode_col],
-        jumlah_transaksi[jumlah_transaksi[periode_col] != "TOTAL"]['Jumlah'],
-        color='#ff9f7f'
-    )
-    ax_trans.set_title("Jumlah Transaksi per Periode")
-    ax_trans.set_xlabel("Periode")
-    ax_trans.set_ylabel("Jumlah Transaksi")
-    ax_trans.grid(axis='y', linestyle='--', alpha=0.7)
-    for label in ax_trans.get_xticklabels():
-        label.set_rotation(45)
-        label.set_ha('right')
-    st.pyplot(fig_trans)
-
-# ==========================================================
-#            FITUR BARU: 📥 DOWNLOAD POSTER (A4)
-# ==========================================================
+    def draw():
+        fig_trans, ax_trans = plt.subplots(figsize=(10, 5))
+        ax_trans.bar(
+            jumlah_transaksi[jumlah_transaksi[periode_col] != "TOTAL"][periode_col],
+            jumlah_transaksi[jumlah_transaksi[periode_col] != "TOTAL"]['Jumlah'],
+            color='#ff9f7f'
+        )
+        ax_trans.set_title("Jumlah Transaksi per Periode")
+        ax_trans.set_xlabel("Periode")
+        ax_trans.set_ylabel("Jumlah Transaksi")
+        ax_trans.grid(axis='y', linestyle='--', alpha=0.7)
+        for label in ax_trans.get_xticklabels():
+            label.set_rotation(45)
+            label.set_ha('right')
+        return fig_trans
 
-# ==========================================================
-#                       SLA App
-# ==========================================================
-import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-from PIL import Image, ImageDraw, ImageFont
-import requests, io
+    show_chart("jumlah_transaksi", draw)
 
 # ==========================================================
-#                       Helper Functions
+#            FITUR BARU: 📥 DOWNLOAD POSTER (A4)
 # ==========================================================
-def seconds_to_sla_format(seconds):
-    """Konversi detik ke format SLA: 'Xd Yh Zm'"""
-    if seconds is None:
-        return "0d 0h 0m"
-    days = int(seconds // 86400)
-    hours = int((seconds % 86400) // 3600)
-    minutes = int((seconds % 3600) // 60)
-    return f"{days}d {hours}h {minutes}m"
 
 # ==============================
 # 👉 Tambahan: simpan teks periode untuk Poster (global scope)
 periode_info_text = f"Periode dari {start_periode} sampai {end_periode}"
 
-# ==========================================================
-# Poster A4 Generator (Gradient BG + Glassmorphism Card)
-# ==========================================================
-def generate_poster_A4(
-    sla_text_dict, rata_proses_seconds, df_proses,
-    image_url, periode_range_text,
-    df_filtered, periode_col, selected_periode
-):
-    W, H = 2480, 3508
-
-    # ---------- Gradient Background (biru → putih) ----------
-    bg = Image.new("RGB", (W, H))
-    draw_bg = ImageDraw.Draw(bg)
-    for y in range(H):
-        r = int(255 - (y / H) * 55)   # putih → biru lembut
-        g = int(255 - (y / H) * 100)
-        b = int(255 - (y / H) * 155)
-        draw_bg.line([(0, y), (W, y)], fill=(r, g, b))
-
-    draw = ImageDraw.Draw(bg)
-
-    # ---------- Logo ASDP ----------
-    try:
-        logo_path = os.path.join(os.path.dirname(__file__), "asdp_logo.png")
-        logo_img = Image.open(logo_path).convert("RGBA")
-        scale = (W * 0.15) / logo_img.width
-        logo_img = logo_img.resize((int(logo_img.width*scale), int(logo_img.height*scale)), Image.Resampling.LANCZOS)
-        bg.paste(logo_img, (2000, 80), logo_img)
-    except:
-        pass
-
-    # ---------- Logo Danantara ----------
-    try:
-        logo_path = os.path.join(os.path.dirname(__file__), "Danantara.png")
-        logo_img = Image.open(logo_path).convert("RGBA")
-        scale = (W * 0.2) / logo_img.width
-        logo_img = logo_img.resize((int(logo_img.width*scale), int(logo_img.height*scale)), Image.Resampling.LANCZOS)
-        bg.paste(logo_img, (80, 80), logo_img)
-    except:
-        pass
-
-    # ---------- Logo Transformation (atas kiri bawah) ----------
-    try:
-        logo_path = os.path.join(os.path.dirname(__file__), "Transformation.png")
-        logo_img = Image.open(logo_path).convert("RGBA")
-        scale = (W * 0.2) / logo_img.width
-        logo_img = logo_img.resize((int(logo_img.width*scale), int(logo_img.height*scale)), Image.Resampling.LANCZOS)
-        bg.paste(logo_img, (80, 3000), logo_img)
-    except:
-        pass
-
-    # ---------- Judul ----------
-    title_text = "SLA DOKUMEN PENAGIHAN"
-    try:
-        font_title = ImageFont.truetype("Anton-Regular.ttf", 200)
-    except:
-        font_title = ImageFont.load_default()
-    bbox_title = draw.textbbox((0, 0), title_text, font=font_title)
-    title_w = bbox_title[2] - bbox_title[0]
-    title_h = bbox_title[3] - bbox_title[1]
-    title_y = int(H * 0.10)
-    draw.text(((W - title_w) // 2, title_y), title_text, fill="black", font=font_title)
-
-    # ---------- Periode ----------
-    max_width = int(W * 0.8)
-    font_size = 140
-    try:
-        font_periode = ImageFont.truetype("Anton-Regular.ttf", font_size)
-    except:
-        font_periode = ImageFont.load_default()
-    while True:
-        bbox_periode = draw.textbbox((0, 0), periode_range_text, font=font_periode)
-        periode_w = bbox_periode[2] - bbox_periode[0]
-        periode_h = bbox_periode[3] - bbox_periode[1]
-        if periode_w <= max_width or font_size <= 40:
-            break
-        font_size -= 10
-        try:
-            font_periode = ImageFont.truetype("Anton-Regular.ttf", font_size)
-        except:
-            font_periode = ImageFont.load_default()
-    periode_y = title_y + title_h + int(H * 0.03)
-    draw.text(((W - periode_w) // 2, periode_y), periode_range_text, fill="black", font=font_periode)
-
-    # ---------- Garis Separator ----------
-    line_y = periode_y + periode_h + 30
-    margin_x = 150
-    draw.line((margin_x, line_y, W - margin_x, line_y), fill="black", width=12)
-
-    # ---------- Grafik SLA Proses ----------
-    chart_img = None
-    try:
-        fig, ax = plt.subplots(figsize=(10, 4))
-        values_hari = [rata_proses_seconds[col] / 86400 for col in rata_proses_seconds.index]
-        ax.bar(rata_proses_seconds.index, values_hari, color='#75c8ff')
-        ax.set_title("Rata-rata SLA per Proses (hari)")
-        ax.set_ylabel("Hari")
-        ax.grid(axis='y', linestyle='--', alpha=0.7)
-        buf = io.BytesIO()
-        fig.savefig(buf, format="PNG", dpi=300, bbox_inches="tight", transparent=True)
-        buf.seek(0); plt.close(fig)
-        chart_img = Image.open(buf).convert("RGBA")
-        max_chart_width = int(W * 0.65)
-        scale = max_chart_width / chart_img.width
-        chart_img = chart_img.resize(
-            (int(chart_img.width * scale), int(chart_img.height * scale)),
-            Image.Resampling.LANCZOS
-        )
-    except Exception as e:
-        print("Gagal render chart:", e)
-
-    # ---------- Render Tabel SLA ----------
-    table_img = None
-    try:
-        fig, ax = plt.subplots(figsize=(5, 4))
-        ax.axis('off')
-        tbl = ax.table(
-            cellText=df_proses.values,
-            colLabels=df_proses.columns,
-            rowLabels=df_proses.index,
-            loc='center'
-        )
-        tbl.auto_set_font_size(False)
-        tbl.set_fontsize(12)
-        tbl.scale(1.3, 1.3)
-        tbl.auto_set_column_width([0, 1])
-        buf = io.BytesIO()
-        fig.savefig(buf, format="PNG", dpi=300, bbox_inches="tight", transparent=True)
-        buf.seek(0); plt.close(fig)
-        table_img = Image.open(buf).convert("RGBA")
-        max_tbl_width = int(W * 0.30)
-        scale = max_tbl_width / table_img.width
-        table_img = table_img.resize(
-            (int(table_img.width * scale), int(table_img.height * scale)),
-            Image.Resampling.LANCZOS
-        )
-    except Exception as e:
-        print("Gagal render tabel SLA:", e)
-
-    # ---------- Glassmorphism Card ----------
-    card_margin_x = 80
-    card_top = line_y + 20
-    content_height = max(chart_img.height if chart_img else 0, table_img.height if table_img else 0)
-    card_bottom = card_top + content_height + 80
-    card_box = (card_margin_x, card_top, W - card_margin_x, card_bottom)
-
-    # Blur background dalam area card
-    region = bg.crop(card_box).filter(ImageFilter.GaussianBlur(20))
-    bg.paste(region, card_box)
-
-    # Semi transparan overlay
-    card_overlay = Image.new("RGBA", bg.size, (255, 255, 255, 0))
-    overlay_draw = ImageDraw.Draw(card_overlay)
-    overlay_draw.rounded_rectangle(
-        card_box,
-        radius=40,
-        outline=(255, 255, 255, 200),
-        width=4,
-        fill=(255, 255, 255, 100)
-    )
-    bg = Image.alpha_composite(bg.convert("RGBA"), card_overlay)
-    draw = ImageDraw.Draw(bg)
-
-    if chart_img:
-        pos_x = card_margin_x + 50
-        pos_y = card_top + 40
-        bg.paste(chart_img, (pos_x, pos_y), chart_img)
-    if table_img:
-        pos_x = W - table_img.width - card_margin_x - 50
-        pos_y = card_top + 40
-        bg.paste(table_img, (pos_x, pos_y), table_img)    # ---------- Kemudi + On Target ----------
-    try:
-        kemudi_path = os.path.join(os.path.dirname(__file__), "Kemudi.png")
-        kemudi_img = Image.open(kemudi_path).convert("RGBA")
-        target_width = int(W * 0.18)
-        scale = target_width / kemudi_img.width
-        kemudi_img = kemudi_img.resize((target_width, int(kemudi_img.height * scale)), Image.Resampling.LANCZOS)
-        pos_x = W - card_margin_x - kemudi_img.width - 50
-        pos_y = card_top + table_img.height + 30
-        bg.paste(kemudi_img, (pos_x, pos_y), kemudi_img)
-        font_target = ImageFont.truetype(os.path.join(os.path.dirname(__file__), "Anton-Regular.ttf"), 120)
-        text = "ON TARGET"
-        bbox = draw.textbbox((0, 0), text, font=font_target)
-        tw, th = bbox[2] - bbox[0], bbox[3] - bbox[1]
-        text_x = pos_x + (kemudi_img.width - tw) // 2
-        text_y = pos_y + kemudi_img.height + 1
-        draw.text((text_x, text_y), text, font=font_target, fill=(0, 150, 0))
-    except Exception as e:
-        print("Gagal render Kemudi/On Target:", e)
-
-    # ---------- Footer + Garis Tengah + Grafik & Tabel Jumlah Transaksi ----------
-    try:
-        footer_path = os.path.join(os.path.dirname(__file__), "Footer.png")
-        footer_img = Image.open(footer_path).convert("RGBA")
-        scale = W / footer_img.width
-        footer_img = footer_img.resize((W, int(footer_img.height * scale)), Image.Resampling.LANCZOS)
-        footer_y = H - footer_img.height
-
-        # 1. Garis tengah
-        overlay = Image.new("RGBA", bg.size, (255, 255, 255, 0))
-        overlay_draw = ImageDraw.Draw(overlay)
-        center_x = W // 2
-        overlay_draw.line((center_x, card_bottom, center_x, H), fill="black", width=15)
-        bg = Image.alpha_composite(bg, overlay)
-
-        # 2. Grafik jumlah transaksi
-        trans_img = None
-        pos_y_trans = card_bottom + 50
-        try:
-            jumlah_transaksi = df_filtered.groupby(df_filtered[periode_col].astype(str)).size().reset_index(name='Jumlah')
-            jumlah_transaksi = jumlah_transaksi.sort_values(
-                by=periode_col,
-                key=lambda x: pd.Categorical(x, categories=selected_periode, ordered=True)
-            )
-            fig_trans, ax_trans = plt.subplots(figsize=(8, 5))
-            colors = plt.cm.viridis(range(len(jumlah_transaksi)))
-            ax_trans.bar(jumlah_transaksi[periode_col], jumlah_transaksi['Jumlah'], color=colors)
-            ax_trans.set_title("Jumlah Transaksi per Periode", fontsize=28, weight="bold")
-            ax_trans.set_xlabel("Periode")
-            ax_trans.set_ylabel("Jumlah")
-            ax_trans.grid(axis='y', linestyle='--', alpha=0.6)
-            for label in ax_trans.get_xticklabels():
-                label.set_rotation(45)
-                label.set_ha('right')
-            buf = io.BytesIO()
-            fig_trans.savefig(buf, format="PNG", dpi=300, bbox_inches="tight", transparent=True)
-            buf.seek(0); plt.close(fig_trans)
-            trans_img = Image.open(buf).convert("RGBA")
-            max_width = int(W * 0.40)
-            max_height = H - card_bottom - footer_img.height - 400
-            scale = min(max_width / trans_img.width, max_height / trans_img.height)
-            trans_img = trans_img.resize((int(trans_img.width * scale), int(trans_img.height * scale)), Image.Resampling.LANCZOS)
-            pos_x = 150
-            bg.paste(trans_img, (pos_x, pos_y_trans), trans_img)
-        except Exception as e:
-            print("⚠️ Gagal render grafik jumlah transaksi:", e)
-
-        # 2b. Tabel jumlah transaksi (lebih keren, dinaikkan sedikit)
-        try:
-            jumlah_transaksi = df_filtered.groupby(df_filtered[periode_col].astype(str)).size().reset_index(name='Jumlah')
-            jumlah_transaksi = jumlah_transaksi.sort_values(
-                by=periode_col,
-                key=lambda x: pd.Categorical(x, categories=selected_periode, ordered=True)
-            )
-            total_row = pd.DataFrame({periode_col: ["TOTAL"], "Jumlah": [jumlah_transaksi["Jumlah"].sum()]})
-            jumlah_transaksi = pd.concat([jumlah_transaksi, total_row], ignore_index=True)
-
-            fig_tbl, ax_tbl = plt.subplots(figsize=(6, 4))
-            ax_tbl.axis("off")
-            table = ax_tbl.table(
-                cellText=jumlah_transaksi.values,
-                colLabels=jumlah_transaksi.columns,
-                loc="center",
-                cellLoc="center"
-            )
-            table.auto_set_font_size(False)
-            table.set_fontsize(16)
-            table.scale(1.5, 1.5)
-
-            # Header style
-            for j in range(len(jumlah_transaksi.columns)):
-                cell = table[(0, j)]
-                cell.set_fontsize(18)
-                cell.set_text_props(weight="bold", color="white")
-                cell.set_facecolor("#1f77b4")
-
-            # Row styling
-            for i in range(1, len(jumlah_transaksi) + 1):
-                for j in range(len(jumlah_transaksi.columns)):
-                    cell = table[(i, j)]
-                    if i % 2 == 0:
-                        cell.set_facecolor("#f2f2f2")
-                    else:
-                        cell.set_facecolor("#ffffff")
-                    if jumlah_transaksi.iloc[i-1, 0] == "TOTAL":
-                        cell.set_text_props(weight="bold", color="darkred")
-                        cell.set_facecolor("#e6e6e6")
-
-            buf = io.BytesIO()
-            fig_tbl.savefig(buf, format="PNG", dpi=300, bbox_inches="tight", transparent=True)
-            buf.seek(0); plt.close(fig_tbl)
-            tbl_img = Image.open(buf).convert("RGBA")
-            max_width = int(W * 0.40)
-            scale = max_width / tbl_img.width
-            tbl_img = tbl_img.resize((int(tbl_img.width * scale), int(tbl_img.height * scale)), Image.Resampling.LANCZOS)
-            pos_x = 150
-            if trans_img:
-                pos_y = pos_y_trans + trans_img.height + 20  # lebih dekat ke grafik
-            else:
-                pos_y = pos_y_trans
-            bg.paste(tbl_img, (pos_x, pos_y), tbl_img)
-        except Exception as e:
-            print("⚠️ Gagal render tabel jumlah transaksi:", e)
-
-        # 3. Footer
-        bg.paste(footer_img, (0, footer_y), footer_img)
-
-        # 4. Captain Ferizy
-        ferizy_path = os.path.join(os.path.dirname(__file__), "Captain Ferizy.png")
-        ferizy_img = Image.open(ferizy_path).convert("RGBA")
-        scale = (footer_img.height * 2) / ferizy_img.height
-        ferizy_img = ferizy_img.resize((int(ferizy_img.width * scale), int(ferizy_img.height * scale)), Image.Resampling.LANCZOS)
-        pos_x = W - ferizy_img.width
-        pos_y = H - ferizy_img.height
-        bg.paste(ferizy_img, (pos_x, pos_y), ferizy_img)
-
-        # 5. Transformation (depan footer, kiri bawah)
-        Transformation_path = os.path.join(os.path.dirname(__file__), "Transformation.png")
-        Transformation_img = Image.open(Transformation_path).convert("RGBA")
-        scale = (footer_img.height * 0.35) / Transformation_img.height
-        Transformation_img = Transformation_img.resize((int(Transformation_img.width * scale), int(Transformation_img.height * scale)), Image.Resampling.LANCZOS)
-        pos_x = 0
-        pos_y = H - Transformation_img.height - 40
-        bg.paste(Transformation_img, (pos_x, pos_y), Transformation_img)
-
-    except Exception as e:
-        print("⚠️ Gagal render Footer/Ferizy/Transformation:", e)
-
-    out = io.BytesIO()
-    bg.save(out, format="PNG")
-    out.seek(0)
-    return out
-
 # ==========================================================
 # Tab Report (Poster & PDF)
 # ==========================================================
-with tab_report:
-    tab_poster, tab_pdf = st.tabs(["🎨 Poster", "📄 PDF"])
+def render_tab_report():
+    sub_section = st.radio("Jenis report", ["🎨 Poster", "📄 PDF"], horizontal=True,
+                           key="nav_report", label_visibility="collapsed")
+    if sub_section == "🎨 Poster":
+        render_tab_poster()
+    else:
+        render_tab_pdf()
+
+def render_tab_poster():
+    # PIL/matplotlib poster baru dimuat saat tab ini dibuka
+    from sla_core.poster import POSTER_OUTPUTS, POSTER_PREVIEW, generate_poster_for, poster_output
 
-with tab_poster:
     st.subheader("📥 Download Poster")
 
     if st.button("🎨 Generate Poster A4"):
-        rata_proses_seconds = df_filtered[proses_grafik_cols].mean()
-        
-        df_proses = pd.DataFrame({
-            "Rata-rata SLA": [
-                format_duration(rata_proses_seconds[col]) for col in rata_proses_seconds.index
-            ]
-        }, index=rata_proses_seconds.index)
-        
-        poster_buf = generate_poster_A4(
-        {},
-        rata_proses_seconds,
-        df_proses,
-        "Captain Ferizy.png",
-        periode_info_text,
-        df_filtered,
-        periode_col,
-        selected_periode
+        poster_img = generate_poster_for(
+            query.frame(), periode_col, selected_periode, proses_grafik_cols,
+            periode_range_text=periode_info_text, as_image=True
         )
-        st.session_state.poster_buf = poster_buf
+        st.session_state.poster = {"image": poster_img, "encoded": {}}
     
-    if "poster_buf" in st.session_state:
-        st.image(st.session_state.poster_buf,
+    if "poster" in st.session_state:
+        poster = st.session_state.poster
+        # Preview pakai render resolusi rendah, bukan PNG A4 penuh
+        st.image(poster_output(poster, POSTER_PREVIEW),
                  caption="Preview Poster A4",
                  use_column_width=True)
+        option = st.selectbox("Format poster", list(POSTER_OUTPUTS), key="poster_output")
+        spec = POSTER_OUTPUTS[option]
         st.download_button(
-            "💾 Download Poster (PNG, A4 - 300 DPI)",
-            st.session_state.poster_buf,
-            file_name="Poster_SLA_A4.png",
-            mime="image/png"
+            f"💾 Download Poster ({option})",
+            poster_output(poster, option),
+            file_name=f"Poster_SLA_A4.{spec['ext']}",
+            mime=spec["mime"]
         )
 
 
 
-# =====================[ HELPERS PDF ]=====================
-# ====================== IMPORTS ======================
-from reportlab.platypus import (
-    SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle,
-    Image as RLImage, PageBreak
-)
-from reportlab.lib.pagesizes import A4, landscape
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
-from reportlab.lib.units import cm
-from reportlab.lib.utils import ImageReader
-import io, matplotlib.pyplot as plt
-import pandas as pd
-import streamlit as st
-
-# ====================== LOGO ASSET ======================
-LOGO_LEFT_URL  = "https://raw.githubusercontent.com/firmanaditya90/SLA/main/Danantara.png"
-LOGO_RIGHT_URL = "https://raw.githubusercontent.com/firmanaditya90/SLA/main/asdp_logo.png"
-LOGO_ASDP_URL  = LOGO_RIGHT_URL  # cover logo center
-
-# ====================== STYLES ======================
-_styles = getSampleStyleSheet()
-_styles.add(ParagraphStyle(name="CoverTitle", fontName="Helvetica-Bold", fontSize=30, leading=34, alignment=1, spaceAfter=12))
-_styles.add(ParagraphStyle(name="CoverSub",   fontName="Helvetica-Bold", fontSize=16, leading=20, alignment=1, spaceAfter=20))
-_styles.add(ParagraphStyle(name="HeadingCenter", fontName="Helvetica-Bold", fontSize=20, leading=24, alignment=1, spaceAfter=12, textColor=colors.HexColor("#0f172a")))
-_styles.add(ParagraphStyle(name="TOCItem", fontName="Helvetica", fontSize=13, leading=18, alignment=0, leftIndent=0))
-_styles.add(ParagraphStyle(name="Narr", fontName="Helvetica", fontSize=11, leading=15, alignment=1, spaceBefore=8, spaceAfter=8))
-_styles.add(ParagraphStyle(name="KPI", fontName="Helvetica-Bold", fontSize=12, leading=15, alignment=1, spaceAfter=10))
-_styles.add(ParagraphStyle(name="SmallRight", fontName="Helvetica", fontSize=9, alignment=2))
-
-# ====================== HELPERS ======================
-def _img_reader(url):
-    try: return ImageReader(url)
-    except: return None
-
-def _plot_to_rlimage(fig, w_cm=11, h_cm=6, dpi=150):
-    buf = io.BytesIO()
-    fig.savefig(buf, format="png", bbox_inches="tight", dpi=dpi)
-    plt.close(fig)
-    buf.seek(0)
-    return RLImage(buf, width=w_cm*cm, height=h_cm*cm)
-
-def _nice_table(data, colWidths=None, header_bg="#0ea5e9", align="CENTER"):
-    tbl = Table(data, colWidths=colWidths, hAlign=align)
-    tbl.setStyle(TableStyle([
-        ("BACKGROUND",(0,0),(-1,0),colors.HexColor(header_bg)),
-        ("TEXTCOLOR",(0,0),(-1,0),colors.white),
-        ("FONTNAME",(0,0),(-1,0),"Helvetica-Bold"),
-        ("FONTSIZE",(0,0),(-1,0),11),
-        ("ALIGN",(0,0),(-1,0),"CENTER"),
-        ("GRID",(0,0),(-1,-1),0.5,colors.HexColor("#d1d5db")),
-        ("ROWBACKGROUNDS",(0,1),(-1,-1),[colors.white,colors.HexColor("#f8fafc")]),
-        ("FONTSIZE",(0,1),(-1,-1),10),
-        ("VALIGN",(0,0),(-1,-1),"MIDDLE"),
-        ("TOPPADDING",(0,0),(-1,-1),6),
-        ("BOTTOMPADDING",(0,0),(-1,-1),6),
-    ]))
-    return tbl
-
-def _toc_row(title, page, dots_len=80):
-    dots = "." * dots_len
-    tbl = Table(
-        [[Paragraph(title, _styles["TOCItem"]),
-          Paragraph(dots, _styles["TOCItem"]),
-          Paragraph(page, _styles["TOCItem"])]],
-        colWidths=[12*cm, 11*cm, 1.5*cm],
-        hAlign="CENTER"
-    )
-    tbl.setStyle(TableStyle([
-        ("VALIGN",(0,0),(-1,-1),"MIDDLE"),
-        ("LEFTPADDING",(0,0),(-1,-1),0),
-        ("RIGHTPADDING",(0,0),(-1,-1),0),
-        ("FONTSIZE",(0,0),(-1,-1),12),
-    ]))
-    return tbl
-
-# ====================== NARRASI HELPERS ======================
-def _narasi_overview(avg_days, kpi_target_days):
-    if avg_days is None: return "Data KEUANGAN tidak tersedia."
-    if kpi_target_days is None: return f"Rata-rata SLA KEUANGAN {avg_days:.2f} hari."
-    status = "di bawah" if avg_days <= kpi_target_days else "di atas"
-    return f"Rata-rata SLA KEUANGAN {avg_days:.2f} hari, {status} target KPI {kpi_target_days:.2f} hari."
-
-def _narasi_top_bottom(series_days):
-    if series_days is None or len(series_days)==0: return "Tidak ada data."
-    s = pd.Series(series_days).dropna().sort_values()
-    if s.empty: return "Tidak ada data."
-    lo, hi = s.index[0], s.index[-1]
-    return f"Proses tercepat: {lo} ({s.iloc[0]:.2f} hari). Terlama: {hi} ({s.iloc[-1]:.2f} hari)."
-
-def _narasi_tren(df_days):
-    desc=[]
-    for col in df_days.columns:
-        s = df_days[col].dropna()
-        if len(s)>=2:
-            delta = s.iloc[-1]-s.iloc[0]
-            arah = "naik" if delta>0 else ("turun" if delta<0 else "stabil")
-            desc.append(f"{col}: {arah} {abs(delta):.2f} hari")
-    return "Ringkasan tren: " + "; ".join(desc) if desc else "Tren belum dapat dianalisis."
-
-def _narasi_transaksi(trans_df):
-    if trans_df.empty: return "Tidak ada data transaksi."
-    peak = trans_df.loc[trans_df["Jumlah"].idxmax()]
-    low  = trans_df.loc[trans_df["Jumlah"].idxmin()]
-    mean = trans_df["Jumlah"].mean()
-    return f"Rata-rata transaksi {mean:.1f}. Tertinggi {peak['Periode']} ({int(peak['Jumlah'])}), terendah {low['Periode']} ({int(low['Jumlah'])})."
-
-# ====================== HEADER & FOOTER ======================
-def _first_page(canvas, doc):
-    pw, ph = landscape(A4)
-    try:
-        canvas.drawImage(_img_reader(LOGO_ASDP_URL), pw/2 - 3*cm, ph - 10*cm,
-                         width=6*cm, height=6*cm, mask='auto')
-    except: pass
-
-def _later_pages(canvas, doc):
-    pw, ph = landscape(A4)
-    try: canvas.drawImage(_img_reader(LOGO_LEFT_URL), 1.5*cm, ph - 3.6*cm, width=4.5*cm, height=1.6*cm, mask='auto')
-    except: pass
-    try: canvas.drawImage(_img_reader(LOGO_RIGHT_URL), pw - 5.1*cm, ph - 3.6*cm, width=3*cm, height=3*cm, mask='auto')
-    except: pass
-    canvas.setFont("Helvetica", 9)
-    canvas.drawRightString(pw - 1.6*cm, 1.05*cm, f"Halaman {doc.page}")
-
-# ====================== MAIN FUNCTION ======================
-def generate_pdf_report_v6(df_ord, selected_periode, periode_col, available_sla_cols, proses_cols, kpi_target_days=None):
-    df = df_ord.copy()
-    df[periode_col] = df[periode_col].astype(str)
-    categories = [str(p) for p in selected_periode]
-    df[periode_col] = pd.Categorical(df[periode_col], categories=categories, ordered=True)
-    df_filt = df[df[periode_col].notna()].sort_values(periode_col)
-
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=landscape(A4),
-                            leftMargin=2*cm, rightMargin=2*cm,
-                            topMargin=3.6*cm, bottomMargin=2*cm)
-    story = []
-
-    # === Cover
-    story.append(Spacer(1, 7*cm))
-    story.append(Paragraph("LAPORAN SLA VERIFIKASI DOKUMEN PENAGIHAN PT ASDP INDONESIA FERRY (PERSERO)", _styles["CoverTitle"]))
-    if selected_periode:
-        story.append(Paragraph(f"PERIODE: {str(selected_periode[0]).upper()} – {str(selected_periode[-1]).upper()}", _styles["CoverSub"]))
-    story.append(PageBreak())
-
-    # === TOC
-    story.append(Paragraph("DAFTAR ISI", _styles["HeadingCenter"]))
-    story.append(Spacer(1,0.6*cm))
-    toc_map=[("OVERVIEW","3"),("SLA PER PROSES","4"),("SLA PER JENIS TRANSAKSI","5"),
-             ("TREN SLA","6"),("JUMLAH TRANSAKSI","8"),("KESIMPULAN","9")]
-    for t,p in toc_map:
-        story.append(_toc_row(t,p,dots_len=70))
-        story.append(Spacer(1,0.2*cm))
-    story.append(PageBreak())
-
-    # === Page 3: Overview
-    story.append(Paragraph("OVERVIEW", _styles["HeadingCenter"]))
-    total_trans = len(df_filt)
-    avg_keu_days = None
-    if "KEUANGAN" in df_filt.columns:
-        avg_keu_days = float((df_filt["KEUANGAN"].mean()/86400.0).round(2))
-    kpi_lines = [f"<b>JUMLAH TRANSAKSI</b>: {total_trans:,}"]
-    if avg_keu_days: kpi_lines.append(f"<b>RATA-RATA SLA KEUANGAN</b>: {avg_keu_days:.2f} HARI")
-    if kpi_target_days: kpi_lines.append(f"<b>TARGET KPI</b>: {kpi_target_days:.2f} HARI")
-    story.append(Paragraph("<br/>".join(kpi_lines), _styles["KPI"]))
-    if "KEUANGAN" in df_filt.columns:
-        df_keu=df_filt.groupby(periode_col)["KEUANGAN"].mean().reindex(categories).reset_index()
-        df_keu["SLA (hari)"]=(df_keu["KEUANGAN"]/86400.0).round(2)
-        df_keu.rename(columns={periode_col:"Periode"}, inplace=True)
-        tbl=_nice_table([["Periode","SLA (hari)"]]+df_keu[["Periode","SLA (hari)"]].astype(str).values.tolist(), colWidths=[4*cm,4*cm])
-        fig,ax=plt.subplots(figsize=(7,4))
-        ax.plot(df_keu["Periode"],df_keu["SLA (hari)"],marker="o",color="#0ea5e9")
-        ax.tick_params(axis="x",rotation=45)
-        if kpi_target_days: ax.axhline(y=kpi_target_days,ls="--",c="r")
-        chart=_plot_to_rlimage(fig,w_cm=13,h_cm=7)
-        pair=Table([[chart,tbl]],colWidths=[13*cm,8*cm],hAlign="CENTER")
-        pair.setStyle([("LEFTPADDING",(0,0),(-1,-1),0),("RIGHTPADDING",(0,0),(-1,-1),0)])
-        story.append(pair)
-        story.append(Spacer(1,0.5*cm))
-    story.append(PageBreak())
-    
-    # === Page 4: SLA PER PROSES
-    story.append(Paragraph("SLA PER PROSES", _styles["HeadingCenter"]))
-    valid_proc=[c for c in (proses_cols or []) if c in df_filt.columns]
-    if valid_proc:
-        dfp=(df_filt[valid_proc].mean()/86400.0).round(2)
-        tbl=_nice_table([["Proses","SLA (hari)"]]+[[i,f"{v:.2f}"] for i,v in dfp.items()])
-        fig,ax=plt.subplots(figsize=(7,4))
-        ax.bar(dfp.index,dfp.values,color="#0ea5e9")
-        ax.tick_params(axis="x",rotation=45)
-        chart=_plot_to_rlimage(fig,w_cm=13,h_cm=7)
-
-        # Layout → Grafik kiri, tabel kanan, sejajar atas
-        pair=Table([[chart,tbl]],colWidths=[13*cm,8*cm],hAlign="CENTER")
-        pair.setStyle([
-            ("LEFTPADDING",(0,0),(-1,-1),0),
-            ("RIGHTPADDING",(0,0),(-1,-1),0),
-            ("VALIGN",(0,0),(-1,-1),"TOP"),   # <<< ini penting: sejajarkan ke atas
-        ])
-        story.append(pair)
-
-        story.append(Spacer(1,0.5*cm))
-        narasi_tbl=Table(
-            [[Paragraph(_narasi_top_bottom(dfp),_styles["Narr"])]],
-            colWidths=[21*cm],
-            hAlign="CENTER"
-        )
-        story.append(narasi_tbl)
-    story.append(PageBreak())
-
-    # === Page 5: SLA PER JENIS TRANSAKSI
-    story.append(Paragraph("SLA PER JENIS TRANSAKSI", _styles["HeadingCenter"]))
-    jns_candidates=["JENIS_TRANSAKSI","JENIS TRANSAKSI","Jenis Transaksi","Jenis_Transaksi","jenis_transaksi"]
-    jns_col=next((c for c in jns_candidates if c in df_filt.columns),None)
-    main_sla="KEUANGAN" if "KEUANGAN" in df_filt.columns else (available_sla_cols[0] if available_sla_cols else None)
-    if jns_col and main_sla:
-        dfj=df_filt.groupby(jns_col)[main_sla].agg(["count","mean"]).reset_index()
-        dfj["SLA (hari)"]=(dfj["mean"]/86400.0).round(2)
-        dfj=dfj.sort_values("SLA (hari)",ascending=False)
-        tbl=_nice_table([["Jenis Transaksi","Jumlah","SLA (hari)"]]+dfj[[jns_col,"count","SLA (hari)"]].astype(str).values.tolist())
-        story.append(tbl)
-        story.append(Spacer(1,0.5*cm))
-        story.append(Paragraph(_narasi_top_bottom(pd.Series(dfj["SLA (hari)"].values,index=dfj[jns_col].values)),_styles["Narr"]))
-    story.append(PageBreak())
-
-    # === Page 6: TREN SLA (adaptif)
-    story.append(Paragraph("TREN SLA", _styles["HeadingCenter"]))
-    valid_sla=[c for c in (available_sla_cols or []) if c in df_filt.columns]
-    if valid_sla:
-        trend=df_filt.groupby(periode_col)[valid_sla].mean().reindex(categories)
-        trend_days=(trend/86400.0).round(2)
-
-        if len(valid_sla) <= 3:
-            # --- Layout A: grafik kiri, tabel kanan ---
-            data=[["Periode"]+valid_sla]+trend_days.reset_index().astype(str).values.tolist()
-            tbl=_nice_table(data, colWidths=[4*cm]+[4*cm]*len(valid_sla))
-            fig,ax=plt.subplots(figsize=(7,4))
-            for c in valid_sla:
-                ax.plot(trend_days.index.astype(str),trend_days[c],marker="o",label=c)
-            ax.legend(fontsize=8)
-            ax.tick_params(axis="x",rotation=45)
-            chart=_plot_to_rlimage(fig,w_cm=13,h_cm=7)
-            pair=Table([[chart,tbl]],colWidths=[13*cm,8*cm],hAlign="CENTER")
-            pair.setStyle([
-                ("LEFTPADDING",(0,0),(-1,-1),0),
-                ("RIGHTPADDING",(0,0),(-1,-1),0),
-                ("VALIGN",(0,0),(-1,-1),"TOP"),
-            ])
-            story.append(pair)
-
-        else:
-            # --- Layout B: grafik atas, tabel bawah ---
-            fig,ax=plt.subplots(figsize=(10,4))
-            for c in valid_sla:
-                ax.plot(trend_days.index.astype(str),trend_days[c],marker="o",label=c)
-            ax.legend(fontsize=8,ncol=2)
-            ax.tick_params(axis="x",rotation=45)
-            story.append(_plot_to_rlimage(fig,w_cm=21,h_cm=8))
-            story.append(Spacer(1,0.4*cm))
-
-            data=[["Periode"]+valid_sla]+trend_days.reset_index().astype(str).values.tolist()
-            col_w=[4*cm]+[ (21-4)/len(valid_sla)*cm ]*len(valid_sla)
-            tbl=_nice_table(data, colWidths=col_w)
-            tbl.setStyle([
-                ("FONTSIZE",(0,0),(-1,-1),9),
-                ("VALIGN",(0,0),(-1,-1),"MIDDLE"),
-            ])
-            story.append(tbl)
-
-        # --- Narasi ---
-        story.append(Spacer(1,0.5*cm))
-        narasi_tbl=Table([[Paragraph(_narasi_tren(trend_days),_styles["Narr"])]],
-                         colWidths=[21*cm], hAlign="CENTER")
-        story.append(narasi_tbl)
-
-    story.append(PageBreak())
-
-    # === Page 7: JUMLAH TRANSAKSI
-    story.append(Paragraph("JUMLAH TRANSAKSI", _styles["HeadingCenter"]))
-    trans=df_filt.groupby(periode_col).size().reindex(categories).reset_index(name="Jumlah").rename(columns={periode_col:"Periode"})
-    tbl=_nice_table([["Periode","Jumlah"]]+trans.astype(str).values.tolist())
-    fig,ax=plt.subplots(figsize=(7,4))
-    ax.bar(trans["Periode"],trans["Jumlah"],color="#14b8a6"); ax.tick_params(axis="x",rotation=45)
-    chart=_plot_to_rlimage(fig,w_cm=13,h_cm=7)
-    pair=Table([[chart,tbl]],colWidths=[13*cm,8*cm],hAlign="CENTER")
-    pair.setStyle([("LEFTPADDING",(0,0),(-1,-1),0),("RIGHTPADDING",(0,0),(-1,-1),0)])
-    story.append(pair)
-    story.append(Spacer(1,0.5*cm))
-    narasi_tbl=Table([[Paragraph(_narasi_transaksi(trans),_styles["Narr"])]],colWidths=[21*cm],hAlign="CENTER")
-    story.append(narasi_tbl)
-    story.append(PageBreak())
-
-    # === Page 8: KESIMPULAN
-    story.append(Paragraph("KESIMPULAN", _styles["HeadingCenter"]))
-
-    # rangkum otomatis dari halaman-halaman sebelumnya
-    summary_parts = []
-    if "KEUANGAN" in df_filt.columns:
-        summary_parts.append(_narasi_overview(avg_keu_days, kpi_target_days))
-    if 'valid_proc' in locals() and valid_proc:
-        dfp_days = (df_filt[valid_proc].mean()/86400.0).round(2)
-        summary_parts.append(_narasi_top_bottom(dfp_days))
-    if 'valid_sla' in locals() and valid_sla:
-        trend_days_all = (df_filt.groupby(periode_col)[valid_sla].mean()/86400.0).round(2).reindex(categories)
-        summary_parts.append(_narasi_tren(trend_days_all))
-    # transaksi
-    summary_parts.append(_narasi_transaksi(trans.copy()))
-
-    story.append(Paragraph(" ".join(summary_parts), _styles["Narr"]))
-
-    # rekomendasi eye-catching (blok lebar)
-    recs = [
-        "Pertahankan proses yang sudah efisien.",
-        "Prioritaskan perbaikan pada SLA terlama.",
-        "Analisis akar masalah pada periode outlier.",
-        "Optimalkan SDM saat puncak transaksi.",
-        "Perkuat monitoring KPI (real-time alert).",
-        "Evaluasi otomasi pada aktivitas manual."
-    ]
-    rec_tbl = _nice_table(
-        [["REKOMENDASI PRIORITAS"]] + [[f"• {r}"] for r in recs],
-        colWidths=[25.5*cm],
-        header_bg="#0ea5e9",
-        align="CENTER"
-    )
-    story.append(Spacer(1, 0.6*cm))
-    story.append(rec_tbl)
-
-    story.append(Spacer(1, 0.6*cm))
-    story.append(Paragraph("Laporan ini dihasilkan otomatis oleh SLA Dashboard.", _styles["SmallRight"]))
+# ====================== CACHE PDF ======================
+PDF_CACHE_ENTRIES = 16  # LRU, dibagi lintas sesi
 
-    # Build PDF
-    doc.build(story, onFirstPage=_first_page, onLaterPages=_later_pages)
-    pdf_bytes = buffer.getvalue()
-    buffer.close()
-    return pdf_bytes
+@st.cache_data(show_spinner=False, max_entries=PDF_CACHE_ENTRIES)
+def build_pdf_report_cached(data_key: tuple, idx_start: int, idx_end: int, kpi_target_days, backend: str):
+    """Bytes PDF per (dataset, rentang periode, target KPI); laporan yang sama langsung disajikan ulang."""
+    from sla_core.report_pdf import generate_pdf_for  # reportlab hanya dimuat saat PDF dibuat
+    df = open_query(backend, *data_key, idx_start, idx_end).frame()
+    periode_col = detect_periode_col(df.columns)
+    selected = df[periode_col].cat.categories[idx_start:idx_end+1].tolist()
+    return generate_pdf_for(df, periode_col, selected, kpi_target_days)
 
 # ====================== STREAMLIT TAB: PDF v6 ======================
-with tab_pdf:
+def render_tab_pdf():
     st.subheader("📑 Laporan SLA")
 
+    # PDF hanya dibuat saat diminta, untuk rentang periode & target KPI yang sedang aktif
+    pdf_key = (data_key, idx_start, idx_end, load_kpi(), query.backend)
+    if st.button("🛠️ Generate Laporan PDF"):
+        st.session_state.pdf_key = pdf_key
+
+    if st.session_state.get("pdf_key") != pdf_key:
+        st.info("Klik **Generate Laporan PDF** untuk membuat laporan periode yang dipilih.")
+        return
+
     try:
-        pdf_bytes = generate_pdf_report_v6(
-            df_ord=df_filtered,                    # DataFrame hasil filter
-            selected_periode=selected_periode,     # urutan periode (string)
-            periode_col=periode_col,               # nama kolom periode
-            available_sla_cols=available_sla_cols, # list kolom SLA
-            proses_cols=proses_grafik_cols,        # kolom proses untuk Bab 4
-            kpi_target_days=target_kpi_hari if 'target_kpi_hari' in globals() else None
-        )
+        with st.spinner("📄 Menyusun laporan PDF..."):
+            pdf_bytes = build_pdf_report_cached(*pdf_key)
 
         st.download_button(
             "⬇️ Download Laporan PDF",
@@ -2010,3 +1273,18 @@ with tab_pdf:
         traceback.print_exc()
 
 
+# ==============================
+# Navigasi section: hanya section aktif yang dijalankan
+# ==============================
+SECTIONS = {
+    "🔍 Overview": render_tab_overview,
+    "🧮 Per Proses": render_tab_proses,
+    "🧾 Jenis Transaksi": render_tab_transaksi,
+    "🏷️ Vendor": render_tab_vendor,
+    "📈 Tren": render_tab_tren,
+    "📊 Jumlah Transaksi": render_tab_jumlah,
+    "📥 Download Report": render_tab_report,
+}
+active_section = st.radio("Navigasi", list(SECTIONS), horizontal=True,
+                          key="nav_section", label_visibility="collapsed")
+SECTIONS[active_section]()
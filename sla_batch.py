@@ -0,0 +1,198 @@
+# =========================================
+# sla_batch.py — Generate laporan PDF & poster SLA tanpa UI
+# =========================================
+"""Batch report SLA (PDF + poster A4) untuk banyak rentang periode sekaligus.
+
+Contoh:
+    python sla_batch.py -o reports --per-periode --per-kategori          # store data/store (versi aktif)
+    python sla_batch.py data/store --versi 3 --range "Januari 2025:Maret 2025" --jenis pdf
+    python sla_batch.py data/last_data.xlsx -o reports                  # workbook langsung
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+os.environ.setdefault("MPLBACKEND", "Agg")  # headless
+
+from sla_core.dataset import (
+    VENDOR_KATEGORI, VENDOR_KATEGORI_COL, dataset_key, detect_periode_col, prepare_dataset, slice_periode
+)
+from sla_core.kpi import KPI_FILE, read_kpi
+from sla_core.store import STORE_DIR, DataStore, load_range, manifest_periode
+
+DEFAULT_INPUT = STORE_DIR
+POSTER_FORMATS = {
+    "png": "PNG (A4 - 300 DPI)",
+    "jpg": "JPEG (A4 - 300 DPI, ringan)",
+    "webp": "WebP (A4 - 300 DPI, ringan)",
+}
+
+
+def _slug(text):
+    return re.sub(r"[^0-9A-Za-z]+", "_", str(text)).strip("_")
+
+
+def load_kpi_target(path=KPI_FILE):
+    """Target KPI (hari) dari file lokal yang sama dengan app, None bila tidak ada/tidak terbaca."""
+    try:
+        return read_kpi(path)
+    except Exception:
+        return None
+
+
+def parse_range(text, periode_list):
+    """'Mulai:Akhir' (label periode) → (idx_start, idx_end)."""
+    start, _, end = text.partition(":")
+    start, end = start.strip(), (end or start).strip()
+    for label in (start, end):
+        if label not in periode_list:
+            raise ValueError(f"Periode '{label}' tidak ada di data")
+    idx_start, idx_end = periode_list.index(start), periode_list.index(end)
+    if idx_start > idx_end:
+        raise ValueError(f"Periode mulai '{start}' harus sebelum '{end}'")
+    return idx_start, idx_end
+
+
+def build_jobs(args, periode_list):
+    if args.range:
+        ranges = [parse_range(r, periode_list) for r in args.range]
+    elif args.per_periode:
+        ranges = [(i, i) for i in range(len(periode_list))]
+    else:
+        ranges = [(0, len(periode_list) - 1)]
+    kategori_list = [None] + (VENDOR_KATEGORI if args.per_kategori else [])
+
+    jobs = []
+    for idx_start, idx_end in ranges:
+        for kategori in kategori_list:
+            for jenis in args.jenis:
+                jobs.append({"jenis": jenis, "idx_start": idx_start, "idx_end": idx_end, "kategori": kategori})
+    return jobs
+
+
+def load_slice(source, idx_start, idx_end):
+    """Baris rentang periode dari ("store", (root, versi)) atau ("xlsx", dataset_key)."""
+    kind, key = source
+    if kind == "store":
+        return load_range(*key, idx_start, idx_end)
+    df = prepare_dataset(*key)
+    return slice_periode(df, detect_periode_col(df.columns), idx_start, idx_end)
+
+def open_source(path, version=None):
+    """(source, periode_col, periode_list) untuk folder store atau workbook .xlsx."""
+    if os.path.isdir(path):
+        store = DataStore(path)
+        version = store.current_version() if version is None else version
+        manifest = store.read_manifest(version)
+        if not manifest:
+            raise ValueError(f"versi {version} tidak ada di {path}")
+        return ("store", (path, manifest["version"])), manifest["periode_col"], manifest_periode(manifest)
+    # Ingest sekali di proses utama (snapshot Parquet) supaya worker cukup membaca snapshot
+    data_key = dataset_key(path)
+    df = prepare_dataset(*data_key)
+    periode_col = detect_periode_col(df.columns)
+    return ("xlsx", data_key), periode_col, df[periode_col].cat.categories.tolist() if periode_col else []
+
+def run_job(source, job, output_dir, kpi_target, poster_format):
+    """Satu laporan (dijalankan di worker; dataset di-cache per proses)."""
+    t0 = time.perf_counter()
+    df_range = load_slice(source, job["idx_start"], job["idx_end"])
+    periode_col = detect_periode_col(df_range.columns)
+    selected = df_range[periode_col].cat.categories[job["idx_start"]:job["idx_end"] + 1].tolist()
+    if job["kategori"]:
+        df_range = df_range[df_range[VENDOR_KATEGORI_COL] == job["kategori"]]
+    if df_range.empty:
+        return None, time.perf_counter() - t0
+
+    name = f"{_slug(selected[0])}_{_slug(selected[-1])}" if len(selected) > 1 else _slug(selected[0])
+    if job["kategori"]:
+        name += f"_{job['kategori']}"
+
+    if job["jenis"] == "pdf":
+        from sla_core.report_pdf import generate_pdf_for
+        out_path = os.path.join(output_dir, f"Laporan_SLA_{name}.pdf")
+        data = generate_pdf_for(df_range, periode_col, selected, kpi_target)
+    else:
+        from sla_core.poster import POSTER_OUTPUTS, encode_poster, generate_poster_for
+        option = POSTER_FORMATS[poster_format]
+        out_path = os.path.join(output_dir, f"Poster_SLA_{name}.{POSTER_OUTPUTS[option]['ext']}")
+        periode_text = f"Periode dari {selected[0]} sampai {selected[-1]}"
+        if job["kategori"]:
+            periode_text += f" ({job['kategori']})"
+        img = generate_poster_for(df_range, periode_col, selected, periode_range_text=periode_text, as_image=True)
+        data = encode_poster(img, option)
+
+    with open(out_path, "wb") as f:
+        f.write(data)
+    return out_path, time.perf_counter() - t0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate laporan PDF & poster SLA tanpa membuka dashboard.")
+    parser.add_argument("input", nargs="?", default=DEFAULT_INPUT,
+                        help=f"folder store (default: {STORE_DIR}) atau workbook .xlsx (header 2 baris)")
+    parser.add_argument("--versi", type=int, default=None, help="versi store (default: versi aktif)")
+    parser.add_argument("-o", "--output", default="reports", help="folder output (default: reports)")
+    parser.add_argument("--range", action="append", metavar="MULAI:AKHIR",
+                        help="rentang periode, boleh diulang (contoh 'Januari 2025:Maret 2025')")
+    parser.add_argument("--per-periode", action="store_true", help="satu laporan per periode")
+    parser.add_argument("--per-kategori", action="store_true",
+                        help="tambahkan laporan per kategori vendor (CABANG/PUSAT/VENDOR)")
+    parser.add_argument("--jenis", nargs="+", choices=["pdf", "poster"], default=["pdf", "poster"])
+    parser.add_argument("--poster-format", choices=list(POSTER_FORMATS), default="png")
+    parser.add_argument("--kpi", type=float, default=None,
+                        help=f"target KPI (hari); default dibaca dari {KPI_FILE}")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count(), help="jumlah proses paralel")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.input):
+        parser.error(f"file tidak ditemukan: {args.input}")
+
+    try:
+        source, periode_col, periode_list = open_source(args.input, args.versi)
+    except ValueError as e:
+        parser.error(str(e))
+    if not periode_col or not periode_list:
+        parser.error("kolom PERIODE tidak ditemukan / data kosong")
+    try:
+        jobs = build_jobs(args, periode_list)
+    except ValueError as e:
+        parser.error(str(e))
+
+    kpi_target = args.kpi if args.kpi is not None else load_kpi_target()
+    os.makedirs(args.output, exist_ok=True)
+    print(f"📄 {len(jobs)} laporan → {args.output} ({args.workers} worker)")
+
+    t0 = time.perf_counter()
+    failed = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {
+            pool.submit(run_job, source, job, args.output, kpi_target, args.poster_format): job
+            for job in jobs
+        }
+        for future in as_completed(futures):
+            job = futures[future]
+            label = f"{job['jenis']} {periode_list[job['idx_start']]}–{periode_list[job['idx_end']]}"
+            if job["kategori"]:
+                label += f" [{job['kategori']}]"
+            try:
+                out_path, seconds = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"  ❌ {label}: {type(e).__name__}: {e}")
+                continue
+            if out_path is None:
+                print(f"  ⏭️ {label}: tidak ada data")
+            else:
+                print(f"  ✅ {label}: {out_path} ({seconds:.1f} s)")
+
+    print(f"Selesai dalam {time.perf_counter() - t0:.1f} s, {failed} gagal.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
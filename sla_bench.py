@@ -0,0 +1,311 @@
+# =========================================
+# sla_bench.py — Benchmark pipeline SLA dengan workbook sintetis
+# =========================================
+"""Ukur waktu tiap tahap pipeline SLA (load Excel s.d. PDF & poster) pada data sintetis.
+
+Contoh:
+    python sla_bench.py                                  # 10k, 100k, 1M baris → JSON ke stdout
+    python sla_bench.py --rows 10000 100000 -o bench.json --repeat 5
+    python sla_bench.py --rows 100000 --baseline bench_lama.json --skip-reports
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+os.environ.setdefault("MPLBACKEND", "Agg")  # headless
+
+import numpy as np
+import pandas as pd
+
+from sla_core.cube import build_sla_cube
+from sla_core.dataset import (
+    HAS_CALAMINE, PROSES_COLS, SLA_COLS, VENDOR_KATEGORI, VENDOR_KATEGORI_COL,
+    add_derived_columns, detect_periode_col, file_fingerprint, normalize_columns,
+    parse_sla_columns, read_snapshot, slice_periode, write_snapshot
+)
+from sla_core.query import HAS_DUCKDB, ensure_query_db, open_query, query_db_path, sql_totals
+from sla_core.store import DataStore, load_cube_range, load_range, partition_cube, prepare_partition
+
+DEFAULT_ROWS = [10_000, 100_000, 1_000_000]
+DEFAULT_WORKDIR = "bench"
+NOISE_FLOOR = 0.005  # selisih < 5 ms tidak dianggap regresi (tahap sub-milidetik sangat berisik)
+
+BULAN = ["Januari", "Februari", "Maret", "April", "Mei", "Juni",
+         "Juli", "Agustus", "September", "Oktober", "November", "Desember"]
+KOTA = ["MERAK", "BAKAUHENI", "KETAPANG", "GILIMANUK", "BITUNG", "KUPANG", "AMBON", "SIBOLGA",
+        "BATAM", "LEMBAR", "PADANGBAI", "BAJOE", "KOLAKA", "TERNATE", "SORONG", "JAYAPURA"]
+JENIS_TRANSAKSI = ["PENGADAAN BARANG", "PENGADAAN JASA", "PERJALANAN DINAS", "PEMELIHARAAN KAPAL",
+                   "SEWA", "UTILITAS", "ASURANSI", "KONSULTAN", "BBM", "LAIN-LAIN"]
+
+
+# ============================
+# WORKBOOK SINTETIS
+# ============================
+def _vendor_pool(rng):
+    cabang = [f"GM CABANG {k}" for k in KOTA]
+    pusat = [f"110{rng.integers(10**7, 10**8)}-DIVISI {i}" for i in range(1, 21)]
+    vendor = [f"PT MITRA {i:03d}" for i in range(1, 121)] + [f"CV KARYA {i:03d}" for i in range(1, 41)]
+    return np.array(cabang + pusat + vendor, dtype=object)
+
+def _sla_texts(rng, n):
+    """n nilai SLA teks campuran: 'SLA X days HH:MM:SS', 'SLA HH:MM:SS', 'sla H:MM', kosong."""
+    kind = rng.random(n)
+    days, hh, mm, ss = rng.integers(0, 15, n), rng.integers(0, 24, n), rng.integers(0, 60, n), rng.integers(0, 60, n)
+    out = np.empty(n, dtype=object)
+    for i in range(n):
+        k = kind[i]
+        if k < 0.08:
+            out[i] = None
+        elif k < 0.55:
+            out[i] = f"SLA {days[i]} days {hh[i]:02d}:{mm[i]:02d}:{ss[i]:02d}"
+        elif k < 0.60:
+            out[i] = f"sla {hh[i]}:{mm[i]:02d}"
+        else:
+            out[i] = f"SLA {hh[i]:02d}:{mm[i]:02d}:{ss[i]:02d}"
+    return out
+
+def generate_workbook(path, rows, seed=2025):
+    """Tulis workbook dengan layout header 2 baris yang sama seperti data asli."""
+    from openpyxl import Workbook
+
+    rng = np.random.default_rng(seed)
+    periode = np.array([f"{b} 2025" for b in BULAN], dtype=object)[rng.integers(0, 12, rows)]
+    jenis = np.array(JENIS_TRANSAKSI, dtype=object)[rng.integers(0, len(JENIS_TRANSAKSI), rows)]
+    pool = _vendor_pool(rng)
+    vendor = pool[rng.integers(0, len(pool), rows)]
+    sla = [_sla_texts(rng, rows) for _ in SLA_COLS]
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Sheet1")
+    ws.append(["PERIODE", "JENIS TRANSAKSI", "NAMA VENDOR"] + ["SLA"] * len(SLA_COLS))
+    ws.append([None, None, None] + SLA_COLS)
+    for row in zip(periode, jenis, vendor, *sla):
+        ws.append(list(row))
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    wb.save(tmp_path)
+    os.replace(tmp_path, path)
+
+def ensure_workbook(workdir, rows, regenerate=False):
+    """Path workbook sintetis (dibuat sekali, dipakai ulang antar run); + detik generate bila baru."""
+    path = os.path.join(workdir, f"sla_bench_{rows}.xlsx")
+    if os.path.exists(path) and not regenerate:
+        return path, None
+    t0 = time.perf_counter()
+    generate_workbook(path, rows)
+    return path, time.perf_counter() - t0
+
+
+# ============================
+# PENGUKURAN
+# ============================
+def measure(fn, repeat, setup=None):
+    """Jalankan fn `repeat` kali (setup di luar waktu) → (hasil terakhir, statistik detik)."""
+    samples, result = [], None
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        t0 = time.perf_counter()
+        result = fn(arg) if setup else fn()
+        samples.append(time.perf_counter() - t0)
+    return result, {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "samples": [round(s, 6) for s in samples],
+    }
+
+def tab_aggregations(query, periode_col, available):
+    """Agregasi yang sama dengan yang dihitung tiap tab dashboard (lewat backend query)."""
+    def vendor():
+        for kategori in VENDOR_KATEGORI:
+            query_vendor = query.filter(VENDOR_KATEGORI_COL, [kategori])
+            query_vendor.agg(["SLA_USED"])
+            query_vendor.agg(["SLA_USED"], by="NAMA VENDOR")
+            query_vendor.agg([], by=["NAMA VENDOR", "JENIS TRANSAKSI"])
+
+    return {
+        "overview": lambda: query.agg(["TOTAL WAKTU"]),
+        "keuangan": lambda: (query.agg(["KEUANGAN"]), query.agg(["KEUANGAN"], by=periode_col)),
+        "per_proses": lambda: query.agg(available),
+        "transaksi": lambda: query.agg(available, by="JENIS TRANSAKSI"),
+        "vendor": vendor,
+        "tren": lambda: query.agg(available, by=periode_col),
+        "jumlah": lambda: query.agg([], by=periode_col),
+    }
+
+def bench_rows(path, repeat, skip_reports=False, log=print):
+    """Semua tahap untuk satu workbook → dict nama tahap → statistik."""
+    stages = {}
+
+    def run(name, fn, setup=None):
+        result, stats = measure(fn, repeat, setup)
+        stages[name] = stats
+        log(f"    {name:<24} {stats['median'] * 1000:10.1f} ms")
+        return result
+
+    # excel_load = reader lama (openpyxl); excel_load_calamine = fast path (hasil sama)
+    raw = run("excel_load", lambda: pd.read_excel(path, header=[0, 1], engine="openpyxl"))
+    if HAS_CALAMINE:
+        run("excel_load_calamine", lambda: pd.read_excel(path, header=[0, 1], engine="calamine"))
+    df = run("normalize_columns", lambda d: normalize_columns(d), setup=lambda: raw.copy(deep=False))
+    fingerprint = file_fingerprint(path)
+    run("snapshot_write", lambda: write_snapshot(path, df, fingerprint))
+    run("snapshot_read", lambda: read_snapshot(path, fingerprint))
+    normalized = df
+    df = run("parse_sla", parse_sla_columns, setup=df.copy)
+    df = run("derive_columns", add_derived_columns, setup=df.copy)
+
+    periode_col = detect_periode_col(df.columns)
+    periode_list = df[periode_col].cat.categories.tolist()
+
+    # Store per periode: tulis versi, lalu baca rentang dengan cache partisi kosong (cold)
+    store = DataStore(os.path.splitext(path)[0] + ".store")
+    run("store_write", lambda: store.replace(normalized, action="bench"))
+
+    def load_cold(idx_start, idx_end):
+        for cached in (prepare_partition, partition_cube, load_range, load_cube_range):
+            cached.cache_clear()
+        return load_range(*store.key(), idx_start, idx_end), load_cube_range(*store.key(), idx_start, idx_end)
+    run("store_load_range", lambda: load_cold(0, len(periode_list) - 1))
+    run("store_load_last", lambda: load_cold(len(periode_list) - 1, len(periode_list) - 1))
+    df_range = run("filter_periode", lambda: slice_periode(df, periode_col, 0, len(periode_list) - 1))
+    run("filter_periode_last", lambda: slice_periode(df, periode_col, len(periode_list) - 1, len(periode_list) - 1))
+
+    run("cube_build", lambda: build_sla_cube(df, periode_col))
+    available = [c for c in SLA_COLS if c in df.columns]
+    # Seluruh rentang periode; "pandas" = cube di memori, SQL = GROUP BY di engine (cache hasil dikosongkan)
+    backends = ["pandas", "sqlite"] + (["duckdb"] if HAS_DUCKDB else [])
+    for backend in backends:
+        query = open_query(backend, *store.key(), 0, len(periode_list) - 1)
+        prefix = "aggregate" if backend == "pandas" else f"aggregate_{backend}"
+        if backend == "pandas":
+            load_cube_range(*store.key(), 0, len(periode_list) - 1)
+        else:
+            def ingest():
+                ensure_query_db.cache_clear()
+                if os.path.exists(query_db_path(store.root, backend)):
+                    os.remove(query_db_path(store.root, backend))
+                return ensure_query_db(backend, *store.key())
+            run(f"query_ingest_{backend}", ingest)
+        for tab, fn in tab_aggregations(query, periode_col, available).items():
+            run(f"{prefix}.{tab}", lambda _, fn=fn: fn(), setup=sql_totals.cache_clear)
+
+    if not skip_reports:
+        from sla_core.poster import encode_poster, generate_poster_for
+        from sla_core.report_pdf import generate_pdf_for
+        run("pdf_build", lambda: generate_pdf_for(df_range, periode_col, periode_list, kpi_target_days=3))
+        poster = run("poster_build", lambda: generate_poster_for(
+            df_range, periode_col, periode_list, proses_cols=[c for c in PROSES_COLS if c in available],
+            as_image=True))
+        run("poster_encode_png", lambda: encode_poster(poster, "PNG (A4 - 300 DPI)"))
+    return stages
+
+
+# ============================
+# METADATA & PERBANDINGAN
+# ============================
+def _git_revision():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def environment_info():
+    import openpyxl
+    import pyarrow
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "openpyxl": openpyxl.__version__,
+        "pyarrow": pyarrow.__version__,
+        "calamine": HAS_CALAMINE,
+    }
+
+def compare(report, baseline, threshold, log=print):
+    """Bandingkan median tiap tahap dengan report lama; return jumlah tahap yang melambat."""
+    old = {r["rows"]: r["stages"] for r in baseline.get("results", [])}
+    slower = 0
+    for result in report["results"]:
+        base_stages = old.get(result["rows"])
+        if not base_stages:
+            continue
+        log(f"  {result['rows']} baris vs baseline ({baseline.get('environment', {}).get('git')}):")
+        for name, stats in result["stages"].items():
+            if name not in base_stages or not base_stages[name]["median"]:
+                continue
+            ratio = stats["median"] / base_stages[name]["median"]
+            significant = abs(stats["median"] - base_stages[name]["median"]) >= NOISE_FLOOR
+            flag = "  "
+            if significant and ratio > 1 + threshold:
+                flag = "🔺"
+                slower += 1
+            elif significant and ratio < 1 - threshold:
+                flag = "🔻"
+            log(f"    {flag} {name:<24} {ratio:6.2f}x")
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark tahap-tahap pipeline SLA dengan workbook sintetis.")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS,
+                        help="ukuran workbook (jumlah baris); default 10000 100000 1000000")
+    parser.add_argument("-o", "--output", help="file JSON hasil (default: stdout)")
+    parser.add_argument("--workdir", default=DEFAULT_WORKDIR, help="folder workbook sintetis (default: bench)")
+    parser.add_argument("--repeat", type=int, default=3, help="ulangan per tahap (default 3)")
+    parser.add_argument("--regenerate", action="store_true", help="buat ulang workbook walau sudah ada")
+    parser.add_argument("--skip-reports", action="store_true", help="lewati tahap PDF & poster")
+    parser.add_argument("--baseline", help="JSON hasil run sebelumnya untuk dibandingkan")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="batas selisih relatif yang dianggap regresi (default 0.10)")
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error("--repeat minimal 1")
+
+    def log(msg):
+        print(msg, file=sys.stderr, flush=True)
+
+    report = {"environment": environment_info(), "repeat": args.repeat, "results": []}
+    for rows in args.rows:
+        log(f"⏱️ {rows} baris")
+        path, generate_seconds = ensure_workbook(args.workdir, rows, args.regenerate)
+        if generate_seconds is not None:
+            log(f"    workbook dibuat dalam {generate_seconds:.1f} s → {path}")
+        report["results"].append({
+            "rows": rows,
+            "workbook": path,
+            "workbook_bytes": os.path.getsize(path),
+            "generate_seconds": generate_seconds,
+            "stages": bench_rows(path, args.repeat, args.skip_reports, log),
+        })
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+        log(f"📄 hasil → {args.output}")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        slower = compare(report, baseline, args.threshold, log)
+        return 1 if slower else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Inti SLA Payment Analyzer: dataset, laporan PDF, dan poster — bisa diimpor tanpa Streamlit."""
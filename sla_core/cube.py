@@ -0,0 +1,46 @@
+"""Cube agregat SLA (periode × jenis transaksi × vendor) untuk tabel & grafik dashboard."""
+
+import pandas as pd
+
+from .dataset import SLA_COLS, VENDOR_KATEGORI_COL
+
+# ============================
+# CUBE AGREGAT (periode × jenis transaksi × vendor)
+# ============================
+# Per sel: jumlah detik (_SUM) & jumlah nilai non-null (_N) tiap kolom SLA,
+# plus jumlah baris. Semua tabel/grafik tab diturunkan dengan menjumlahkan
+# potongan cube, jadi ganti rentang periode cukup O(sel cube), bukan O(baris).
+CUBE_VALUE_COLS = SLA_COLS + ["SLA_USED"]
+CUBE_ROWS_COL = "JUMLAH_BARIS"
+
+def _cube_keys(df, periode_col):
+    return [periode_col] + [c for c in ("JENIS TRANSAKSI", "NAMA VENDOR", VENDOR_KATEGORI_COL) if c in df.columns]
+
+def build_sla_cube(df, periode_col):
+    keys = _cube_keys(df, periode_col)
+    value_cols = [c for c in CUBE_VALUE_COLS if c in df.columns]
+    grouped = df.groupby(keys, observed=True, dropna=False, sort=True)
+    cube = pd.concat([
+        grouped[value_cols].sum().add_suffix("_SUM"),
+        grouped[value_cols].count().add_suffix("_N"),
+    ], axis=1)
+    cube[CUBE_ROWS_COL] = grouped.size()
+    return cube.reset_index()
+
+def cube_agg(cube, cols, by=None):
+    """Agregasi ulang cube → kolom `c` (rata-rata detik), `c_N` (non-null) & JUMLAH_BARIS.
+
+    Tanpa `by` hasilnya satu baris (total seluruh potongan cube).
+    """
+    fields = [f"{c}_SUM" for c in cols] + [f"{c}_N" for c in cols] + [CUBE_ROWS_COL]
+    if by is None:
+        totals = cube[fields].sum().to_frame().T
+    else:
+        totals = cube.groupby(by, observed=True, sort=True)[fields].sum()
+    out = pd.DataFrame(index=totals.index)
+    for c in cols:
+        n = totals[f"{c}_N"]
+        out[c] = totals[f"{c}_SUM"].where(n > 0) / n.where(n > 0)
+        out[f"{c}_N"] = n
+    out[CUBE_ROWS_COL] = totals[CUBE_ROWS_COL]
+    return out
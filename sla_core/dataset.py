@@ -0,0 +1,361 @@
+"""Dataset SLA: parsing SLA, snapshot Parquet, dan persiapan data (tanpa Streamlit)."""
+
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# ============================
+# PARSING SLA
+# ============================
+def parse_sla(s):
+    if pd.isna(s):
+        return None
+    s = str(s).upper().replace("SLA", "").strip()
+    days = hours = minutes = seconds = 0
+    day_match = re.search(r'(\d+)\s*DAY', s)
+    if day_match:
+        days = int(day_match.group(1))
+    time_match = re.search(r'(\d{1,2}):(\d{2})(?::(\d{2}))?', s)
+    if time_match:
+        hours = int(time_match.group(1))
+        minutes = int(time_match.group(2))
+        if time_match.group(3):
+            seconds = int(time_match.group(3))
+    return days * 86400 + hours * 3600 + minutes * 60 + seconds
+
+_SLA_DAY_RE = r'(\d+)\s*DAY'
+_SLA_TIME_RE = r'(\d{1,2}):(\d{2})(?::(\d{2}))?'
+
+def parse_sla_series(series):
+    """Versi vektor dari parse_sla: satu kolom → detik (float64, NaN untuk kosong).
+
+    Regex hanya dijalankan pada nilai unik, lalu dipetakan balik ke semua baris.
+    """
+    codes, uniques = pd.factorize(series)  # NaN → code -1
+    if len(uniques) == 0:
+        return pd.Series(np.nan, index=series.index, dtype="float64")
+    s = pd.Series(uniques).astype(str).str.upper().str.replace("SLA", "", regex=False).str.strip()
+    days = s.str.extract(_SLA_DAY_RE, expand=False).astype("float64").fillna(0)
+    hms = s.str.extract(_SLA_TIME_RE).astype("float64").fillna(0)
+    seconds = (days * 86400 + hms[0] * 3600 + hms[1] * 60 + hms[2]).to_numpy()
+    values = np.where(codes >= 0, seconds[codes], np.nan)
+    return pd.Series(values, index=series.index, dtype="float64")
+
+# ============================
+# SNAPSHOT KOLUMNAR (Parquet)
+# ============================
+# File .xlsx tetap jadi sumber utama (sinkron GitHub), tapi app membaca
+# snapshot Parquet selama fingerprint-nya masih cocok dengan file .xlsx.
+# Snapshot disimpan di samping workbook: data/last_data.xlsx →
+# data/last_data.parquet + data/last_data.snapshot.json
+
+SLA_RENAME_MAP = {
+    "SLA_FUNGSIONAL": "FUNGSIONAL",
+    "SLA_VENDOR": "VENDOR",
+    "SLA_KEUANGAN": "KEUANGAN",
+    "SLA_PERBENDAHARAAN": "PERBENDAHARAAN",
+    "SLA_TOTAL WAKTU": "TOTAL WAKTU"
+}
+
+def normalize_columns(df):
+    """Ratakan header multiindex (2 baris) lalu rename kolom SLA."""
+    df.columns = [
+        f"{col0}_{col1}" if "SLA" in str(col0).upper() else str(col0)
+        for col0, col1 in df.columns
+    ]
+    return df.rename(columns=SLA_RENAME_MAP)
+
+def snapshot_paths(path: str):
+    """(path Parquet, path metadata) snapshot untuk sebuah workbook."""
+    base = os.path.splitext(path)[0]
+    return base + ".parquet", base + ".snapshot.json"
+
+def file_fingerprint(path: str) -> str:
+    """SHA-256 isi file (dipakai untuk mencocokkan snapshot dengan .xlsx)."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def read_snapshot(path: str, fingerprint: str):
+    """Baca snapshot Parquet (memory-mapped) jika fingerprint cocok, selain itu None."""
+    snapshot_path, meta_path = snapshot_paths(path)
+    if not (os.path.exists(snapshot_path) and os.path.exists(meta_path)):
+        return None
+    try:
+        with open(meta_path, "r") as f:
+            meta = json.load(f)
+        if meta.get("source_sha256") != fingerprint:
+            return None
+        return pd.read_parquet(snapshot_path, engine="pyarrow", memory_map=True)
+    except Exception as e:
+        print("Snapshot tidak bisa dibaca, fallback ke Excel:", e)
+        return None
+
+def write_parquet(df, path: str):
+    """to_parquet; kolom object campuran (angka + teks) disimpan sebagai teks. Return df yang ditulis."""
+    try:
+        df.to_parquet(path, engine="pyarrow", index=False)
+    except Exception:
+        df = df.copy()
+        for col in df.columns[df.dtypes == object]:
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+        df.to_parquet(path, engine="pyarrow", index=False)
+    return df
+
+def write_snapshot(path: str, df, fingerprint: str):
+    """Tulis snapshot Parquet + metadata fingerprint (atomic replace)."""
+    snapshot_path, meta_path = snapshot_paths(path)
+    tmp_path = snapshot_path + ".tmp"
+    try:
+        df = write_parquet(df, tmp_path)
+        os.replace(tmp_path, snapshot_path)
+        with open(meta_path, "w") as f:
+            json.dump({"source_sha256": fingerprint, "rows": len(df), "created": datetime.now().isoformat()}, f)
+        return True
+    except Exception as e:
+        print("Gagal menulis snapshot:", e)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+
+# ============================
+# READER EXCEL
+# ============================
+# Engine bawaan pandas (openpyxl, sudah mode read_only) membaca sel satu per satu
+# di Python; calamine (Rust) ~10x lebih cepat dengan hasil DataFrame yang sama.
+# "auto" = calamine bila terpasang; bila gagal selalu dicoba ulang dengan openpyxl.
+
+try:
+    import python_calamine  # noqa: F401  (engine="calamine" pandas)
+    HAS_CALAMINE = True
+except ImportError:
+    HAS_CALAMINE = False
+
+EXCEL_ENGINES = ("auto", "calamine", "openpyxl")
+DEFAULT_EXCEL_ENGINE = "auto"
+
+def excel_engines(engine: str = DEFAULT_EXCEL_ENGINE) -> list:
+    """Urutan engine yang dicoba; openpyxl (reader lama) selalu jadi cadangan terakhir."""
+    if engine not in EXCEL_ENGINES:
+        raise ValueError(f"Engine Excel '{engine}' tidak dikenal (pilihan: {', '.join(EXCEL_ENGINES)}).")
+    if engine == "auto":
+        engine = "calamine" if HAS_CALAMINE else "openpyxl"
+    return [engine] if engine == "openpyxl" else [engine, "openpyxl"]
+
+def read_excel_with_fallback(read, source, engine: str = DEFAULT_EXCEL_ENGINE):
+    """read(source, engine) dengan engine pertama yang berhasil → (hasil, engine, detik parse)."""
+    engines = excel_engines(engine)
+    for i, name in enumerate(engines):
+        if hasattr(source, "seek"):
+            source.seek(0)
+        t0 = time.perf_counter()
+        try:
+            return read(source, name), name, time.perf_counter() - t0
+        except Exception as e:
+            if i == len(engines) - 1:
+                raise
+            print(f"Reader Excel {name} gagal ({e}), fallback ke {engines[i + 1]}.")
+
+def read_workbook_timed(path: str, engine: str = DEFAULT_EXCEL_ENGINE):
+    """Baca workbook header 2 baris (kolom dinormalisasi) → (df, engine yang dipakai, detik parse)."""
+    df, used, seconds = read_excel_with_fallback(
+        lambda source, name: pd.read_excel(source, header=[0, 1], engine=name), path, engine
+    )
+    return normalize_columns(df), used, seconds
+
+def ingest_excel(path: str, fingerprint: str = None):
+    """Parse workbook sekali (header 2 baris → flat) lalu simpan sebagai snapshot."""
+    fingerprint = fingerprint or file_fingerprint(path)
+    df, engine, seconds = read_workbook_timed(path)
+    print(f"Parse {os.path.basename(path)}: {seconds:.2f} s ({engine})")
+    write_snapshot(path, df, fingerprint)
+    return df
+
+def load_dataset(path: str):
+    """Data dengan kolom sudah dinormalisasi: dari snapshot bila cocok, selain itu ingest ulang."""
+    fingerprint = file_fingerprint(path)
+    df = read_snapshot(path, fingerprint)
+    if df is None:
+        df = ingest_excel(path, fingerprint)
+    return df
+
+# ============================
+# UPLOAD BANYAK FILE / SHEET
+# ============================
+# Tiap cabang mengirim workbook sendiri (kadang beberapa sheet). Semua sheet dibaca
+# dengan header 2 baris + normalize_columns yang sama, satu proses per file.
+
+def _parse_sheets(source, engine):
+    """(sheet, DataFrame | alasan dilewati) untuk semua sheet, dengan satu engine.
+
+    Sheet < 2 baris dilewati (tanpa header 2 baris). Error lain dari engine selain openpyxl
+    dilempar ulang supaya read_excel_with_fallback mengulang workbook dengan openpyxl.
+    """
+    sheets = []
+    with pd.ExcelFile(source, engine=engine) as book:
+        for sheet in book.sheet_names:
+            try:
+                df = normalize_columns(book.parse(sheet, header=[0, 1]))
+            except (ValueError, IndexError) as e:
+                if engine != "openpyxl" and len(book.parse(sheet, header=None, nrows=2)) >= 2:
+                    raise
+                sheets.append((sheet, str(e)))
+                continue
+            if df.empty or detect_periode_col(df.columns) is None:
+                sheets.append((sheet, "sheet kosong" if df.empty else "kolom PERIODE tidak ditemukan"))
+                continue
+            sheets.append((sheet, df))
+    return sheets
+
+def read_workbook_sheets(source, name: str = "", engine: str = DEFAULT_EXCEL_ENGINE):
+    """Semua sheet data sebuah workbook → (list DataFrame, info file).
+
+    Info: nama file, engine yang dipakai, detik parse, dan per sheet jumlah baris atau
+    alasan dilewati (sheet kosong, tanpa header 2 baris, atau tanpa kolom PERIODE).
+    """
+    try:
+        sheets, used, seconds = read_excel_with_fallback(_parse_sheets, source, engine)
+    except Exception as e:
+        raise ValueError(f"{name or 'File'} tidak bisa dibaca sebagai workbook .xlsx ({e}).") from e
+    frames = [df for _, df in sheets if not isinstance(df, str)]
+    info = {
+        "file": name, "engine": used, "seconds": round(seconds, 3),
+        "sheets": [
+            {"sheet": sheet, "rows": 0, "skipped": df} if isinstance(df, str)
+            else {"sheet": sheet, "rows": len(df), "skipped": None}
+            for sheet, df in sheets
+        ],
+    }
+    return frames, info
+
+def _read_upload(name, content, engine):
+    """Worker pool: parse satu file upload (bytes) → (frames, info)."""
+    return read_workbook_sheets(io.BytesIO(content), name, engine)
+
+def read_workbooks(files, max_workers=None, engine: str = DEFAULT_EXCEL_ENGINE):
+    """Gabungkan banyak workbook [(nama, bytes), ...] jadi satu DataFrame; return (df, info per file).
+
+    Tiap file diparse di proses terpisah, jadi waktu total ≈ file terbesar. Urutan baris
+    mengikuti urutan file lalu urutan sheet. ValueError bila tidak ada sheet data sama sekali.
+    """
+    excel_engines(engine)  # engine tidak dikenal → ValueError sebelum membuka proses
+    workers = min(len(files), max_workers or os.cpu_count() or 1)
+    if workers <= 1:
+        results = [_read_upload(name, content, engine) for name, content in files]
+    else:
+        # spawn: proses Streamlit multi-thread, fork bisa mewarisi lock yang sedang dipegang
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            results = list(pool.map(_read_upload, *zip(*files), [engine] * len(files)))
+
+    frames = [df for file_frames, _ in results for df in file_frames]
+    info = [file_info for _, file_info in results]
+    if not frames:
+        raise ValueError("Tidak ada sheet berisi data SLA (header 2 baris + kolom PERIODE) di file yang diunggah.")
+    periode_cols = {detect_periode_col(df.columns) for df in frames}
+    if len(periode_cols) > 1:
+        raise ValueError(f"Nama kolom periode berbeda antar file/sheet: {', '.join(sorted(periode_cols))}.")
+    return pd.concat(frames, ignore_index=True), info
+
+SLA_COLS = ["FUNGSIONAL", "VENDOR", "KEUANGAN", "PERBENDAHARAAN", "TOTAL WAKTU"]
+PROSES_COLS = ["FUNGSIONAL", "VENDOR", "KEUANGAN", "PERBENDAHARAAN"]  # tanpa TOTAL WAKTU
+VENDOR_KATEGORI_COL = "KATEGORI VENDOR"
+VENDOR_KATEGORI = ["CABANG", "PUSAT", "VENDOR"]
+
+def vendor_kategori(nama):
+    """Kategori per baris dari NAMA VENDOR: CABANG ("GM CABANG"), PUSAT ("110xxxxxxxx-"), sisanya VENDOR."""
+    nama = nama.astype(str)
+    mask_cabang = nama.str.upper().str.contains("GM CABANG", regex=False, na=False)
+    mask_pusat = nama.str[:3].eq("110") & (nama.str.len() >= 12) & nama.str[11].eq("-")
+    kategori = np.select([mask_cabang, mask_pusat.fillna(False)], VENDOR_KATEGORI[:2], default="VENDOR")
+    return pd.Categorical(kategori, categories=VENDOR_KATEGORI)
+
+def detect_periode_col(columns):
+    return next((col for col in columns if "PERIODE" in str(col).upper()), None)
+
+_BULAN_ID = {
+    "JANUARI": "January", "FEBRUARI": "February", "MARET": "March", "APRIL": "April",
+    "MEI": "May", "JUNI": "June", "JULI": "July", "AGUSTUS": "August",
+    "SEPTEMBER": "September", "OKTOBER": "October", "NOVEMBER": "November",
+    "NOPEMBER": "November", "DESEMBER": "December",
+}
+_BULAN_ID_RE = re.compile(r"\b(" + "|".join(_BULAN_ID) + r")\b", re.IGNORECASE)
+
+def periode_to_datetime(value):
+    """Parse satu nilai periode ke tanggal (mendukung nama bulan Indonesia), NaT bila gagal."""
+    text = _BULAN_ID_RE.sub(lambda m: _BULAN_ID[m.group(1).upper()], str(value))
+    return pd.to_datetime(text, errors='coerce')
+
+def periode_categorical(periode):
+    """Kolom periode → Categorical string terurut kronologis (kode 0..n-1 = urutan waktu).
+
+    Tiap nilai unik diparse sekali; yang tidak bisa diparse ke tanggal ditaruh di
+    belakang dengan urutan kemunculan pertama.
+    """
+    periode_str = periode.where(periode.isna(), periode.astype(str))
+    uniques = pd.Series(periode_str.dropna().unique(), dtype=object)
+    order = pd.DataFrame({
+        "periode": uniques,
+        "tanggal": [periode_to_datetime(x) for x in uniques],
+    }).sort_values("tanggal", kind="stable", na_position="last")
+    return pd.Categorical(periode_str, categories=order["periode"].tolist(), ordered=True)
+
+def parse_sla_columns(df):
+    """Kolom SLA teks ("SLA X days HH:MM:SS") → detik, in-place."""
+    for col in SLA_COLS:
+        if col in df.columns:
+            df[col] = parse_sla_series(df[col])
+    return df
+
+def add_derived_columns(df):
+    """PERIODE_DATETIME, periode kategori terurut, kategori vendor & SLA_USED (in-place)."""
+    periode_col = detect_periode_col(df.columns)
+    if periode_col:
+        # Try parse periode ke datetime (tidak wajib)
+        try:
+            df['PERIODE_DATETIME'] = pd.to_datetime(df[periode_col], errors='coerce')
+        except Exception:
+            df['PERIODE_DATETIME'] = None
+        df[periode_col] = periode_categorical(df[periode_col])
+
+    # Kategori vendor + SLA yang dipakai (CABANG/PUSAT → FUNGSIONAL, VENDOR → VENDOR)
+    if "NAMA VENDOR" in df.columns:
+        df[VENDOR_KATEGORI_COL] = vendor_kategori(df["NAMA VENDOR"])
+        nan_col = pd.Series(np.nan, index=df.index)
+        df["SLA_USED"] = np.where(
+            df[VENDOR_KATEGORI_COL].isin(["CABANG", "PUSAT"]),
+            df.get("FUNGSIONAL", nan_col),
+            df.get("VENDOR", nan_col)
+        )
+    return df
+
+@lru_cache(maxsize=2)
+def prepare_dataset(path: str, size: int, mtime: float):
+    """Dataset siap pakai, di-cache per proses & dibagi ke semua sesi (JANGAN diubah in-place).
+
+    Kolom SLA sudah dalam detik, ada PERIODE_DATETIME, dan kolom periode
+    berupa kategori terurut kronologis sehingga filter periode cukup
+    perbandingan rentang kode kategori.
+    """
+    return add_derived_columns(parse_sla_columns(load_dataset(path)))
+
+def dataset_key(path: str):
+    """Kunci cache dataset (path, size, mtime); berubah setiap file ditulis ulang."""
+    stat = os.stat(path)
+    return path, stat.st_size, stat.st_mtime
+
+def slice_periode(df, periode_col, idx_start, idx_end):
+    """Baris dengan periode di rentang kode kategori [idx_start, idx_end] (tanpa copy)."""
+    codes = df[periode_col].cat.codes
+    return df[(codes >= idx_start) & (codes <= idx_end)]
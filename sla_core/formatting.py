@@ -0,0 +1,35 @@
+"""Format durasi SLA untuk tabel & report."""
+
+import math
+
+
+def format_duration(seconds):
+    """Convert detik jadi 'xx hari xx jam xx menit xx detik' ("-" bila kosong/NaN)"""
+    if seconds is None or (isinstance(seconds, float) and math.isnan(seconds)):
+        return "-"
+    days = int(seconds // 86400)
+    hours = int((seconds % 86400) // 3600)
+    minutes = int((seconds % 3600) // 60)
+    secs = int(seconds % 60)
+    return f"{days} hari {hours} jam {minutes} menit {secs} detik"
+
+
+def seconds_to_sla_format(total_seconds):
+    if total_seconds is None or (isinstance(total_seconds, float) and math.isnan(total_seconds)):
+        return "-"
+    total_seconds = int(round(total_seconds))
+    days = total_seconds // 86400
+    remainder = total_seconds % 86400
+    hours = remainder // 3600
+    remainder %= 3600
+    minutes = remainder // 60
+    seconds = remainder % 60
+    parts = []
+    if days > 0:
+        parts.append(f"{days} hari")
+    if hours > 0 or days > 0:
+        parts.append(f"{hours} jam")
+    if minutes > 0 or hours > 0 or days > 0:
+        parts.append(f"{minutes} menit")
+    parts.append(f"{seconds} detik")
+    return " ".join(parts)
@@ -0,0 +1,296 @@
+"""Sinkronisasi file data dengan repo GitHub (contents API + Git Data API)."""
+
+import base64
+import json
+import math
+import os
+
+import requests
+
+# Cache sinkronisasi GitHub: cukup conditional request (If-None-Match → 304 bila tidak berubah)
+GITHUB_CACHE_META_PATH = os.path.join("data", "github_cache.json")
+
+# File > 1 MB tidak dikirim inline oleh endpoint /contents/ → pakai Git Data API (blobs)
+GITHUB_CHUNK_SIZE = 3 * 256 * 1024        # kelipatan 3 → potongan base64 bisa disambung
+
+
+def _has_inline_content(info: dict) -> bool:
+    return info.get("encoding") == "base64" and bool(info.get("content"))
+
+
+def _write_atomic(local_path: str, content: bytes):
+    os.makedirs(os.path.dirname(local_path) or ".", exist_ok=True)
+    with open(local_path + ".tmp", "wb") as f:
+        f.write(content)
+    os.replace(local_path + ".tmp", local_path)
+
+
+class _Base64JsonBody:
+    """Body JSON {"encoding": "base64", "content": ...} yang di-stream dari file.
+
+    Panjang total diketahui di muka (Content-Length), jadi tidak perlu menyimpan
+    bytes + salinan base64 di memori sekaligus.
+    """
+    _PREFIX = b'{"encoding": "base64", "content": "'
+    _SUFFIX = b'"}'
+
+    def __init__(self, local_path: str, progress=None):
+        self.local_path = local_path
+        self.size = os.path.getsize(local_path)
+        self.progress = progress
+
+    def __len__(self):
+        return len(self._PREFIX) + 4 * math.ceil(self.size / 3) + len(self._SUFFIX)
+
+    def __iter__(self):
+        yield self._PREFIX
+        sent = 0
+        with open(self.local_path, "rb") as f:
+            for chunk in iter(lambda: f.read(GITHUB_CHUNK_SIZE), b""):
+                yield base64.b64encode(chunk)
+                sent += len(chunk)
+                if self.progress:
+                    self.progress(sent, self.size)
+        yield self._SUFFIX
+
+
+class GitHubStore:
+    """File di satu repo/branch GitHub; semua method return None/False bila token/repo kosong."""
+
+    def __init__(self, token=None, repo=None, branch="main", default_path="data/last_data.xlsx",
+                 cache_meta_path=GITHUB_CACHE_META_PATH):
+        self.token = token
+        self.repo = repo
+        self.branch = branch
+        self.default_path = default_path
+        self.cache_meta_path = cache_meta_path
+        self.headers = {"Authorization": f"token {token}"} if token else {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.token and self.repo)
+
+    def contents_url(self, path: str) -> str:
+        return f"https://api.github.com/repos/{self.repo}/contents/{path}?ref={self.branch}"
+
+    def get_file_info(self, path: str):
+        if not self.enabled:
+            return None
+        try:
+            r = requests.get(self.contents_url(path), headers=self.headers, timeout=30)
+        except requests.RequestException as e:
+            print("Gagal membaca info file GitHub:", e)
+            return None
+        return r.json() if r.status_code == 200 else None
+
+    def list_dir(self, path: str):
+        """Nama file di sebuah folder repo, None bila folder tidak ada / gagal."""
+        if not self.enabled:
+            return None
+        try:
+            r = requests.get(self.contents_url(path), headers=self.headers, timeout=30)
+        except requests.RequestException as e:
+            print("Gagal membaca folder GitHub:", e)
+            return None
+        if r.status_code != 200 or not isinstance(r.json(), list):
+            return None
+        return [entry["name"] for entry in r.json() if entry.get("type") == "file"]
+
+    def stream_blob(self, sha: str, local_path: str) -> bool:
+        """Download blob (s.d. 100 MB) dari Git Data API langsung ke disk per potongan."""
+        url = f"https://api.github.com/repos/{self.repo}/git/blobs/{sha}"
+        headers = dict(self.headers, Accept="application/vnd.github.raw+json")
+        tmp_path = local_path + ".tmp"
+        try:
+            with requests.get(url, headers=headers, stream=True, timeout=60) as r:
+                if r.status_code != 200:
+                    return False
+                os.makedirs(os.path.dirname(local_path) or ".", exist_ok=True)
+                with open(tmp_path, "wb") as f:
+                    for chunk in r.iter_content(chunk_size=GITHUB_CHUNK_SIZE):
+                        f.write(chunk)
+            os.replace(tmp_path, local_path)
+            return True
+        except requests.RequestException as e:
+            print("Gagal download blob GitHub:", e)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+
+    def download_to(self, path: str, local_path: str) -> str | None:
+        """Download file GitHub langsung ke local_path (atomic); return sha blob, None bila gagal.
+
+        File kecil ditulis dari respons /contents/, file besar di-stream per potongan lewat blob.
+        """
+        if not self.enabled:
+            return None
+        info = self.get_file_info(path)
+        if not info or "sha" not in info:
+            return None
+        if _has_inline_content(info):
+            _write_atomic(local_path, base64.b64decode(info["content"].encode()))
+        elif not self.stream_blob(info["sha"], local_path):
+            return None
+        return info["sha"]
+
+    def upload_file(self, file_bytes: bytes, path: str = None, message="Update SLA data"):
+        if not self.enabled:
+            return None
+        path = path or self.default_path
+        url = f"https://api.github.com/repos/{self.repo}/contents/{path}"
+        info = self.get_file_info(path)
+        sha = info.get("sha") if info else None
+        data = {
+            "message": message,
+            "content": base64.b64encode(file_bytes).decode(),
+            "branch": self.branch
+        }
+        if sha:
+            data["sha"] = sha
+        try:
+            r = requests.put(url, headers=self.headers, json=data, timeout=60)
+        except requests.RequestException as e:
+            print("Gagal upload ke GitHub:", e)
+            return None
+        return r.json() if r.status_code in (200, 201) else None
+
+    def commit_files(self, files: dict, message="Update SLA data", delete=(), progress=None):
+        """Satu commit berisi beberapa file via Git Data API: blob → tree → commit → update ref.
+
+        `files` = {path GitHub: path lokal}; `delete` = path GitHub yang dihapus di commit yang sama.
+        Return {"files": {path: sha blob}, "deleted": [...], "commit": ...} atau None bila gagal.
+        """
+        if not self.enabled:
+            return None
+        api = f"https://api.github.com/repos/{self.repo}/git"
+        total = sum(os.path.getsize(local_path) for local_path in files.values())
+        try:
+            r = requests.get(f"{api}/ref/heads/{self.branch}", headers=self.headers, timeout=30)
+            if r.status_code != 200:
+                return None
+            parent_sha = r.json()["object"]["sha"]
+            r = requests.get(f"{api}/commits/{parent_sha}", headers=self.headers, timeout=30)
+            if r.status_code != 200:
+                return None
+            base_tree = r.json()["tree"]["sha"]
+
+            tree, blob_shas, done = [], {}, 0
+            for path, local_path in files.items():
+                file_progress = (lambda sent, size, done=done: progress(done + sent, total)) if progress else None
+                body = _Base64JsonBody(local_path, file_progress)
+                r = requests.post(f"{api}/blobs", headers=dict(self.headers, **{"Content-Type": "application/json"}),
+                                  data=body, timeout=600)
+                if r.status_code != 201:
+                    return None
+                blob_shas[path] = r.json()["sha"]
+                tree.append({"path": path, "mode": "100644", "type": "blob", "sha": blob_shas[path]})
+                done += body.size
+            tree += [{"path": path, "mode": "100644", "type": "blob", "sha": None} for path in delete]
+
+            r = requests.post(f"{api}/trees", headers=self.headers, json={
+                "base_tree": base_tree,
+                "tree": tree
+            }, timeout=30)
+            if r.status_code != 201:
+                return None
+            r = requests.post(f"{api}/commits", headers=self.headers, json={
+                "message": message, "tree": r.json()["sha"], "parents": [parent_sha]
+            }, timeout=30)
+            if r.status_code != 201:
+                return None
+            commit = r.json()
+            r = requests.patch(f"{api}/refs/heads/{self.branch}", headers=self.headers,
+                               json={"sha": commit["sha"]}, timeout=30)
+            if r.status_code != 200:
+                return None
+        except requests.RequestException as e:
+            print("Gagal commit ke GitHub:", e)
+            return None
+        return {"files": blob_shas, "deleted": list(delete), "commit": commit}
+
+    # ---------- cache ETag / sha lokal ----------
+    def read_cache_meta(self) -> dict:
+        try:
+            with open(self.cache_meta_path, "r") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def update_cache_meta(self, path: str, entry: dict | None):
+        """Simpan (atau hapus bila entry None) ETag & sha blob terakhir untuk path GitHub."""
+        meta = self.read_cache_meta()
+        if entry is None:
+            meta.pop(path, None)
+        else:
+            meta[path] = entry
+        os.makedirs(os.path.dirname(self.cache_meta_path) or ".", exist_ok=True)
+        with open(self.cache_meta_path, "w") as f:
+            json.dump(meta, f)
+
+    def fetch_etag(self, path: str) -> str | None:
+        """ETag /contents/ terbaru lewat HEAD (tanpa body), None bila gagal."""
+        try:
+            r = requests.head(self.contents_url(path), headers=self.headers, timeout=30)
+        except requests.RequestException:
+            return None
+        return r.headers.get("ETag") if r.status_code == 200 else None
+
+    def _mark_pushed(self, path: str, sha: str):
+        """Entry cache setelah push: sha blob + ETag baru, supaya sync_file berikutnya cukup 304.
+
+        Respons upload/commit tidak membawa ETag /contents/; bila HEAD gagal, entry dihapus
+        sehingga sync berikutnya kembali GET penuh + download (tidak ada revalidasi palsu).
+        """
+        etag = self.fetch_etag(path)
+        self.update_cache_meta(path, {"etag": etag, "sha": sha} if etag else None)
+
+    def mark_synced(self, path: str, result: dict | None):
+        """Catat sha hasil upload/hapus supaya sinkronisasi berikutnya tidak download ulang."""
+        sha = ((result or {}).get("content") or {}).get("sha")
+        if sha:
+            self._mark_pushed(path, sha)
+        else:
+            self.update_cache_meta(path, None)
+
+    def mark_commit_synced(self, result: dict | None):
+        """Versi mark_synced untuk hasil commit_files (banyak file + penghapusan)."""
+        if not result:
+            return
+        for path, sha in result["files"].items():
+            self._mark_pushed(path, sha)
+        for path in result["deleted"]:
+            self.update_cache_meta(path, None)
+
+    def sync_file(self, path: str, local_path: str) -> str | None:
+        """Samakan file lokal dengan GitHub memakai ETag/sha; return sha blob (None bila gagal).
+
+        Isi file hanya didownload & didecode bila sha di GitHub berbeda dengan salinan lokal.
+        """
+        if not self.enabled:
+            return None
+        entry = self.read_cache_meta().get(path, {})
+        has_local = os.path.exists(local_path)
+        headers = dict(self.headers)
+        if has_local and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+
+        try:
+            r = requests.get(self.contents_url(path), headers=headers, timeout=30)
+        except requests.RequestException as e:
+            print("Gagal menghubungi GitHub, pakai salinan lokal:", e)
+            return entry.get("sha") if has_local else None
+
+        if r.status_code == 304:
+            return entry.get("sha")
+        if r.status_code != 200:
+            return None
+
+        info = r.json()
+        sha = info.get("sha")
+        if not (has_local and entry.get("sha") == sha):
+            if _has_inline_content(info):
+                _write_atomic(local_path, base64.b64decode(info["content"].encode()))
+            elif not self.stream_blob(sha, local_path):
+                return entry.get("sha") if has_local else None
+        self.update_cache_meta(path, {"etag": r.headers.get("ETag"), "sha": sha})
+        return sha
@@ -0,0 +1,24 @@
+"""Target KPI SLA (hari), disimpan sebagai JSON {"target_kpi": ...}."""
+
+import json
+import os
+
+KPI_FILE = os.path.join("data", "kpi_target.json")
+KPI_GITHUB_PATH = "data/kpi_target.json"
+
+
+def read_kpi(path: str = KPI_FILE):
+    """Target KPI dari file lokal, None bila file belum ada (error baca diteruskan ke pemanggil)."""
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        return json.load(f).get("target_kpi", None)
+
+
+def write_kpi(value, path: str = KPI_FILE) -> bytes:
+    """Tulis target KPI ke file lokal; return isi JSON-nya (untuk diunggah apa adanya)."""
+    payload = json.dumps({"target_kpi": value}).encode()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(payload)
+    return payload
@@ -0,0 +1,373 @@
+"""Poster A4 SLA (PIL + matplotlib), bisa dipakai dari app maupun batch."""
+
+import io
+import os
+from functools import lru_cache
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from PIL import Image, ImageDraw, ImageFilter, ImageFont
+
+from .dataset import PROSES_COLS
+from .formatting import format_duration
+
+# ==========================================================
+# Aset & layer statis poster (di-cache per proses)
+# ==========================================================
+POSTER_SIZE = (2480, 3508)  # A4 300 DPI
+ASSET_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # aset di root repo
+
+@lru_cache(maxsize=None)
+def load_poster_asset(name, width=None, height=None):
+    """Aset PNG poster (RGBA), sudah di-resize ke lebar/tinggi target; decode sekali per proses."""
+    img = Image.open(os.path.join(ASSET_DIR, name)).convert("RGBA")
+    scale = width / img.width if width else height / img.height
+    return img.resize((int(img.width * scale), int(img.height * scale)), Image.Resampling.LANCZOS)
+
+POSTER_FONT = os.path.join(ASSET_DIR, "Anton-Regular.ttf")
+
+@lru_cache(maxsize=64)
+def load_font(path, size):
+    """ImageFont per (path, size); fallback ke font default bila TTF tidak tersedia."""
+    try:
+        return ImageFont.truetype(path, size)
+    except Exception:
+        return ImageFont.load_default()
+
+@lru_cache(maxsize=256)
+def fit_font(text, max_width, max_size, min_size=40, path=POSTER_FONT):
+    """Font terbesar (min_size..max_size) yang membuat text muat di max_width; binary search ukuran."""
+    lo, hi, best = min_size, max_size, min_size
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        left, _, right, _ = load_font(path, mid).getbbox(text)
+        if right - left <= max_width:
+            best, lo = mid, mid + 1
+        else:
+            hi = mid - 1
+    return load_font(path, best)
+
+class _RGBABuffer(io.RawIOBase):
+    """Tujuan savefig(format="rgba"): simpan buffer canvas Agg apa adanya sebagai array (tinggi, lebar, 4)."""
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.pixels = np.array(data)  # memoryview renderer Agg sudah berbentuk (tinggi, lebar, 4)
+        return self.pixels.nbytes
+
+def render_fig_to_image(fig, max_width, max_height=None, pad_inches=0.1):
+    """Render figure matplotlib sekali di ukuran target (tight bbox, transparan) → PIL RGBA.
+
+    Tight bbox dihitung tanpa menggambar, lalu savefig(format="rgba") menggambar sekali dan
+    menulis buffer RGBA mentah; ukuran gambar diambil dari bentuk buffer itu (tanpa PNG).
+    """
+    bbox = fig.get_tightbbox(fig.canvas.get_renderer()).padded(pad_inches)  # dalam inci
+    dpi = max_width / bbox.width
+    if max_height:
+        dpi = min(dpi, max_height / bbox.height)
+    buf = _RGBABuffer()
+    fig.savefig(buf, format="rgba", dpi=dpi, bbox_inches=bbox, transparent=True)
+    plt.close(fig)
+    return Image.fromarray(buf.pixels)
+
+@lru_cache(maxsize=1)
+def poster_base_layer():
+    """Layer bawah poster: gradient biru → putih (NumPy) + logo ASDP, Danantara, Transformation."""
+    W, H = POSTER_SIZE
+    t = np.arange(H) / H
+    rows = np.stack([255 - t * 55, 255 - t * 100, 255 - t * 155], axis=1).astype(np.uint8)
+    bg = Image.fromarray(np.ascontiguousarray(np.broadcast_to(rows[:, None, :], (H, W, 3))), "RGB")
+
+    for name, width, pos in [
+        ("asdp_logo.png", W * 0.15, (2000, 80)),
+        ("Danantara.png", W * 0.2, (80, 80)),
+        ("Transformation.png", W * 0.2, (80, 3000)),
+    ]:
+        try:
+            logo_img = load_poster_asset(name, width=width)
+            bg.paste(logo_img, pos, logo_img)
+        except Exception:
+            pass
+    return bg
+
+@lru_cache(maxsize=1)
+def poster_footer_layer():
+    """Layer atas poster (footer, Captain Ferizy, Transformation) + tinggi footer; ditempel paling akhir."""
+    W, H = POSTER_SIZE
+    layer = Image.new("RGBA", POSTER_SIZE, (255, 255, 255, 0))
+    try:
+        footer_img = load_poster_asset("Footer.png", width=W)
+    except Exception as e:
+        print("⚠️ Gagal render Footer/Ferizy/Transformation:", e)
+        return layer, 0
+    layer.alpha_composite(footer_img, (0, H - footer_img.height))
+    try:
+        ferizy_img = load_poster_asset("Captain Ferizy.png", height=footer_img.height * 2)
+        layer.alpha_composite(ferizy_img, (W - ferizy_img.width, H - ferizy_img.height))
+        trans_img = load_poster_asset("Transformation.png", height=footer_img.height * 0.35)
+        layer.alpha_composite(trans_img, (0, H - trans_img.height - 40))
+    except Exception as e:
+        print("⚠️ Gagal render Footer/Ferizy/Transformation:", e)
+    return layer, footer_img.height
+
+# ==========================================================
+# Poster A4 Generator (Gradient BG + Glassmorphism Card)
+# ==========================================================
+def generate_poster_A4(
+    sla_text_dict, rata_proses_seconds, df_proses,
+    image_url, periode_range_text,
+    df_filtered, periode_col, selected_periode, as_image=False
+):
+    W, H = POSTER_SIZE
+
+    # ---------- Layer statis (gradient + logo) ----------
+    bg = poster_base_layer().copy()
+    draw = ImageDraw.Draw(bg)
+
+    # ---------- Judul ----------
+    title_text = "SLA DOKUMEN PENAGIHAN"
+    font_title = fit_font(title_text, int(W * 0.9), 200)
+    bbox_title = draw.textbbox((0, 0), title_text, font=font_title)
+    title_w = bbox_title[2] - bbox_title[0]
+    title_h = bbox_title[3] - bbox_title[1]
+    title_y = int(H * 0.10)
+    draw.text(((W - title_w) // 2, title_y), title_text, fill="black", font=font_title)
+
+    # ---------- Periode ----------
+    font_periode = fit_font(periode_range_text, int(W * 0.8), 140)
+    bbox_periode = draw.textbbox((0, 0), periode_range_text, font=font_periode)
+    periode_w = bbox_periode[2] - bbox_periode[0]
+    periode_h = bbox_periode[3] - bbox_periode[1]
+    periode_y = title_y + title_h + int(H * 0.03)
+    draw.text(((W - periode_w) // 2, periode_y), periode_range_text, fill="black", font=font_periode)
+
+    # ---------- Garis Separator ----------
+    line_y = periode_y + periode_h + 30
+    margin_x = 150
+    draw.line((margin_x, line_y, W - margin_x, line_y), fill="black", width=12)
+
+    # ---------- Grafik SLA Proses ----------
+    chart_img = None
+    try:
+        fig, ax = plt.subplots(figsize=(10, 4))
+        values_hari = [rata_proses_seconds[col] / 86400 for col in rata_proses_seconds.index]
+        ax.bar(rata_proses_seconds.index, values_hari, color='#75c8ff')
+        ax.set_title("Rata-rata SLA per Proses (hari)")
+        ax.set_ylabel("Hari")
+        ax.grid(axis='y', linestyle='--', alpha=0.7)
+        chart_img = render_fig_to_image(fig, int(W * 0.65))
+    except Exception as e:
+        print("Gagal render chart:", e)
+
+    # ---------- Render Tabel SLA ----------
+    table_img = None
+    try:
+        fig, ax = plt.subplots(figsize=(5, 4))
+        ax.axis('off')
+        tbl = ax.table(
+            cellText=df_proses.values,
+            colLabels=df_proses.columns,
+            rowLabels=df_proses.index,
+            loc='center'
+        )
+        tbl.auto_set_font_size(False)
+        tbl.set_fontsize(12)
+        tbl.scale(1.3, 1.3)
+        tbl.auto_set_column_width([0, 1])
+        table_img = render_fig_to_image(fig, int(W * 0.30))
+    except Exception as e:
+        print("Gagal render tabel SLA:", e)
+
+    # ---------- Glassmorphism Card ----------
+    card_margin_x = 80
+    card_top = line_y + 20
+    content_height = max(chart_img.height if chart_img else 0, table_img.height if table_img else 0)
+    card_bottom = card_top + content_height + 80
+    card_box = (card_margin_x, card_top, W - card_margin_x, card_bottom)
+
+    # Blur background dalam area card
+    region = bg.crop(card_box).filter(ImageFilter.GaussianBlur(20))
+    bg.paste(region, card_box)
+
+    # Semi transparan overlay
+    card_overlay = Image.new("RGBA", bg.size, (255, 255, 255, 0))
+    overlay_draw = ImageDraw.Draw(card_overlay)
+    overlay_draw.rounded_rectangle(
+        card_box,
+        radius=40,
+        outline=(255, 255, 255, 200),
+        width=4,
+        fill=(255, 255, 255, 100)
+    )
+    bg = Image.alpha_composite(bg.convert("RGBA"), card_overlay)
+    draw = ImageDraw.Draw(bg)
+
+    if chart_img:
+        pos_x = card_margin_x + 50
+        pos_y = card_top + 40
+        bg.paste(chart_img, (pos_x, pos_y), chart_img)
+    if table_img:
+        pos_x = W - table_img.width - card_margin_x - 50
+        pos_y = card_top + 40
+        bg.paste(table_img, (pos_x, pos_y), table_img)    # ---------- Kemudi + On Target ----------
+    try:
+        kemudi_img = load_poster_asset("Kemudi.png", width=int(W * 0.18))
+        pos_x = W - card_margin_x - kemudi_img.width - 50
+        pos_y = card_top + table_img.height + 30
+        bg.paste(kemudi_img, (pos_x, pos_y), kemudi_img)
+        text = "ON TARGET"
+        font_target = fit_font(text, int(W * 0.3), 120)
+        bbox = draw.textbbox((0, 0), text, font=font_target)
+        tw, th = bbox[2] - bbox[0], bbox[3] - bbox[1]
+        text_x = pos_x + (kemudi_img.width - tw) // 2
+        text_y = pos_y + kemudi_img.height + 1
+        draw.text((text_x, text_y), text, font=font_target, fill=(0, 150, 0))
+    except Exception as e:
+        print("Gagal render Kemudi/On Target:", e)
+
+    # ---------- Footer + Garis Tengah + Grafik & Tabel Jumlah Transaksi ----------
+    footer_layer, footer_height = poster_footer_layer()
+    try:
+        # 1. Garis tengah
+        overlay = Image.new("RGBA", bg.size, (255, 255, 255, 0))
+        overlay_draw = ImageDraw.Draw(overlay)
+        center_x = W // 2
+        overlay_draw.line((center_x, card_bottom, center_x, H), fill="black", width=15)
+        bg = Image.alpha_composite(bg, overlay)
+
+        # 2. Grafik jumlah transaksi
+        trans_img = None
+        pos_y_trans = card_bottom + 50
+        try:
+            jumlah_transaksi = df_filtered.groupby(periode_col, observed=True).size().reset_index(name='Jumlah')
+            jumlah_transaksi[periode_col] = jumlah_transaksi[periode_col].astype(str)
+            fig_trans, ax_trans = plt.subplots(figsize=(8, 5))
+            colors = plt.cm.viridis(range(len(jumlah_transaksi)))
+            ax_trans.bar(jumlah_transaksi[periode_col], jumlah_transaksi['Jumlah'], color=colors)
+            ax_trans.set_title("Jumlah Transaksi per Periode", fontsize=28, weight="bold")
+            ax_trans.set_xlabel("Periode")
+            ax_trans.set_ylabel("Jumlah")
+            ax_trans.grid(axis='y', linestyle='--', alpha=0.6)
+            for label in ax_trans.get_xticklabels():
+                label.set_rotation(45)
+                label.set_ha('right')
+            trans_img = render_fig_to_image(fig_trans, int(W * 0.40), H - card_bottom - footer_height - 400)
+            pos_x = 150
+            bg.paste(trans_img, (pos_x, pos_y_trans), trans_img)
+        except Exception as e:
+            print("⚠️ Gagal render grafik jumlah transaksi:", e)
+
+        # 2b. Tabel jumlah transaksi (lebih keren, dinaikkan sedikit)
+        try:
+            jumlah_transaksi = df_filtered.groupby(periode_col, observed=True).size().reset_index(name='Jumlah')
+            jumlah_transaksi[periode_col] = jumlah_transaksi[periode_col].astype(str)
+            total_row = pd.DataFrame({periode_col: ["TOTAL"], "Jumlah": [jumlah_transaksi["Jumlah"].sum()]})
+            jumlah_transaksi = pd.concat([jumlah_transaksi, total_row], ignore_index=True)
+
+            fig_tbl, ax_tbl = plt.subplots(figsize=(6, 4))
+            ax_tbl.axis("off")
+            table = ax_tbl.table(
+                cellText=jumlah_transaksi.values,
+                colLabels=jumlah_transaksi.columns,
+                loc="center",
+                cellLoc="center"
+            )
+            table.auto_set_font_size(False)
+            table.set_fontsize(16)
+            table.scale(1.5, 1.5)
+
+            # Header style
+            for j in range(len(jumlah_transaksi.columns)):
+                cell = table[(0, j)]
+                cell.set_fontsize(18)
+                cell.set_text_props(weight="bold", color="white")
+                cell.set_facecolor("#1f77b4")
+
+            # Row styling
+            for i in range(1, len(jumlah_transaksi) + 1):
+                for j in range(len(jumlah_transaksi.columns)):
+                    cell = table[(i, j)]
+                    if i % 2 == 0:
+                        cell.set_facecolor("#f2f2f2")
+                    else:
+                        cell.set_facecolor("#ffffff")
+                    if jumlah_transaksi.iloc[i-1, 0] == "TOTAL":
+                        cell.set_text_props(weight="bold", color="darkred")
+                        cell.set_facecolor("#e6e6e6")
+
+            tbl_img = render_fig_to_image(fig_tbl, int(W * 0.40))
+            pos_x = 150
+            if trans_img:
+                pos_y = pos_y_trans + trans_img.height + 20  # lebih dekat ke grafik
+            else:
+                pos_y = pos_y_trans
+            bg.paste(tbl_img, (pos_x, pos_y), tbl_img)
+        except Exception as e:
+            print("⚠️ Gagal render tabel jumlah transaksi:", e)
+
+    except Exception as e:
+        print("⚠️ Gagal render grafik/tabel jumlah transaksi:", e)
+
+    # 3. Footer, Captain Ferizy, Transformation (layer statis)
+    bg.alpha_composite(footer_layer)
+
+    # as_image=True → kembalikan PIL RGB (encode dilakukan terpisah, lihat encode_poster)
+    if as_image:
+        return bg.convert("RGB")
+    out = io.BytesIO()
+    bg.save(out, format="PNG")
+    out.seek(0)
+    return out
+
+def generate_poster_for(df_range, periode_col, selected_periode, proses_cols=None,
+                        periode_range_text=None, as_image=False):
+    """Poster A4 untuk satu potongan data: hitung rata-rata per proses lalu generate_poster_A4."""
+    if proses_cols is None:
+        proses_cols = [c for c in PROSES_COLS if c in df_range.columns]
+    if periode_range_text is None:
+        periode_range_text = f"Periode dari {selected_periode[0]} sampai {selected_periode[-1]}"
+    rata_proses_seconds = df_range[proses_cols].mean()
+    df_proses = pd.DataFrame({
+        "Rata-rata SLA": [
+            format_duration(rata_proses_seconds[col]) for col in rata_proses_seconds.index
+        ]
+    }, index=rata_proses_seconds.index)
+    return generate_poster_A4(
+        {}, rata_proses_seconds, df_proses, "Captain Ferizy.png", periode_range_text,
+        df_range, periode_col, selected_periode, as_image=as_image
+    )
+
+# ==========================================================
+# Output Poster (format & resolusi)
+# ==========================================================
+POSTER_PREVIEW_WIDTH = 827  # ± A4 100 DPI, untuk preview di halaman
+POSTER_PREVIEW = "Preview (JPEG, resolusi rendah)"
+POSTER_OUTPUTS = {
+    "PNG (A4 - 300 DPI)": {"format": "PNG", "ext": "png", "mime": "image/png", "width": None,
+                           "params": {"compress_level": 3}},
+    "JPEG (A4 - 300 DPI, ringan)": {"format": "JPEG", "ext": "jpg", "mime": "image/jpeg", "width": None,
+                                    "params": {"quality": 88, "optimize": True, "progressive": True}},
+    "WebP (A4 - 300 DPI, ringan)": {"format": "WEBP", "ext": "webp", "mime": "image/webp", "width": None,
+                                    "params": {"quality": 85, "method": 4}},
+    POSTER_PREVIEW: {"format": "JPEG", "ext": "jpg", "mime": "image/jpeg", "width": POSTER_PREVIEW_WIDTH,
+                     "params": {"quality": 80}},
+}
+
+def encode_poster(img, option):
+    """Encode poster (PIL RGB) ke bytes sesuai opsi di POSTER_OUTPUTS."""
+    spec = POSTER_OUTPUTS[option]
+    if spec["width"] and img.width > spec["width"]:
+        img = img.resize((spec["width"], round(img.height * spec["width"] / img.width)), Image.Resampling.LANCZOS)
+    dpi = 300 * img.width / POSTER_SIZE[0]
+    out = io.BytesIO()
+    img.save(out, format=spec["format"], dpi=(dpi, dpi), **spec["params"])
+    return out.getvalue()
+
+def poster_output(poster, option):
+    """Bytes poster per opsi; tiap opsi di-encode sekali lalu disimpan bersama posternya."""
+    if option not in poster["encoded"]:
+        poster["encoded"][option] = encode_poster(poster["image"], option)
+    return poster["encoded"][option]
@@ -0,0 +1,238 @@
+"""Backend query agregat dashboard: cube pandas, SQLite, atau DuckDB (tanpa Streamlit).
+
+Semua backend mengembalikan tabel yang sama persis dengan `cube_agg` (kolom rata-rata
+detik, `_N`, JUMLAH_BARIS). Backend SQL menyimpan baris siap pakai di satu file database
+lokal (data/store/query.sqlite / query.duckdb) dan menjalankan GROUP BY di engine,
+sehingga yang masuk ke memori Streamlit hanya hasil agregat yang kecil.
+"""
+
+import copy
+import importlib.util
+import os
+import sqlite3
+import threading
+from functools import lru_cache
+
+import pandas as pd
+
+from .cube import CUBE_ROWS_COL, CUBE_VALUE_COLS, cube_agg
+from .dataset import VENDOR_KATEGORI, VENDOR_KATEGORI_COL
+from .store import (
+    DataStore, load_cube_range, load_range, manifest_periode, range_columns, read_partition, read_range
+)
+
+# duckdb berat untuk diimport: cukup cek terpasang, modulnya baru dimuat saat backend duckdb dipakai
+HAS_DUCKDB = importlib.util.find_spec("duckdb") is not None
+
+QUERY_BACKENDS = ("pandas", "sqlite", "duckdb")
+DEFAULT_QUERY_BACKEND = "pandas"
+
+# ============================
+# SKEMA TABEL SQL
+# ============================
+# Satu tabel baris untuk semua partisi yang pernah dimuat (partisi immutable, jadi
+# cukup diisi sekali per file). Periode tidak disimpan: kodenya diambil dari urutan
+# partisi di manifest versi yang sedang dibaca.
+ROWS_TABLE = "sla_rows"
+PARTS_TABLE = "sla_parts"
+SQL_KEY_COLS = ["JENIS TRANSAKSI", "NAMA VENDOR", VENDOR_KATEGORI_COL]
+# dtype teks bawaan pandas (str di pandas 3, object sebelumnya), sama dengan kolom kunci cube
+TEXT_DTYPE = pd.Series(["teks"]).dtype
+
+def query_db_path(root: str, backend: str) -> str:
+    return os.path.join(root, f"query.{backend}")
+
+def _q(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+def _connect(backend, path):
+    if backend == "duckdb":
+        import duckdb
+        return duckdb.connect(path)
+    return sqlite3.connect(path)
+
+def _create_tables(con):
+    columns = ", ".join(
+        ["part VARCHAR"] + [f"{_q(c)} VARCHAR" for c in SQL_KEY_COLS] + [f"{_q(c)} DOUBLE" for c in CUBE_VALUE_COLS]
+    )
+    con.execute(f"CREATE TABLE IF NOT EXISTS {ROWS_TABLE} ({columns})")
+    con.execute(f"CREATE TABLE IF NOT EXISTS {PARTS_TABLE} (part VARCHAR PRIMARY KEY, rows BIGINT)")
+    if isinstance(con, sqlite3.Connection):
+        # DuckDB cukup dengan zonemap (baris satu partisi tersimpan berurutan)
+        con.execute(f"CREATE INDEX IF NOT EXISTS {ROWS_TABLE}_part ON {ROWS_TABLE} (part)")
+
+def _partition_rows(path, name):
+    """Baris partisi untuk tabel SQL: kunci sebagai teks, nilai SLA dalam detik (NULL bila kosong)."""
+    df = read_partition(path)  # tanpa cache baris: setelah diisi, yang dibaca hanya database
+    rows = pd.DataFrame({"part": name}, index=df.index)
+    for col in SQL_KEY_COLS:
+        values = df[col].astype(object) if col in df.columns else pd.Series(None, index=df.index, dtype=object)
+        rows[col] = values.where(values.notna(), None).map(lambda v: v if v is None else str(v))
+    for col in CUBE_VALUE_COLS:
+        rows[col] = pd.to_numeric(df[col], errors="coerce") if col in df.columns else float("nan")
+    return rows
+
+def _insert_rows(backend, con, rows):
+    if backend == "duckdb":
+        con.register("partition_rows", rows)
+        con.execute(f"INSERT INTO {ROWS_TABLE} SELECT * FROM partition_rows")
+        con.unregister("partition_rows")
+        return
+    values = rows.astype(object).where(rows.notna(), None).itertuples(index=False, name=None)
+    con.executemany(f"INSERT INTO {ROWS_TABLE} VALUES ({', '.join(['?'] * rows.shape[1])})", values)
+
+_INGEST_LOCK = threading.Lock()
+
+@lru_cache(maxsize=8)
+def ensure_query_db(backend: str, root: str, version: int) -> str:
+    """Isi database query dengan partisi versi ini yang belum ada; return path database."""
+    path = query_db_path(root, backend)
+    store = DataStore(root)
+    manifest = store.read_manifest(version)
+    with _INGEST_LOCK:
+        con = _connect(backend, path)
+        try:
+            _create_tables(con)
+            known = {row[0] for row in con.execute(f"SELECT part FROM {PARTS_TABLE}").fetchall()}
+            for entry in manifest["partitions"]:
+                if entry["file"] in known:
+                    continue
+                rows = _partition_rows(store.partition_path(entry["file"]), entry["file"])
+                _insert_rows(backend, con, rows)
+                con.execute(f"INSERT INTO {PARTS_TABLE} VALUES (?, ?)", [entry["file"], len(rows)])
+                known.add(entry["file"])
+            con.commit()
+        finally:
+            con.close()
+    return path
+
+# ============================
+# AGREGASI SQL
+# ============================
+@lru_cache(maxsize=64)
+def sql_totals(backend: str, root: str, version: int, idx_start: int, idx_end: int,
+               cols: tuple, by: tuple, filters: tuple):
+    """SUM/COUNT per grup dihitung engine SQL; bentuk kolom sama dengan cube (_SUM, _N, JUMLAH_BARIS)."""
+    path = ensure_query_db(backend, root, version)
+    manifest = DataStore(root).read_manifest(version)
+    periode_col = manifest["periode_col"]
+    codes = [(manifest["partitions"][code]["file"], code) for code in range(idx_start, idx_end + 1)]
+
+    select = [f"r.code AS {_q(c)}" if c == periode_col else f"t.{_q(c)}" for c in by]
+    select += [f"SUM(t.{_q(c)}) AS {_q(c + '_SUM')}" for c in cols]
+    select += [f"COUNT(t.{_q(c)}) AS {_q(c + '_N')}" for c in cols]
+    select += [f"COUNT(*) AS {_q(CUBE_ROWS_COL)}"]
+    sql = (
+        f"WITH r(part, code) AS (VALUES {', '.join(['(?, ?)'] * len(codes))}) "
+        f"SELECT {', '.join(select)} FROM {ROWS_TABLE} t JOIN r ON t.part = r.part"
+    )
+    params = [v for pair in codes for v in pair]
+    if filters:
+        sql += " WHERE " + " AND ".join(f"t.{_q(c)} IN ({', '.join(['?'] * len(values))})" for c, values in filters)
+        params += [str(v) for _, values in filters for v in values]
+    if by:
+        sql += " GROUP BY " + ", ".join(f"r.code" if c == periode_col else f"t.{_q(c)}" for c in by)
+
+    con = _connect(backend, path)
+    try:
+        cursor = con.execute(sql, params)
+        names = [d[0] for d in cursor.description]
+        totals = pd.DataFrame(cursor.fetchall(), columns=names)
+    finally:
+        con.close()
+
+    for c in cols:
+        totals[f"{c}_SUM"] = pd.to_numeric(totals[f"{c}_SUM"]).astype("float64").fillna(0.0)
+        totals[f"{c}_N"] = totals[f"{c}_N"].astype("int64")
+    totals[CUBE_ROWS_COL] = totals[CUBE_ROWS_COL].astype("int64")
+    # Kolom kunci diberi dtype yang sama dengan cube, juga saat hasilnya kosong
+    for c in by:
+        if c == VENDOR_KATEGORI_COL:
+            totals[c] = pd.Categorical(totals[c], categories=VENDOR_KATEGORI)
+        elif c != periode_col:
+            totals[c] = totals[c].astype(TEXT_DTYPE)
+    if periode_col in by:
+        totals[periode_col] = pd.Categorical.from_codes(
+            totals[periode_col].astype("int64"), categories=manifest_periode(manifest), ordered=True
+        )
+    return totals
+
+# ============================
+# QUERY PER RENTANG PERIODE
+# ============================
+class RangeQuery:
+    """Agregasi rentang periode (idx_start..idx_end) + filter kolom, via cube pandas."""
+
+    backend = "pandas"
+
+    def __init__(self, root, version, idx_start, idx_end, filters=()):
+        self.root, self.version = root, version
+        self.idx_start, self.idx_end = idx_start, idx_end
+        self.filters = tuple(filters)
+
+    def filter(self, col, values):
+        """Query baru yang hanya memuat baris dengan `col` di `values`."""
+        query = copy.copy(self)
+        query.filters = self.filters + ((col, tuple(str(v) for v in values)),)
+        return query
+
+    def agg(self, cols, by=None):
+        """Sama seperti `cube_agg(cube_rentang_terfilter, cols, by)`."""
+        cube = load_cube_range(self.root, self.version, self.idx_start, self.idx_end)
+        for col, values in self.filters:
+            cube = cube[cube[col].isin(values)]
+        return cube_agg(cube, cols, by)
+
+    def rows(self) -> int:
+        return int(self.agg([])[CUBE_ROWS_COL].iloc[0])
+
+    def columns(self) -> list:
+        """Kolom data rentang ini (dari skema Parquet, tanpa membaca baris)."""
+        return list(range_columns(self.root, self.version, self.idx_start, self.idx_end))
+
+    def valid_ratio(self, col) -> float:
+        """Persentase baris dengan `col` terisi (0 bila tidak ada baris)."""
+        total = self.rows()
+        return float(self.agg([], by=col)[CUBE_ROWS_COL].sum() * 100.0 / total) if total else 0.0
+
+    def _load_rows(self):
+        return load_range(self.root, self.version, self.idx_start, self.idx_end)
+
+    def frame(self):
+        """Baris lengkap query (detail vendor, poster, PDF). JANGAN diubah in-place."""
+        df = self._load_rows()
+        for col, values in self.filters:
+            df = df[df[col].astype(str).isin(values)]
+        return df
+
+    def values(self, col) -> list:
+        """Nilai unik (non-null) kolom `col` dalam query, terurut."""
+        return self.agg([], by=col).index.astype(str).tolist()
+
+class SQLRangeQuery(RangeQuery):
+    """RangeQuery yang GROUP BY-nya dijalankan di SQLite/DuckDB."""
+
+    def __init__(self, root, version, idx_start, idx_end, filters=(), backend="sqlite"):
+        super().__init__(root, version, idx_start, idx_end, filters)
+        self.backend = backend
+
+    def agg(self, cols, by=None):
+        by_cols = () if by is None else (tuple(by) if isinstance(by, list) else (by,))
+        totals = sql_totals(self.backend, self.root, self.version, self.idx_start, self.idx_end,
+                            tuple(cols), by_cols, self.filters)
+        # Hasil SQL sudah per grup; cube_agg di sini hanya merapikan (urutan, index, rata-rata)
+        return cube_agg(totals, cols, by)
+
+    def _load_rows(self):
+        # Baris dibaca langsung dari partisi, tidak mengisi cache baris pandas
+        return read_range(self.root, self.version, self.idx_start, self.idx_end)
+
+def open_query(backend, root, version, idx_start, idx_end) -> RangeQuery:
+    """RangeQuery untuk backend "pandas", "sqlite" atau "duckdb"."""
+    if backend not in QUERY_BACKENDS:
+        raise ValueError(f"Backend query '{backend}' tidak dikenal (pilihan: {', '.join(QUERY_BACKENDS)}).")
+    if backend == "duckdb" and not HAS_DUCKDB:
+        raise ValueError("Backend query 'duckdb' butuh paket duckdb (pip install duckdb).")
+    if backend == "pandas":
+        return RangeQuery(root, version, idx_start, idx_end)
+    return SQLRangeQuery(root, version, idx_start, idx_end, backend=backend)
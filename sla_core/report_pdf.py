@@ -0,0 +1,391 @@
+"""Laporan PDF SLA (ReportLab), bisa dipakai dari app maupun batch."""
+
+# ====================== IMPORTS ======================
+import io
+import os
+from functools import lru_cache
+
+import matplotlib.pyplot as plt
+import pandas as pd
+from PIL import Image
+from reportlab.platypus import (
+    SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle,
+    Image as RLImage, PageBreak
+)
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib import colors
+from reportlab.lib.units import cm
+from reportlab.lib.utils import ImageReader
+
+from .dataset import PROSES_COLS, SLA_COLS
+
+try:
+    from svglib.svglib import svg2rlg  # grafik vektor (SVG → Drawing ReportLab)
+    HAS_SVGLIB = True
+except ImportError:
+    HAS_SVGLIB = False
+
+# ====================== LOGO ASSET ======================
+# Logo diambil dari file lokal repo (tanpa unduh per halaman)
+ASSET_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOGO_LEFT_PATH  = os.path.join(ASSET_DIR, "Danantara.png")
+LOGO_RIGHT_PATH = os.path.join(ASSET_DIR, "asdp_logo.png")
+LOGO_ASDP_PATH  = LOGO_RIGHT_PATH  # cover logo center
+LOGO_DPI = 200  # resolusi pre-scale logo di PDF
+
+# ====================== STYLES ======================
+_styles = getSampleStyleSheet()
+_styles.add(ParagraphStyle(name="CoverTitle", fontName="Helvetica-Bold", fontSize=30, leading=34, alignment=1, spaceAfter=12))
+_styles.add(ParagraphStyle(name="CoverSub",   fontName="Helvetica-Bold", fontSize=16, leading=20, alignment=1, spaceAfter=20))
+_styles.add(ParagraphStyle(name="HeadingCenter", fontName="Helvetica-Bold", fontSize=20, leading=24, alignment=1, spaceAfter=12, textColor=colors.HexColor("#0f172a")))
+_styles.add(ParagraphStyle(name="TOCItem", fontName="Helvetica", fontSize=13, leading=18, alignment=0, leftIndent=0))
+_styles.add(ParagraphStyle(name="Narr", fontName="Helvetica", fontSize=11, leading=15, alignment=1, spaceBefore=8, spaceAfter=8))
+_styles.add(ParagraphStyle(name="KPI", fontName="Helvetica-Bold", fontSize=12, leading=15, alignment=1, spaceAfter=10))
+_styles.add(ParagraphStyle(name="SmallRight", fontName="Helvetica", fontSize=9, alignment=2))
+
+# ====================== HELPERS ======================
+@lru_cache(maxsize=None)
+def _logo_reader(path, w_cm, h_cm):
+    """ImageReader logo lokal, sudah diskalakan ke ukuran gambarnya di PDF (cache per proses)."""
+    try:
+        img = Image.open(path).convert("RGBA")
+    except Exception:
+        return None
+    w_px = round(w_cm / 2.54 * LOGO_DPI)
+    h_px = round(h_cm / 2.54 * LOGO_DPI)
+    if img.width > w_px or img.height > h_px:
+        img = img.resize((min(img.width, w_px), min(img.height, h_px)), Image.Resampling.LANCZOS)
+    return ImageReader(img)
+
+def _draw_logo(canvas, path, x, y, w, h):
+    reader = _logo_reader(path, round(w / cm, 2), round(h / cm, 2))
+    if reader is not None:
+        canvas.drawImage(reader, x, y, width=w, height=h, mask='auto')
+
+def _plot_to_rlimage(fig, w_cm=11, h_cm=6, dpi=150):
+    """Figure → flowable ukuran w×h cm; vektor via svglib, fallback PNG."""
+    buf = io.BytesIO()
+    if HAS_SVGLIB:
+        try:
+            fig.savefig(buf, format="svg", bbox_inches="tight")
+            buf.seek(0)
+            drawing = svg2rlg(buf)
+            sx, sy = w_cm*cm / drawing.width, h_cm*cm / drawing.height
+            drawing.scale(sx, sy)
+            drawing.width, drawing.height = w_cm*cm, h_cm*cm
+            drawing.hAlign = "CENTER"
+            plt.close(fig)
+            return drawing
+        except Exception as e:
+            print("Gagal render grafik vektor, fallback PNG:", e)
+            buf = io.BytesIO()
+    fig.savefig(buf, format="png", bbox_inches="tight", dpi=dpi)
+    plt.close(fig)
+    buf.seek(0)
+    return RLImage(buf, width=w_cm*cm, height=h_cm*cm)
+
+def _nice_table(data, colWidths=None, header_bg="#0ea5e9", align="CENTER"):
+    tbl = Table(data, colWidths=colWidths, hAlign=align)
+    tbl.setStyle(TableStyle([
+        ("BACKGROUND",(0,0),(-1,0),colors.HexColor(header_bg)),
+        ("TEXTCOLOR",(0,0),(-1,0),colors.white),
+        ("FONTNAME",(0,0),(-1,0),"Helvetica-Bold"),
+        ("FONTSIZE",(0,0),(-1,0),11),
+        ("ALIGN",(0,0),(-1,0),"CENTER"),
+        ("GRID",(0,0),(-1,-1),0.5,colors.HexColor("#d1d5db")),
+        ("ROWBACKGROUNDS",(0,1),(-1,-1),[colors.white,colors.HexColor("#f8fafc")]),
+        ("FONTSIZE",(0,1),(-1,-1),10),
+        ("VALIGN",(0,0),(-1,-1),"MIDDLE"),
+        ("TOPPADDING",(0,0),(-1,-1),6),
+        ("BOTTOMPADDING",(0,0),(-1,-1),6),
+    ]))
+    return tbl
+
+def _toc_row(title, page, dots_len=80):
+    dots = "." * dots_len
+    tbl = Table(
+        [[Paragraph(title, _styles["TOCItem"]),
+          Paragraph(dots, _styles["TOCItem"]),
+          Paragraph(page, _styles["TOCItem"])]],
+        colWidths=[12*cm, 11*cm, 1.5*cm],
+        hAlign="CENTER"
+    )
+    tbl.setStyle(TableStyle([
+        ("VALIGN",(0,0),(-1,-1),"MIDDLE"),
+        ("LEFTPADDING",(0,0),(-1,-1),0),
+        ("RIGHTPADDING",(0,0),(-1,-1),0),
+        ("FONTSIZE",(0,0),(-1,-1),12),
+    ]))
+    return tbl
+
+# ====================== NARRASI HELPERS ======================
+def _narasi_overview(avg_days, kpi_target_days):
+    if avg_days is None: return "Data KEUANGAN tidak tersedia."
+    if kpi_target_days is None: return f"Rata-rata SLA KEUANGAN {avg_days:.2f} hari."
+    status = "di bawah" if avg_days <= kpi_target_days else "di atas"
+    return f"Rata-rata SLA KEUANGAN {avg_days:.2f} hari, {status} target KPI {kpi_target_days:.2f} hari."
+
+def _narasi_top_bottom(series_days):
+    if series_days is None or len(series_days)==0: return "Tidak ada data."
+    s = pd.Series(series_days).dropna().sort_values()
+    if s.empty: return "Tidak ada data."
+    lo, hi = s.index[0], s.index[-1]
+    return f"Proses tercepat: {lo} ({s.iloc[0]:.2f} hari). Terlama: {hi} ({s.iloc[-1]:.2f} hari)."
+
+def _narasi_tren(df_days):
+    desc=[]
+    for col in df_days.columns:
+        s = df_days[col].dropna()
+        if len(s)>=2:
+            delta = s.iloc[-1]-s.iloc[0]
+            arah = "naik" if delta>0 else ("turun" if delta<0 else "stabil")
+            desc.append(f"{col}: {arah} {abs(delta):.2f} hari")
+    return "Ringkasan tren: " + "; ".join(desc) if desc else "Tren belum dapat dianalisis."
+
+def _narasi_transaksi(trans_df):
+    if trans_df.empty: return "Tidak ada data transaksi."
+    peak = trans_df.loc[trans_df["Jumlah"].idxmax()]
+    low  = trans_df.loc[trans_df["Jumlah"].idxmin()]
+    mean = trans_df["Jumlah"].mean()
+    return f"Rata-rata transaksi {mean:.1f}. Tertinggi {peak['Periode']} ({int(peak['Jumlah'])}), terendah {low['Periode']} ({int(low['Jumlah'])})."
+
+# ====================== HEADER & FOOTER ======================
+def _first_page(canvas, doc):
+    pw, ph = landscape(A4)
+    _draw_logo(canvas, LOGO_ASDP_PATH, pw/2 - 3*cm, ph - 10*cm, 6*cm, 6*cm)
+
+def _later_pages(canvas, doc):
+    pw, ph = landscape(A4)
+    _draw_logo(canvas, LOGO_LEFT_PATH, 1.5*cm, ph - 3.6*cm, 4.5*cm, 1.6*cm)
+    _draw_logo(canvas, LOGO_RIGHT_PATH, pw - 5.1*cm, ph - 3.6*cm, 3*cm, 3*cm)
+    canvas.setFont("Helvetica", 9)
+    canvas.drawRightString(pw - 1.6*cm, 1.05*cm, f"Halaman {doc.page}")
+
+# ====================== MAIN FUNCTION ======================
+def generate_pdf_report_v6(df_ord, selected_periode, periode_col, available_sla_cols, proses_cols, kpi_target_days=None):
+    df = df_ord.copy()
+    categories = [str(p) for p in selected_periode]
+    if isinstance(df[periode_col].dtype, pd.CategoricalDtype):
+        # Periode sudah kategori (prepare_dataset) → cukup set ulang kategorinya
+        df[periode_col] = df[periode_col].cat.set_categories(categories, ordered=True)
+    else:
+        df[periode_col] = pd.Categorical(df[periode_col].astype(str), categories=categories, ordered=True)
+    df_filt = df[df[periode_col].notna()].sort_values(periode_col)
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=landscape(A4),
+                            leftMargin=2*cm, rightMargin=2*cm,
+                            topMargin=3.6*cm, bottomMargin=2*cm)
+    story = []
+
+    # === Cover
+    story.append(Spacer(1, 7*cm))
+    story.append(Paragraph("LAPORAN SLA VERIFIKASI DOKUMEN PENAGIHAN PT ASDP INDONESIA FERRY (PERSERO)", _styles["CoverTitle"]))
+    if selected_periode:
+        story.append(Paragraph(f"PERIODE: {str(selected_periode[0]).upper()} – {str(selected_periode[-1]).upper()}", _styles["CoverSub"]))
+    story.append(PageBreak())
+
+    # === TOC
+    story.append(Paragraph("DAFTAR ISI", _styles["HeadingCenter"]))
+    story.append(Spacer(1,0.6*cm))
+    toc_map=[("OVERVIEW","3"),("SLA PER PROSES","4"),("SLA PER JENIS TRANSAKSI","5"),
+             ("TREN SLA","6"),("JUMLAH TRANSAKSI","8"),("KESIMPULAN","9")]
+    for t,p in toc_map:
+        story.append(_toc_row(t,p,dots_len=70))
+        story.append(Spacer(1,0.2*cm))
+    story.append(PageBreak())
+
+    # === Page 3: Overview
+    story.append(Paragraph("OVERVIEW", _styles["HeadingCenter"]))
+    total_trans = len(df_filt)
+    avg_keu_days = None
+    if "KEUANGAN" in df_filt.columns:
+        avg_keu_days = float((df_filt["KEUANGAN"].mean()/86400.0).round(2))
+    kpi_lines = [f"<b>JUMLAH TRANSAKSI</b>: {total_trans:,}"]
+    if avg_keu_days: kpi_lines.append(f"<b>RATA-RATA SLA KEUANGAN</b>: {avg_keu_days:.2f} HARI")
+    if kpi_target_days: kpi_lines.append(f"<b>TARGET KPI</b>: {kpi_target_days:.2f} HARI")
+    story.append(Paragraph("<br/>".join(kpi_lines), _styles["KPI"]))
+    if "KEUANGAN" in df_filt.columns:
+        df_keu=df_filt.groupby(periode_col)["KEUANGAN"].mean().reindex(categories).reset_index()
+        df_keu["SLA (hari)"]=(df_keu["KEUANGAN"]/86400.0).round(2)
+        df_keu.rename(columns={periode_col:"Periode"}, inplace=True)
+        tbl=_nice_table([["Periode","SLA (hari)"]]+df_keu[["Periode","SLA (hari)"]].astype(str).values.tolist(), colWidths=[4*cm,4*cm])
+        fig,ax=plt.subplots(figsize=(7,4))
+        ax.plot(df_keu["Periode"],df_keu["SLA (hari)"],marker="o",color="#0ea5e9")
+        ax.tick_params(axis="x",rotation=45)
+        if kpi_target_days: ax.axhline(y=kpi_target_days,ls="--",c="r")
+        chart=_plot_to_rlimage(fig,w_cm=13,h_cm=7)
+        pair=Table([[chart,tbl]],colWidths=[13*cm,8*cm],hAlign="CENTER")
+        pair.setStyle([("LEFTPADDING",(0,0),(-1,-1),0),("RIGHTPADDING",(0,0),(-1,-1),0)])
+        story.append(pair)
+        story.append(Spacer(1,0.5*cm))
+    story.append(PageBreak())
+    
+    # === Page 4: SLA PER PROSES
+    story.append(Paragraph("SLA PER PROSES", _styles["HeadingCenter"]))
+    valid_proc=[c for c in (proses_cols or []) if c in df_filt.columns]
+    if valid_proc:
+        dfp=(df_filt[valid_proc].mean()/86400.0).round(2)
+        tbl=_nice_table([["Proses","SLA (hari)"]]+[[i,f"{v:.2f}"] for i,v in dfp.items()])
+        fig,ax=plt.subplots(figsize=(7,4))
+        ax.bar(dfp.index,dfp.values,color="#0ea5e9")
+        ax.tick_params(axis="x",rotation=45)
+        chart=_plot_to_rlimage(fig,w_cm=13,h_cm=7)
+
+        # Layout → Grafik kiri, tabel kanan, sejajar atas
+        pair=Table([[chart,tbl]],colWidths=[13*cm,8*cm],hAlign="CENTER")
+        pair.setStyle([
+            ("LEFTPADDING",(0,0),(-1,-1),0),
+            ("RIGHTPADDING",(0,0),(-1,-1),0),
+            ("VALIGN",(0,0),(-1,-1),"TOP"),   # <<< ini penting: sejajarkan ke atas
+        ])
+        story.append(pair)
+
+        story.append(Spacer(1,0.5*cm))
+        narasi_tbl=Table(
+            [[Paragraph(_narasi_top_bottom(dfp),_styles["Narr"])]],
+            colWidths=[21*cm],
+            hAlign="CENTER"
+        )
+        story.append(narasi_tbl)
+    story.append(PageBreak())
+
+    # === Page 5: SLA PER JENIS TRANSAKSI
+    story.append(Paragraph("SLA PER JENIS TRANSAKSI", _styles["HeadingCenter"]))
+    jns_candidates=["JENIS_TRANSAKSI","JENIS TRANSAKSI","Jenis Transaksi","Jenis_Transaksi","jenis_transaksi"]
+    jns_col=next((c for c in jns_candidates if c in df_filt.columns),None)
+    main_sla="KEUANGAN" if "KEUANGAN" in df_filt.columns else (available_sla_cols[0] if available_sla_cols else None)
+    if jns_col and main_sla:
+        dfj=df_filt.groupby(jns_col)[main_sla].agg(["count","mean"]).reset_index()
+        dfj["SLA (hari)"]=(dfj["mean"]/86400.0).round(2)
+        dfj=dfj.sort_values("SLA (hari)",ascending=False)
+        tbl=_nice_table([["Jenis Transaksi","Jumlah","SLA (hari)"]]+dfj[[jns_col,"count","SLA (hari)"]].astype(str).values.tolist())
+        story.append(tbl)
+        story.append(Spacer(1,0.5*cm))
+        story.append(Paragraph(_narasi_top_bottom(pd.Series(dfj["SLA (hari)"].values,index=dfj[jns_col].values)),_styles["Narr"]))
+    story.append(PageBreak())
+
+    # === Page 6: TREN SLA (adaptif)
+    story.append(Paragraph("TREN SLA", _styles["HeadingCenter"]))
+    valid_sla=[c for c in (available_sla_cols or []) if c in df_filt.columns]
+    if valid_sla:
+        trend=df_filt.groupby(periode_col)[valid_sla].mean().reindex(categories)
+        trend_days=(trend/86400.0).round(2)
+
+        if len(valid_sla) <= 3:
+            # --- Layout A: grafik kiri, tabel kanan ---
+            data=[["Periode"]+valid_sla]+trend_days.reset_index().astype(str).values.tolist()
+            tbl=_nice_table(data, colWidths=[4*cm]+[4*cm]*len(valid_sla))
+            fig,ax=plt.subplots(figsize=(7,4))
+            for c in valid_sla:
+                ax.plot(trend_days.index.astype(str),trend_days[c],marker="o",label=c)
+            ax.legend(fontsize=8)
+            ax.tick_params(axis="x",rotation=45)
+            chart=_plot_to_rlimage(fig,w_cm=13,h_cm=7)
+            pair=Table([[chart,tbl]],colWidths=[13*cm,8*cm],hAlign="CENTER")
+            pair.setStyle([
+                ("LEFTPADDING",(0,0),(-1,-1),0),
+                ("RIGHTPADDING",(0,0),(-1,-1),0),
+                ("VALIGN",(0,0),(-1,-1),"TOP"),
+            ])
+            story.append(pair)
+
+        else:
+            # --- Layout B: grafik atas, tabel bawah ---
+            fig,ax=plt.subplots(figsize=(10,4))
+            for c in valid_sla:
+                ax.plot(trend_days.index.astype(str),trend_days[c],marker="o",label=c)
+            ax.legend(fontsize=8,ncol=2)
+            ax.tick_params(axis="x",rotation=45)
+            story.append(_plot_to_rlimage(fig,w_cm=21,h_cm=8))
+            story.append(Spacer(1,0.4*cm))
+
+            data=[["Periode"]+valid_sla]+trend_days.reset_index().astype(str).values.tolist()
+            col_w=[4*cm]+[ (21-4)/len(valid_sla)*cm ]*len(valid_sla)
+            tbl=_nice_table(data, colWidths=col_w)
+            tbl.setStyle([
+                ("FONTSIZE",(0,0),(-1,-1),9),
+                ("VALIGN",(0,0),(-1,-1),"MIDDLE"),
+            ])
+            story.append(tbl)
+
+        # --- Narasi ---
+        story.append(Spacer(1,0.5*cm))
+        narasi_tbl=Table([[Paragraph(_narasi_tren(trend_days),_styles["Narr"])]],
+                         colWidths=[21*cm], hAlign="CENTER")
+        story.append(narasi_tbl)
+
+    story.append(PageBreak())
+
+    # === Page 7: JUMLAH TRANSAKSI
+    story.append(Paragraph("JUMLAH TRANSAKSI", _styles["HeadingCenter"]))
+    trans=df_filt.groupby(periode_col).size().reindex(categories).reset_index(name="Jumlah").rename(columns={periode_col:"Periode"})
+    tbl=_nice_table([["Periode","Jumlah"]]+trans.astype(str).values.tolist())
+    fig,ax=plt.subplots(figsize=(7,4))
+    ax.bar(trans["Periode"],trans["Jumlah"],color="#14b8a6"); ax.tick_params(axis="x",rotation=45)
+    chart=_plot_to_rlimage(fig,w_cm=13,h_cm=7)
+    pair=Table([[chart,tbl]],colWidths=[13*cm,8*cm],hAlign="CENTER")
+    pair.setStyle([("LEFTPADDING",(0,0),(-1,-1),0),("RIGHTPADDING",(0,0),(-1,-1),0)])
+    story.append(pair)
+    story.append(Spacer(1,0.5*cm))
+    narasi_tbl=Table([[Paragraph(_narasi_transaksi(trans),_styles["Narr"])]],colWidths=[21*cm],hAlign="CENTER")
+    story.append(narasi_tbl)
+    story.append(PageBreak())
+
+    # === Page 8: KESIMPULAN
+    story.append(Paragraph("KESIMPULAN", _styles["HeadingCenter"]))
+
+    # rangkum otomatis dari halaman-halaman sebelumnya
+    summary_parts = []
+    if "KEUANGAN" in df_filt.columns:
+        summary_parts.append(_narasi_overview(avg_keu_days, kpi_target_days))
+    if 'valid_proc' in locals() and valid_proc:
+        dfp_days = (df_filt[valid_proc].mean()/86400.0).round(2)
+        summary_parts.append(_narasi_top_bottom(dfp_days))
+    if 'valid_sla' in locals() and valid_sla:
+        trend_days_all = (df_filt.groupby(periode_col)[valid_sla].mean()/86400.0).round(2).reindex(categories)
+        summary_parts.append(_narasi_tren(trend_days_all))
+    # transaksi
+    summary_parts.append(_narasi_transaksi(trans.copy()))
+
+    story.append(Paragraph(" ".join(summary_parts), _styles["Narr"]))
+
+    # rekomendasi eye-catching (blok lebar)
+    recs = [
+        "Pertahankan proses yang sudah efisien.",
+        "Prioritaskan perbaikan pada SLA terlama.",
+        "Analisis akar masalah pada periode outlier.",
+        "Optimalkan SDM saat puncak transaksi.",
+        "Perkuat monitoring KPI (real-time alert).",
+        "Evaluasi otomasi pada aktivitas manual."
+    ]
+    rec_tbl = _nice_table(
+        [["REKOMENDASI PRIORITAS"]] + [[f"• {r}"] for r in recs],
+        colWidths=[25.5*cm],
+        header_bg="#0ea5e9",
+        align="CENTER"
+    )
+    story.append(Spacer(1, 0.6*cm))
+    story.append(rec_tbl)
+
+    story.append(Spacer(1, 0.6*cm))
+    story.append(Paragraph("Laporan ini dihasilkan otomatis oleh SLA Dashboard.", _styles["SmallRight"]))
+
+    # Build PDF
+    doc.build(story, onFirstPage=_first_page, onLaterPages=_later_pages)
+    pdf_bytes = buffer.getvalue()
+    buffer.close()
+    return pdf_bytes
+
+def generate_pdf_for(df_range, periode_col, selected_periode, kpi_target_days=None):
+    """Laporan PDF untuk satu potongan data (kolom SLA & proses dideteksi dari kolom yang ada)."""
+    available = [col for col in SLA_COLS if col in df_range.columns]
+    return generate_pdf_report_v6(
+        df_ord=df_range,
+        selected_periode=selected_periode,
+        periode_col=periode_col,
+        available_sla_cols=available,
+        proses_cols=[c for c in PROSES_COLS if c in available],
+        kpi_target_days=kpi_target_days
+    )
@@ -0,0 +1,410 @@
+"""Penyimpanan data SLA terpartisi per periode dengan manifest berversi (tanpa Streamlit)."""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+from datetime import datetime
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from .cube import build_sla_cube
+from .dataset import (
+    VENDOR_KATEGORI_COL, add_derived_columns, detect_periode_col, load_dataset, parse_sla_columns,
+    periode_categorical, write_parquet
+)
+
+# ============================
+# LAYOUT
+# ============================
+# data/store/partitions/<periode>-<sha>.parquet  satu file per periode, nama = hash isi (immutable)
+# data/store/manifests/v000001.json             satu versi per upload/append/reset/rollback (immutable)
+# data/store/CURRENT                             nomor versi aktif (satu-satunya file yang berubah)
+# data/store/SYNCED                              sha CURRENT GitHub yang manifest & partisinya sudah lengkap lokal
+# Partisi berisi baris mentah (kolom sudah dinormalisasi, SLA masih teks), sama seperti snapshot.
+STORE_DIR = os.path.join("data", "store")
+PARTITION_DIR = "partitions"
+MANIFEST_DIR = "manifests"
+CURRENT_FILE = "CURRENT"
+SYNCED_FILE = "SYNCED"
+
+# ============================
+# KUNCI BARIS (dedupe append)
+# ============================
+# Kolom nomor urut berubah antar file, jadi tidak ikut kunci baris
+APPEND_KEY_EXCLUDE = {"NO", "NO.", "NOMOR", "NO URUT"}
+DERIVED_COLS = {"PERIODE_DATETIME", VENDOR_KATEGORI_COL, "SLA_USED"}
+
+def key_columns(df_prev, df_new):
+    """Kolom pembentuk kunci baris: kolom data yang ada di kedua dataset."""
+    return [
+        c for c in df_new.columns
+        if c in df_prev.columns and c not in DERIVED_COLS and str(c).strip().upper() not in APPEND_KEY_EXCLUDE
+    ]
+
+def row_keys(df, cols):
+    """Kunci stabil per baris (hash uint64) dari kolom data yang sudah diparse.
+
+    Dihitung dari bentuk siap pakai (SLA dalam detik, periode sebagai label), sehingga
+    baris dari partisi Parquet dan dari workbook baru menghasilkan kunci yang sama.
+    """
+    frame = pd.DataFrame(index=df.index)
+    for col in cols:
+        values = df[col]
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            values = values.astype("float64")  # 5 vs 5.0 (kolom berisi NaN di salah satu file)
+        values = values.astype(object)
+        frame[col] = values.where(values.notna(), "").astype(str)
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy()
+
+def _periode_labels(periode):
+    """Label partisi per baris: str(nilai periode), None untuk periode kosong."""
+    return periode.astype(object).map(lambda v: None if pd.isna(v) else str(v))
+
+def _slug(text):
+    return re.sub(r"[^0-9A-Za-z]+", "-", str(text)).strip("-").lower()
+
+def manifest_periode(manifest) -> list:
+    """Label periode terurut kronologis (partisi tanpa periode tidak ikut)."""
+    return [p["periode"] for p in manifest["partitions"] if p["periode"] is not None]
+
+# ============================
+# DATA STORE
+# ============================
+class DataStore:
+    """Folder data: partisi Parquet per periode + manifest berversi + penunjuk CURRENT."""
+
+    def __init__(self, root=STORE_DIR):
+        self.root = root
+
+    @property
+    def current_path(self):
+        return os.path.join(self.root, CURRENT_FILE)
+
+    def partition_path(self, name: str) -> str:
+        return os.path.join(self.root, PARTITION_DIR, name)
+
+    def manifest_path(self, version: int) -> str:
+        return os.path.join(self.root, MANIFEST_DIR, f"v{version:06d}.json")
+
+    def versions(self) -> list:
+        try:
+            names = os.listdir(os.path.join(self.root, MANIFEST_DIR))
+        except FileNotFoundError:
+            return []
+        return sorted(int(n[1:-5]) for n in names if re.fullmatch(r"v\d+\.json", n))
+
+    def current_version(self):
+        try:
+            with open(self.current_path, "r") as f:
+                return int(f.read().strip())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def read_manifest(self, version=None):
+        """Manifest versi tertentu (default: versi aktif), None bila tidak ada."""
+        version = self.current_version() if version is None else version
+        if version is None:
+            return None
+        try:
+            with open(self.manifest_path(version), "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def synced_sha(self):
+        """sha CURRENT GitHub saat sinkron lengkap terakhir, None bila belum pernah."""
+        try:
+            with open(os.path.join(self.root, SYNCED_FILE), "r") as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def mark_synced(self, sha: str):
+        self._write_atomic(os.path.join(self.root, SYNCED_FILE), sha)
+
+    def key(self):
+        """Kunci cache (root, versi aktif); versi tidak pernah diubah setelah ditulis."""
+        return self.root, self.current_version()
+
+    # ---------- tulis ----------
+    def _temp_path(self, directory):
+        """File tmp unik di `directory` (dua sesi Streamlit bisa menulis bersamaan)."""
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=directory)
+        os.close(fd)
+        return tmp_path
+
+    def _write_atomic(self, path, text):
+        tmp_path = self._temp_path(os.path.dirname(path))
+        with open(tmp_path, "w") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+    def write_partition(self, rows, label):
+        """Tulis baris satu periode sebagai partisi bernama hash isinya; return entry manifest."""
+        tmp_path = self._temp_path(os.path.join(self.root, PARTITION_DIR))
+        try:
+            write_parquet(rows, tmp_path)
+            with open(tmp_path, "rb") as f:
+                digest = hashlib.sha256(f.read()).hexdigest()[:16]
+        except Exception:
+            os.remove(tmp_path)
+            raise
+        name = f"{_slug(label) if label is not None else 'tanpa-periode'}-{digest}.parquet"
+        if os.path.exists(self.partition_path(name)):
+            os.remove(tmp_path)  # isi sama persis dengan partisi yang sudah ada
+        else:
+            os.replace(tmp_path, self.partition_path(name))
+        return {"periode": label, "file": name, "rows": len(rows)}
+
+    def commit(self, partitions, action, note="", periode_col=None, source=None):
+        """Tulis manifest versi baru (partisi diurutkan kronologis) lalu jadikan versi aktif.
+
+        `source`: info file asal (engine reader Excel & detik parse per file), bila ada.
+        """
+        parent = self.current_version()
+        labels = [p["periode"] for p in partitions if p["periode"] is not None]
+        order = list(periode_categorical(pd.Series(labels, dtype=object)).categories)
+        partitions = sorted(
+            partitions,
+            key=lambda p: order.index(p["periode"]) if p["periode"] is not None else len(order)
+        )
+        manifest = {
+            "version": max(self.versions() + [parent or 0]) + 1,
+            "parent": parent,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "action": action,
+            "note": note,
+            "periode_col": periode_col,
+            "rows": sum(p["rows"] for p in partitions),
+            "partitions": partitions,
+        }
+        if source:
+            manifest["source"] = source
+        self._write_atomic(self.manifest_path(manifest["version"]), json.dumps(manifest, indent=1))
+        self._write_atomic(self.current_path, str(manifest["version"]))
+        return manifest
+
+    def replace(self, df, action="upload", note="", source=None):
+        """Versi baru berisi seluruh `df` (kolom sudah dinormalisasi); periode yang isinya
+        tidak berubah menghasilkan file partisi yang sama sehingga tidak ditulis/dikirim ulang."""
+        periode_col = detect_periode_col(df.columns)
+        if periode_col is None:
+            raise ValueError("Kolom PERIODE tidak ditemukan.")
+        labels = _periode_labels(df[periode_col])
+        partitions = [
+            self.write_partition(rows, label if isinstance(label, str) else None)
+            for label, rows in df.groupby(labels, sort=False, dropna=False)
+        ]
+        return self.commit(partitions, action, note, periode_col, source)
+
+    def append(self, new_raw, note="", source=None):
+        """Tambah baris baru: hanya partisi periode yang tersentuh yang ditulis ulang.
+
+        Baris yang sudah ada di partisi periode yang sama (kunci baris sama) dilewati.
+        Return (manifest versi baru atau None bila tidak ada baris baru, ringkasan).
+        """
+        manifest = self.read_manifest()
+        periode_col = detect_periode_col(new_raw.columns)
+        if periode_col is None or (manifest and manifest["partitions"] and manifest["periode_col"] != periode_col):
+            raise ValueError("Kolom PERIODE file baru tidak sama dengan data yang ada.")
+        entries = {p["periode"]: p for p in (manifest["partitions"] if manifest else [])}
+
+        new_raw = new_raw.reset_index(drop=True)
+        new = add_derived_columns(parse_sla_columns(new_raw.copy()))
+        summary = {"rows": len(new_raw), "added": 0, "duplicates": 0, "periode": []}
+        labels = _periode_labels(new_raw[periode_col])
+        for label, index in labels.groupby(labels, sort=False, dropna=False).groups.items():
+            label = label if isinstance(label, str) else None
+            rows = new_raw.loc[index]
+            old = entries.get(label)
+            if old:
+                prev = prepare_partition(self.partition_path(old["file"]))
+                cols = key_columns(prev, new)
+                keep = ~np.isin(row_keys(new.loc[index], cols), row_keys(prev, cols))
+                summary["duplicates"] += int((~keep).sum())
+                if not keep.any():
+                    continue
+                rows = pd.concat([pd.read_parquet(self.partition_path(old["file"]), engine="pyarrow"), rows[keep]],
+                                 ignore_index=True)
+                added = int(keep.sum())
+            else:
+                added = len(rows)
+            entries[label] = self.write_partition(rows, label)
+            summary["added"] += added
+            if label is not None:
+                summary["periode"].append(label)
+
+        if not summary["added"]:
+            return None, summary
+        return self.commit(list(entries.values()), "append", note, periode_col, source), summary
+
+    def reset(self, note=""):
+        """Versi baru tanpa data (riwayat tetap ada, bisa di-rollback)."""
+        return self.commit([], "reset", note)
+
+    def rollback(self, version: int):
+        """Versi baru dengan isi sama persis seperti `version` (tanpa upload ulang)."""
+        old = self.read_manifest(version)
+        if old is None:
+            raise ValueError(f"Versi {version} tidak ditemukan.")
+        return self.commit(old["partitions"], "rollback", f"rollback ke v{version}", old["periode_col"])
+
+    def new_partitions(self, manifest) -> list:
+        """File partisi di manifest yang belum ada di versi induknya (yang perlu dikirim)."""
+        parent = self.read_manifest(manifest["parent"]) if manifest.get("parent") else None
+        known = {p["file"] for p in parent["partitions"]} if parent else set()
+        return [p["file"] for p in manifest["partitions"] if p["file"] not in known]
+
+    def missing_partitions(self, manifest) -> list:
+        return [p["file"] for p in manifest["partitions"] if not os.path.exists(self.partition_path(p["file"]))]
+
+# ============================
+# BACA PER RENTANG PERIODE
+# ============================
+def read_partition(path: str):
+    """Partisi siap pakai (SLA detik, kolom turunan), dibaca langsung dari file tanpa cache."""
+    return add_derived_columns(parse_sla_columns(pd.read_parquet(path, engine="pyarrow")))
+
+@lru_cache(maxsize=256)
+def prepare_partition(path: str):
+    """read_partition yang di-cache; file immutable → aman di-cache terus."""
+    return read_partition(path)
+
+@lru_cache(maxsize=256)
+def partition_cube(path: str):
+    df = prepare_partition(path)
+    return build_sla_cube(df, detect_periode_col(df.columns))
+
+def _concat_range(root, version, idx_start, idx_end, loader):
+    store = DataStore(root)
+    manifest = store.read_manifest(version)
+    periode_col = manifest["periode_col"]
+    categories = manifest_periode(manifest)
+    frames = []
+    for code in range(idx_start, idx_end + 1):
+        entry = manifest["partitions"][code]  # partisi terurut = urutan kategori periode
+        frame = loader(store.partition_path(entry["file"]))
+        # Kode kategori global (seluruh periode di manifest), bukan kategori per partisi
+        codes = np.full(len(frame), code, dtype=np.int16)
+        frames.append(frame.assign(**{
+            periode_col: pd.Categorical.from_codes(codes, categories=categories, ordered=True)
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+@lru_cache(maxsize=8)
+def load_range(root: str, version: int, idx_start: int, idx_end: int):
+    """Baris periode ke-idx_start s.d. idx_end (urutan manifest); hanya partisi itu yang dibuka.
+
+    Kolom periode berupa kategori terurut dengan kode = indeks periode di manifest.
+    JANGAN diubah in-place (di-cache & dibagi ke semua sesi).
+    """
+    return _concat_range(root, version, idx_start, idx_end, prepare_partition)
+
+def read_range(root: str, version: int, idx_start: int, idx_end: int):
+    """Sama seperti load_range tapi tanpa cache baris (untuk backend query SQL)."""
+    return _concat_range(root, version, idx_start, idx_end, read_partition)
+
+def _partition_columns(path):
+    """Kolom partisi setelah read_partition, cukup dari skema Parquet (tanpa membaca baris)."""
+    names = pq.read_schema(path).names
+    derived = []
+    if detect_periode_col(names):
+        derived.append("PERIODE_DATETIME")
+    if "NAMA VENDOR" in names:
+        derived += [VENDOR_KATEGORI_COL, "SLA_USED"]
+    return names + [c for c in derived if c not in names]
+
+@lru_cache(maxsize=8)
+def range_columns(root: str, version: int, idx_start: int, idx_end: int) -> tuple:
+    """Kolom hasil load_range untuk rentang periode yang sama, urutan ikut pd.concat."""
+    store = DataStore(root)
+    manifest = store.read_manifest(version)
+    columns = {}
+    for code in range(idx_start, idx_end + 1):
+        path = store.partition_path(manifest["partitions"][code]["file"])
+        columns.update(dict.fromkeys(_partition_columns(path)))
+    return tuple(columns)
+
+@lru_cache(maxsize=8)
+def load_cube_range(root: str, version: int, idx_start: int, idx_end: int):
+    """Cube agregat untuk rentang periode = gabungan cube per partisi (sel tidak pernah tumpang tindih)."""
+    return _concat_range(root, version, idx_start, idx_end, partition_cube)
+
+# ============================
+# MIGRASI WORKBOOK LAMA
+# ============================
+def migrate_workbook(store, path: str):
+    """Impor workbook lama data/last_data.xlsx sebagai versi pertama store."""
+    df = load_dataset(path)
+    return store.replace(df, action="migrate", note=os.path.basename(path))
+
+# ============================
+# SINKRON GITHUB
+# ============================
+def _remote(remote_root, *parts):
+    return "/".join((remote_root,) + parts)
+
+def _download(github, remote_path, local_path):
+    """Stream file GitHub langsung ke disk (partisi bisa puluhan MB)."""
+    if github.download_to(remote_path, local_path) is None:
+        print(f"Gagal download {remote_path} dari GitHub.")
+        return False
+    return True
+
+def fetch_partitions(github, store, remote_root, manifest):
+    """Download partisi manifest yang belum ada lokal; return True bila semua lengkap."""
+    return all([
+        _download(github, _remote(remote_root, PARTITION_DIR, name), store.partition_path(name))
+        for name in store.missing_partitions(manifest)
+    ])
+
+def sync_store(github, store, remote_root):
+    """Samakan store lokal dengan GitHub; return sha CURRENT (None bila store belum ada di GitHub).
+
+    CURRENT dicek dengan ETag; folder manifest hanya dibaca bila sha CURRENT berbeda dengan
+    sinkron lengkap terakhir (SYNCED). Manifest & partisi immutable, jadi hanya yang belum ada
+    yang didownload.
+    """
+    sha = github.sync_file(_remote(remote_root, CURRENT_FILE), store.current_path)
+    if not sha:
+        return None
+    if sha == store.synced_sha():
+        return sha
+    # Semua manifest (kecil) supaya riwayat versi lengkap untuk rollback
+    names = github.list_dir(_remote(remote_root, MANIFEST_DIR))
+    complete = names is not None
+    for name in names or []:
+        local_path = os.path.join(store.root, MANIFEST_DIR, name)
+        if re.fullmatch(r"v\d+\.json", name) and not os.path.exists(local_path):
+            complete = _download(github, _remote(remote_root, MANIFEST_DIR, name), local_path) and complete
+    manifest = store.read_manifest()
+    complete = bool(manifest) and fetch_partitions(github, store, remote_root, manifest) and complete
+    if complete:
+        store.mark_synced(sha)
+    return sha
+
+def push_version(github, store, remote_root, manifest, message, progress=None):
+    """Satu commit: partisi baru versi ini + manifest + CURRENT (ukuran sebesar perubahan saja)."""
+    files = {
+        _remote(remote_root, PARTITION_DIR, name): store.partition_path(name)
+        for name in store.new_partitions(manifest)
+    }
+    files[_remote(remote_root, MANIFEST_DIR, os.path.basename(store.manifest_path(manifest["version"])))] = \
+        store.manifest_path(manifest["version"])
+    files[_remote(remote_root, CURRENT_FILE)] = store.current_path
+    result = github.commit_files(files, message, progress=progress)
+    github.mark_commit_synced(result)
+    if result:
+        # Store lokal = isi GitHub setelah commit ini, sync berikutnya tidak perlu membaca folder manifest
+        store.mark_synced(result["files"][_remote(remote_root, CURRENT_FILE)])
+    return result
+
+def sync_legacy_workbook(github, remote_path, local_path):
+    """Workbook lama dari GitHub, untuk migrasi bila store belum ada."""
+    return github.sync_file(remote_path, local_path)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tes dijalankan dari root repo tanpa instalasi paket: sla_core diimpor langsung
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
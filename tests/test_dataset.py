@@ -0,0 +1,196 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+from sla_core.dataset import (
+    HAS_CALAMINE, VENDOR_KATEGORI_COL, add_derived_columns, parse_sla, parse_sla_series, periode_categorical,
+    periode_to_datetime, read_workbooks
+)
+
+SLA_VALUES = [
+    "SLA 4 days 17:47:26",
+    "SLA 0 days 01:59:26",
+    "SLA 06:33:10",
+    "SLA 1 day 00:00",
+    "sla 2 DAYS 1:05",
+    " 3 days ",
+    "12:30",
+    "SLA 10 days 25:61:61",
+    "SLA 1 days 1:2:3",
+    "SLA",
+    "",
+    "   ",
+    "abc",
+    None,
+    np.nan,
+    5,
+    3.5,
+]
+
+
+@pytest.mark.parametrize("value", SLA_VALUES, ids=repr)
+def test_parse_sla_series_matches_parse_sla(value):
+    expected = parse_sla(value)
+    result = parse_sla_series(pd.Series([value], dtype=object)).iloc[0]
+    if expected is None:
+        assert np.isnan(result)
+    else:
+        assert result == expected
+
+
+def test_parse_sla_series_mixed_column_keeps_index_and_order():
+    series = pd.Series(SLA_VALUES * 3, dtype=object, index=range(100, 100 + 3 * len(SLA_VALUES)))
+    result = parse_sla_series(series)
+    expected = pd.Series(
+        [np.nan if v is None else float(v) for v in map(parse_sla, series)], index=series.index, dtype="float64"
+    )
+    assert result.dtype == "float64"
+    pd.testing.assert_series_equal(result, expected)
+
+
+def test_parse_sla_series_all_blank():
+    result = parse_sla_series(pd.Series([None, np.nan], dtype=object))
+    assert result.isna().all() and result.dtype == "float64"
+
+
+VENDOR_NAMES = [
+    "GM CABANG MEDAN",
+    "gm cabang medan",
+    "PT GM CABANGAN",
+    "GM  CABANG",
+    "11012345678-PUSAT",
+    "11012345678-GM CABANG",
+    "1101234567-X",
+    "110123456789",
+    "110",
+    "PT SUMBER JAYA",
+    "",
+    None,
+    np.nan,
+    11012345678,
+]
+
+
+def _baseline_masks(names):
+    # Mask filter kategori vendor di dashboard awal
+    nama = names.astype(str)
+    mask_cabang = nama.str.upper().str.contains("GM CABANG", na=False)
+    mask_pusat = nama.str[:3].eq("110") & (nama.str.len() >= 12) & nama.str[11].eq("-")
+    return mask_cabang, mask_pusat
+
+
+def _baseline_pick_sla(row):
+    # pick_sla dashboard awal (kategori "ALL")
+    nama = str(row["NAMA VENDOR"]).upper()
+    if "GM CABANG" in nama:
+        return row.get("FUNGSIONAL")
+    elif nama.startswith("110") and len(nama) >= 12 and nama[11] == "-":
+        return row.get("FUNGSIONAL")
+    else:
+        return row.get("VENDOR")
+
+
+def test_vendor_kategori_matches_baseline_masks_and_pick_sla():
+    n = len(VENDOR_NAMES)
+    df = pd.DataFrame({
+        "NAMA VENDOR": pd.Series(VENDOR_NAMES, dtype=object),
+        "FUNGSIONAL": [float(i) if i % 5 else np.nan for i in range(n)],
+        "VENDOR": [1000.0 + i if i % 4 else np.nan for i in range(n)],
+    })
+    expected_sla = pd.to_numeric(df.apply(_baseline_pick_sla, axis=1), errors="coerce")
+    mask_cabang, mask_pusat = _baseline_masks(df["NAMA VENDOR"])
+
+    result = add_derived_columns(df.copy())
+    kategori = result[VENDOR_KATEGORI_COL]
+    # Urutan pick_sla: CABANG dulu, lalu PUSAT, sisanya VENDOR
+    assert ((kategori == "CABANG") == mask_cabang).all()
+    assert ((kategori == "PUSAT") == (mask_pusat & ~mask_cabang)).all()
+    assert ((kategori == "VENDOR") == ~(mask_cabang | mask_pusat)).all()
+    pd.testing.assert_series_equal(result["SLA_USED"], expected_sla, check_names=False)
+
+
+def test_periode_to_datetime_indonesian_months():
+    assert periode_to_datetime("Januari 2025") == pd.Timestamp("2025-01-01")
+    assert periode_to_datetime("DESEMBER 2024") == pd.Timestamp("2024-12-01")
+    assert periode_to_datetime("nopember 2024") == pd.Timestamp("2024-11-01")
+    assert pd.isna(periode_to_datetime("TOTAL"))
+
+
+def test_periode_categorical_orders_months_and_puts_unknown_last():
+    periode = pd.Series(
+        ["Januari 2025", "TOTAL", "Desember 2024", "MARET 2025", None, "Nopember 2024", "X", "Januari 2025"],
+        dtype=object,
+    )
+    result = periode_categorical(periode)
+    assert result.ordered
+    # Tanggal kronologis, lalu label yang tidak bisa diparse dalam urutan kemunculan pertama
+    assert list(result.categories) == ["Nopember 2024", "Desember 2024", "Januari 2025", "MARET 2025", "TOTAL", "X"]
+    assert list(result.astype(object)[:4]) == ["Januari 2025", "TOTAL", "Desember 2024", "MARET 2025"]
+    assert pd.isna(result[4])
+    assert result[0] == result[7] and result[2] < result[0] < result[3]
+
+
+def _workbook(sheets):
+    """Bytes .xlsx dari {nama sheet: daftar baris}."""
+    book = Workbook()
+    book.remove(book.active)
+    for name, rows in sheets.items():
+        sheet = book.create_sheet(name)
+        for row in rows:
+            sheet.append(row)
+    out = io.BytesIO()
+    book.save(out)
+    return out.getvalue()
+
+
+HEADER = [["NO", "PERIODE", "NAMA VENDOR", "SLA", "SLA"], [None, None, None, "FUNGSIONAL", "TOTAL WAKTU"]]
+
+
+def _upload_files():
+    return [
+        ("cabang.xlsx", _workbook({
+            "Data": HEADER + [[1, "JANUARI 2025", "GM CABANG A", "SLA 01:00:00", "SLA 1 days 00:00:00"],
+                              [2, "FEBRUARI 2025", "CV B", "SLA 02:00:00", "SLA 2 days 00:00:00"]],
+            "Catatan": [["dibuat oleh admin"]],
+            "Rekap": [["JUMLAH", "NILAI"], [None, None], [3, 4]],
+        })),
+        ("pusat.xlsx", _workbook({
+            "Sheet1": HEADER + [[1, "MARET 2025", "11012345678-P", "SLA 03:00:00", "SLA 3 days 00:00:00"]],
+        })),
+    ]
+
+
+@pytest.mark.parametrize("engine", ["openpyxl", pytest.param(
+    "calamine", marks=pytest.mark.skipif(not HAS_CALAMINE, reason="python-calamine tidak terpasang"))])
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_read_workbooks_combines_files_and_skips_non_data_sheets(engine, max_workers):
+    df, info = read_workbooks(_upload_files(), max_workers=max_workers, engine=engine)
+    assert list(df.columns) == ["NO", "PERIODE", "NAMA VENDOR", "FUNGSIONAL", "TOTAL WAKTU"]
+    assert df["PERIODE"].tolist() == ["JANUARI 2025", "FEBRUARI 2025", "MARET 2025"]
+    assert [file_info["engine"] for file_info in info] == [engine, engine]
+    skipped = {sheet["sheet"]: sheet["skipped"] for sheet in info[0]["sheets"]}
+    assert skipped["Data"] is None
+    assert skipped["Catatan"] and skipped["Rekap"] == "kolom PERIODE tidak ditemukan"
+
+
+@pytest.mark.skipif(not HAS_CALAMINE, reason="python-calamine tidak terpasang")
+def test_read_workbooks_falls_back_to_openpyxl_on_calamine_sheet_error(monkeypatch):
+    parse = pd.ExcelFile.parse
+
+    def failing_parse(self, sheet_name=0, **kwargs):
+        if self.engine == "calamine" and sheet_name == "Data":
+            raise ValueError("error khusus calamine")
+        return parse(self, sheet_name, **kwargs)
+
+    monkeypatch.setattr(pd.ExcelFile, "parse", failing_parse)
+    df, info = read_workbooks(_upload_files()[:1], max_workers=1, engine="calamine")
+    assert info[0]["engine"] == "openpyxl"
+    assert df["PERIODE"].tolist() == ["JANUARI 2025", "FEBRUARI 2025"]
+
+
+def test_read_workbooks_without_data_sheets():
+    with pytest.raises(ValueError, match="Tidak ada sheet"):
+        read_workbooks([("catatan.xlsx", _workbook({"Catatan": [["hanya teks"]]}))], max_workers=1)
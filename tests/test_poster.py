@@ -0,0 +1,72 @@
+import io
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+from PIL import Image  # noqa: E402
+
+from sla_core.dataset import PROSES_COLS  # noqa: E402
+from sla_core.formatting import format_duration  # noqa: E402
+from sla_core.poster import generate_poster_for, render_fig_to_image  # noqa: E402
+
+
+def _chart():
+    # Ukuran seperti grafik "Jumlah Transaksi per Periode" di poster
+    fig, ax = plt.subplots(figsize=(8, 5))
+    ax.bar([f"P{i}" for i in range(12)], np.arange(12) * 10)
+    ax.set_title("Jumlah Transaksi per Periode")
+    return fig
+
+
+def _canvas_render(max_width, pad_inches=0.1):
+    """Render acuan: PNG langsung dari canvas Agg dengan dpi & bbox yang sama."""
+    fig = _chart()
+    fig.canvas.draw()
+    bbox = fig.get_tightbbox(fig.canvas.get_renderer()).padded(pad_inches)
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=max_width / bbox.width, bbox_inches=bbox, transparent=True)
+    plt.close(fig)
+    buf.seek(0)
+    return Image.open(buf).convert("RGBA")
+
+
+def test_render_fig_to_image_matches_canvas_size_for_fractional_pixels():
+    # 869 px: int(lebar inci × dpi) = 868, canvas Agg sebenarnya 869
+    expected = _canvas_render(869)
+    img = render_fig_to_image(_chart(), 869)
+    assert img.mode == "RGBA"
+    assert img.size == expected.size
+    assert np.array_equal(np.asarray(img), np.asarray(expected))
+
+
+def test_render_fig_to_image_draws_once():
+    fig = _chart()
+    draws = []
+    fig.canvas.mpl_connect("draw_event", draws.append)
+    render_fig_to_image(fig, 869)
+    assert len(draws) == 1
+
+
+def test_render_fig_to_image_respects_max_height():
+    img = render_fig_to_image(_chart(), 2000, max_height=400)
+    assert img.size[1] <= 401 and img.size[0] < 2000
+
+
+def test_format_duration_blank():
+    assert format_duration(float("nan")) == "-"
+    assert format_duration(np.float64("nan")) == "-"
+    assert format_duration(None) == "-"
+    assert format_duration(90061.0) == "1 hari 1 jam 1 menit 1 detik"
+
+
+def test_generate_poster_for_with_all_nan_column():
+    # Potongan per kategori (mis. CABANG) bisa tidak punya satu pun nilai untuk sebuah proses
+    periode = ["SEPTEMBER 2025"] * 3
+    df = pd.DataFrame({col: [3600.0, 7200.0, np.nan] for col in PROSES_COLS})
+    df[PROSES_COLS[0]] = np.nan
+    df["PERIODE"] = pd.Categorical(periode, categories=periode[:1], ordered=True)
+    poster = generate_poster_for(df, "PERIODE", periode[:1], as_image=True)
+    assert poster.size == (2480, 3508)
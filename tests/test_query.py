@@ -0,0 +1,135 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from sla_core.dataset import SLA_COLS, VENDOR_KATEGORI_COL
+from sla_core.query import HAS_DUCKDB, open_query
+from sla_core.store import DataStore, load_range, manifest_periode, prepare_partition
+
+BACKENDS = [
+    "pandas",
+    "sqlite",
+    pytest.param("duckdb", marks=pytest.mark.skipif(not HAS_DUCKDB, reason="duckdb tidak terpasang")),
+]
+VENDORS = ["GM CABANG MEDAN", "11012345678-PUSAT", "PT SUMBER JAYA", "CV MAJU", None]
+JENIS = ["KONTRAK", "NON KONTRAK", None]
+PERIODE = ["JANUARI 2024", "FEBRUARI 2024", "MARET 2024", "APRIL 2024", None]
+
+
+def _sla(rng):
+    value = rng.integers(0, 12)
+    if value == 0:
+        return None
+    if value == 1:
+        return ""
+    return f"SLA {rng.integers(0, 9)} days {rng.integers(0, 24):02d}:{rng.integers(0, 60):02d}:{rng.integers(0, 60):02d}"
+
+
+@pytest.fixture(scope="module")
+def store_key(tmp_path_factory):
+    rng = np.random.default_rng(7)
+    n = 400
+    df = pd.DataFrame({
+        "NO": np.arange(1, n + 1),
+        "PERIODE": rng.choice(np.array(PERIODE, dtype=object), n),
+        "JENIS TRANSAKSI": rng.choice(np.array(JENIS, dtype=object), n),
+        "NAMA VENDOR": rng.choice(np.array(VENDORS, dtype=object), n),
+    })
+    for col in SLA_COLS:
+        df[col] = [_sla(rng) for _ in range(n)]
+    store = DataStore(str(tmp_path_factory.mktemp("store")))
+    store.replace(df)
+    return store.key()
+
+
+def _ranges(store_key):
+    count = len(manifest_periode(DataStore(store_key[0]).read_manifest(store_key[1])))
+    return [(0, count - 1), (1, 2), (3, 3)]
+
+
+AGGREGATES = [
+    (SLA_COLS, None),
+    (["TOTAL WAKTU"], None),
+    ([], None),
+    (SLA_COLS, "PERIODE"),
+    (["SLA_USED"], "NAMA VENDOR"),
+    (["KEUANGAN", "VENDOR"], "JENIS TRANSAKSI"),
+    (["SLA_USED"], VENDOR_KATEGORI_COL),
+    (["SLA_USED"], ["PERIODE", VENDOR_KATEGORI_COL]),
+    ([], "PERIODE"),
+]
+FILTERS = [
+    (),
+    ((VENDOR_KATEGORI_COL, ["CABANG"]),),
+    ((VENDOR_KATEGORI_COL, ["VENDOR"]), ("NAMA VENDOR", ["PT SUMBER JAYA", "CV MAJU"])),
+    (("NAMA VENDOR", ["TIDAK ADA"]),),
+]
+
+
+def _query(backend, store_key, idx_start, idx_end, filters):
+    query = open_query(backend, *store_key, idx_start, idx_end)
+    for col, values in filters:
+        query = query.filter(col, values)
+    return query
+
+
+@pytest.mark.parametrize("backend", BACKENDS[1:])
+@pytest.mark.parametrize("filters", FILTERS, ids=repr)
+@pytest.mark.parametrize("cols, by", AGGREGATES, ids=repr)
+def test_sql_agg_matches_pandas(store_key, backend, filters, cols, by):
+    for idx_start, idx_end in _ranges(store_key):
+        expected = _query("pandas", store_key, idx_start, idx_end, filters).agg(cols, by)
+        result = _query(backend, store_key, idx_start, idx_end, filters).agg(cols, by)
+        assert_frame_equal(result, expected, check_exact=True)
+
+
+@pytest.mark.parametrize("backend", BACKENDS[1:])
+@pytest.mark.parametrize("filters", FILTERS, ids=repr)
+def test_sql_rows_and_values_match_pandas(store_key, backend, filters):
+    for idx_start, idx_end in _ranges(store_key):
+        expected = _query("pandas", store_key, idx_start, idx_end, filters)
+        result = _query(backend, store_key, idx_start, idx_end, filters)
+        assert result.rows() == expected.rows()
+        assert result.values("NAMA VENDOR") == expected.values("NAMA VENDOR")
+        assert result.valid_ratio("PERIODE") == expected.valid_ratio("PERIODE")
+        assert result.columns() == expected.columns()
+        assert_frame_equal(result.frame(), expected.frame(), check_exact=True)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_query_metadata_matches_rows(store_key, backend):
+    for idx_start, idx_end in _ranges(store_key):
+        df = load_range(*store_key, idx_start, idx_end)
+        query = open_query(backend, *store_key, idx_start, idx_end)
+        assert query.columns() == list(df.columns)
+        assert query.rows() == len(df)
+        assert query.valid_ratio("PERIODE") == df["PERIODE"].notna().mean() * 100.0
+        assert_frame_equal(query.frame(), df, check_exact=True)
+
+
+@pytest.mark.parametrize("backend", BACKENDS[1:])
+def test_sql_backend_does_not_fill_row_cache(tmp_path, backend):
+    df = pd.DataFrame({
+        "PERIODE": ["JANUARI 2024", "FEBRUARI 2024"],
+        "NAMA VENDOR": ["CV MAJU", "GM CABANG MEDAN"],
+        "TOTAL WAKTU": ["SLA 1 days 00:00:00", "SLA 00:30:00"],
+    })
+    store = DataStore(str(tmp_path))
+    store.replace(df)
+    cached = prepare_partition.cache_info().currsize
+    query = open_query(backend, *store.key(), 0, 1)
+    query.agg(["TOTAL WAKTU"], by="PERIODE")
+    query.columns(), query.rows(), query.valid_ratio("PERIODE"), query.frame()
+    assert prepare_partition.cache_info().currsize == cached
+
+
+def test_importing_query_does_not_load_duckdb():
+    code = "import sys, sla_core.query; print('duckdb' in sys.modules)"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
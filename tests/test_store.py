@@ -0,0 +1,180 @@
+import os
+import shutil
+
+import pandas as pd
+
+from sla_core.store import (
+    CURRENT_FILE, MANIFEST_DIR, PARTITION_DIR, DataStore, load_range, push_version, sync_store
+)
+
+REMOTE = "data/store"
+
+
+class FakeGitHub:
+    """GitHubStore palsu di atas folder store lain; mencatat setiap panggilan."""
+
+    def __init__(self, remote):
+        self.remote = remote
+        self.calls = []
+
+    def _local(self, path):
+        return os.path.join(self.remote.root, os.path.relpath(path, REMOTE))
+
+    def sync_file(self, path, local_path):
+        self.calls.append(("sync_file", path))
+        os.makedirs(os.path.dirname(local_path), exist_ok=True)
+        shutil.copy(self._local(path), local_path)
+        with open(local_path) as f:
+            return "sha-" + f.read().strip()
+
+    def list_dir(self, path):
+        self.calls.append(("list_dir", path))
+        return os.listdir(self._local(path))
+
+    def download_to(self, path, local_path):
+        self.calls.append(("download_to", path))
+        os.makedirs(os.path.dirname(local_path), exist_ok=True)
+        shutil.copy(self._local(path), local_path)
+        return "sha"
+
+    def commit_files(self, files, message, progress=None):
+        self.calls.append(("commit_files", tuple(files)))
+        return {"files": {path: "sha-new" for path in files}, "deleted": [], "commit": {}}
+
+    def mark_commit_synced(self, result):
+        pass
+
+
+def _frame(periode, vendors):
+    return pd.DataFrame({
+        "PERIODE": periode,
+        "NAMA VENDOR": vendors,
+        "TOTAL WAKTU": ["SLA 1 days 00:00:00"] * len(vendors),
+    })
+
+
+def _names(calls, name):
+    return [path for call, path in calls if call == name]
+
+
+def test_sync_store_lists_manifests_only_when_current_changes(tmp_path):
+    remote = DataStore(str(tmp_path / "remote"))
+    remote.replace(_frame(["JANUARI 2025", "FEBRUARI 2025"], ["CV A", "CV B"]))
+    github = FakeGitHub(remote)
+    local = DataStore(str(tmp_path / "local"))
+
+    assert sync_store(github, local, REMOTE) == "sha-1"
+    assert _names(github.calls, "list_dir") == [f"{REMOTE}/{MANIFEST_DIR}"]
+    assert local.read_manifest() == remote.read_manifest()
+    assert not local.missing_partitions(local.read_manifest())
+
+    github.calls.clear()
+    assert sync_store(github, local, REMOTE) == "sha-1"
+    assert github.calls == [("sync_file", f"{REMOTE}/{CURRENT_FILE}")]
+
+    remote.append(_frame(["MARET 2025"], ["CV C"]))
+    github.calls.clear()
+    assert sync_store(github, local, REMOTE) == "sha-2"
+    assert _names(github.calls, "list_dir") == [f"{REMOTE}/{MANIFEST_DIR}"]
+    downloads = _names(github.calls, "download_to")
+    assert f"{REMOTE}/{MANIFEST_DIR}/v000002.json" in downloads
+    assert len([path for path in downloads if path.startswith(f"{REMOTE}/{PARTITION_DIR}/")]) == 1
+    assert local.read_manifest() == remote.read_manifest()
+
+
+def test_push_version_marks_store_synced(tmp_path):
+    store = DataStore(str(tmp_path))
+    manifest = store.replace(_frame(["JANUARI 2025"], ["CV A"]))
+    github = FakeGitHub(store)
+    push_version(github, store, REMOTE, manifest, "test")
+    assert store.synced_sha() == "sha-new"
+
+
+def _base():
+    return pd.DataFrame({
+        "NO": [1, 2, 3, 4],
+        "PERIODE": ["JANUARI 2025", "JANUARI 2025", "FEBRUARI 2025", "FEBRUARI 2025"],
+        "NAMA VENDOR": ["CV A", "CV B", "CV A", "GM CABANG X"],
+        "TOTAL WAKTU": ["SLA 1 days 00:00:00", "SLA 02:00:00", "SLA 0 days 03:00:00", "SLA 4 days 00:00:00"],
+    })
+
+
+def _files(manifest):
+    return {p["periode"]: p["file"] for p in manifest["partitions"]}
+
+
+def _rows(manifest):
+    return {p["periode"]: p["rows"] for p in manifest["partitions"]}
+
+
+def test_append_identical_rows_adds_nothing(tmp_path):
+    store = DataStore(str(tmp_path))
+    store.replace(_base())
+    # Nomor urut berbeda tidak membuat baris dianggap baru
+    manifest, summary = store.append(_base().assign(NO=[11, 12, 13, 14]))
+    assert manifest is None
+    assert summary["added"] == 0 and summary["duplicates"] == 4
+    assert store.current_version() == 1
+
+
+def test_append_old_and_new_month_pushes_only_new_partition(tmp_path):
+    store = DataStore(str(tmp_path))
+    base = store.replace(_base())
+    new = pd.DataFrame({
+        "NO": [1, 2],
+        "PERIODE": ["JANUARI 2025", "MARET 2025"],
+        "NAMA VENDOR": ["CV A", "CV C"],
+        "TOTAL WAKTU": ["SLA 1 days 00:00:00", "SLA 05:00:00"],
+    })
+    manifest, summary = store.append(new)
+    assert summary == {"rows": 2, "added": 1, "duplicates": 1, "periode": ["MARET 2025"]}
+    assert manifest["parent"] == base["version"] and manifest["rows"] == 5
+    files = _files(manifest)
+    assert {k: files[k] for k in _files(base)} == _files(base)
+    assert store.new_partitions(manifest) == [files["MARET 2025"]]
+    assert _rows(manifest) == {"JANUARI 2025": 2, "FEBRUARI 2025": 2, "MARET 2025": 1}
+
+
+def test_append_new_row_in_existing_month_rewrites_only_that_partition(tmp_path):
+    store = DataStore(str(tmp_path))
+    base = store.replace(_base())
+    new = _base().iloc[[2]].assign(**{"NAMA VENDOR": "CV Z"})
+    manifest, summary = store.append(new)
+    assert summary["added"] == 1 and summary["periode"] == ["FEBRUARI 2025"]
+    files = _files(manifest)
+    assert files["JANUARI 2025"] == _files(base)["JANUARI 2025"]
+    assert store.new_partitions(manifest) == [files["FEBRUARI 2025"]]
+    df = load_range(*store.key(), 0, 1)
+    assert len(df) == 5 and (df["NAMA VENDOR"] == "CV Z").sum() == 1
+
+
+def test_replace_reuses_identical_partitions(tmp_path):
+    store = DataStore(str(tmp_path))
+    base = store.replace(_base())
+    same = store.replace(_base())
+    assert _files(same) == _files(base)
+    assert store.new_partitions(same) == []
+
+    changed = _base()
+    changed.loc[3, "TOTAL WAKTU"] = "SLA 5 days 00:00:00"
+    manifest = store.replace(changed)
+    assert _files(manifest)["JANUARI 2025"] == _files(base)["JANUARI 2025"]
+    assert store.new_partitions(manifest) == [_files(manifest)["FEBRUARI 2025"]]
+
+
+def test_reset_and_rollback_restore_previous_manifest(tmp_path):
+    store = DataStore(str(tmp_path))
+    base = store.replace(_base())
+    appended, _ = store.append(_base().assign(PERIODE="MARET 2025"))
+    reset = store.reset()
+    assert reset["partitions"] == [] and store.read_manifest()["rows"] == 0
+
+    restored = store.rollback(appended["version"])
+    assert restored["version"] == reset["version"] + 1
+    assert restored["partitions"] == appended["partitions"]
+    assert restored["periode_col"] == appended["periode_col"] and restored["rows"] == appended["rows"]
+
+    restored = store.rollback(base["version"])
+    assert restored["partitions"] == base["partitions"]
+    assert store.new_partitions(restored) == []
+    assert len(load_range(*store.key(), 0, 1)) == 4